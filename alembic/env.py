@@ -22,6 +22,7 @@ if config.config_file_name is not None:
 # Import all models to ensure they're registered with SQLAlchemy
 from db import Base
 from models import users, ngo_profiles, proposals, funding_opportunities, usage, idempotency
+from models import alignment_scores, job_state, content_blob, proposal_revision
 
 # add your model's MetaData object here
 # for 'autogenerate' support
@@ -0,0 +1,55 @@
+"""Add alignment matrix and background job state
+
+Revision ID: a1c3e5f70926
+Revises: 5e10fa46213f
+Create Date: 2026-10-19 09:12:41.203518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1c3e5f70926'
+down_revision: Union[str, None] = '5e10fa46213f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create background_job_state table
+    op.create_table('background_job_state',
+        sa.Column('job_name', sa.String(length=100), nullable=False),
+        sa.Column('watermark', sa.DateTime(), nullable=True),
+        sa.Column('last_run_at', sa.DateTime(), nullable=True),
+        sa.Column('last_run_stats', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('job_name')
+    )
+
+    # Create alignment_scores table (sparse profile x opportunity matrix)
+    op.create_table('alignment_scores',
+        sa.Column('ngo_profile_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('funding_opportunity_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['ngo_profile_id'], ['ngo_profiles.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('ngo_profile_id', 'funding_opportunity_id')
+    )
+    op.create_index(
+        'ix_alignment_scores_profile_rank',
+        'alignment_scores',
+        ['ngo_profile_id', sa.text('score DESC'), sa.text('funding_opportunity_id DESC')],
+        unique=False,
+    )
+    op.create_index('ix_alignment_scores_funding_opportunity_id', 'alignment_scores', ['funding_opportunity_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_alignment_scores_funding_opportunity_id', table_name='alignment_scores')
+    op.drop_index('ix_alignment_scores_profile_rank', table_name='alignment_scores')
+    op.drop_table('alignment_scores')
+
+    op.drop_table('background_job_state')
@@ -0,0 +1,100 @@
+"""Partition usage_ledger by month on created_at
+
+Revision ID: a4c6e8f0b237
+Revises: f3b5d7e9a126
+Create Date: 2026-10-19 19:26:08.334915
+
+"""
+from datetime import datetime
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from services.ledger_partitions import (
+    USAGE_LEDGER_PARTITIONS_AHEAD,
+    add_months,
+    create_partition_sql,
+    month_start,
+    months_between,
+)
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c6e8f0b237'
+down_revision: Union[str, None] = 'f3b5d7e9a126'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, action_type, count, created_at, plan_name, monthly_limit"
+
+
+def _columns():
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('action_type', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.Column('plan_name', sa.String(length=100), nullable=False),
+        sa.Column('monthly_limit', sa.Integer(), nullable=False),
+    ]
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    # usage_ledger predates the migrations (created by init_db), so it may
+    # be missing, or already partitioned if init_db ran with the new model
+    relkind = bind.execute(sa.text(
+        "SELECT relkind FROM pg_class WHERE relname = 'usage_ledger' AND relkind IN ('r', 'p')"
+    )).scalar()
+    if relkind == 'p':
+        return
+    if relkind == 'r':
+        op.rename_table('usage_ledger', 'usage_ledger_unpartitioned')
+        op.execute('ALTER INDEX IF EXISTS usage_ledger_pkey RENAME TO usage_ledger_unpartitioned_pkey')
+        op.execute('DROP INDEX IF EXISTS ix_usage_ledger_user_id')
+
+    op.create_table('usage_ledger',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    # Created on the parent, so every partition gets its own copy
+    op.create_index(
+        'ix_usage_ledger_user_action_created',
+        'usage_ledger',
+        ['user_id', 'action_type', 'created_at'],
+        unique=False,
+    )
+
+    # Partitions from the oldest entry to a few months ahead
+    current = month_start(datetime.utcnow())
+    first = current
+    if relkind == 'r':
+        oldest = bind.execute(sa.text('SELECT MIN(created_at) FROM usage_ledger_unpartitioned')).scalar()
+        if oldest is not None:
+            first = min(first, month_start(oldest))
+    for month in months_between(first, add_months(current, USAGE_LEDGER_PARTITIONS_AHEAD)):
+        op.execute(create_partition_sql(month))
+
+    if relkind == 'r':
+        op.execute(
+            f'INSERT INTO usage_ledger ({COLUMNS}) SELECT {COLUMNS} FROM usage_ledger_unpartitioned'
+        )
+        op.drop_table('usage_ledger_unpartitioned')
+
+
+def downgrade() -> None:
+    op.create_table('usage_ledger_unpartitioned',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', name='usage_ledger_unpartitioned_pkey'),
+    )
+    op.execute(
+        f'INSERT INTO usage_ledger_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM usage_ledger'
+    )
+    # Dropping the parent drops its partitions
+    op.drop_table('usage_ledger')
+    op.rename_table('usage_ledger_unpartitioned', 'usage_ledger')
+    op.execute('ALTER INDEX usage_ledger_unpartitioned_pkey RENAME TO usage_ledger_pkey')
+    op.create_index('ix_usage_ledger_user_id', 'usage_ledger', ['user_id'], unique=False)
@@ -0,0 +1,107 @@
+"""Add funding opportunity search column and indexes
+
+Revision ID: b7d2f4a8c1e3
+Revises: a1c3e5f70926
+Create Date: 2026-10-19 11:04:17.552190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d2f4a8c1e3'
+down_revision: Union[str, None] = 'a1c3e5f70926'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match models.funding_opportunities.SEARCH_VECTOR_EXPRESSION
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', coalesce(keywords::jsonb, '[]'::jsonb), "
+    "'[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
+
+def _ensure_pg_trgm() -> bool:
+    """Create pg_trgm if possible; returns whether it is installed"""
+    bind = op.get_bind()
+    try:
+        # Savepoint, so a refused CREATE EXTENSION doesn't abort the migration
+        with bind.begin_nested():
+            bind.execute(sa.text('CREATE EXTENSION IF NOT EXISTS pg_trgm'))
+    except sa.exc.DBAPIError:
+        pass
+    return bind.execute(
+        sa.text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+    ).scalar() is not None
+
+
+def upgrade() -> None:
+    has_trigram = _ensure_pg_trgm()
+
+    # Generated weighted tsvector over title, keywords and description
+    op.add_column('funding_opportunities',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        )
+    )
+    op.create_index(
+        'ix_funding_opportunities_search_vector',
+        'funding_opportunities',
+        ['search_vector'],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+    # Trigram index for fuzzy title matching; without pg_trgm, search
+    # detects the missing extension and skips trigram matching
+    if has_trigram:
+        op.create_index(
+            'ix_funding_opportunities_title_trgm',
+            'funding_opportunities',
+            ['title'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_ops={'title': 'gin_trgm_ops'},
+        )
+
+    # JSONB GIN indexes on the array columns (stored as json)
+    op.create_index(
+        'ix_funding_opportunities_focus_areas',
+        'funding_opportunities',
+        [sa.text('(focus_areas::jsonb)')],
+        unique=False,
+        postgresql_using='gin',
+    )
+    op.create_index(
+        'ix_funding_opportunities_geographic_focus',
+        'funding_opportunities',
+        [sa.text('(geographic_focus::jsonb)')],
+        unique=False,
+        postgresql_using='gin',
+    )
+
+    # Deadline range filter over open opportunities only
+    op.create_index(
+        'ix_funding_opportunities_open_deadline',
+        'funding_opportunities',
+        ['application_deadline'],
+        unique=False,
+        postgresql_where=sa.text('is_active AND NOT is_archived'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_funding_opportunities_open_deadline', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_geographic_focus', table_name='funding_opportunities')
+    op.drop_index('ix_funding_opportunities_focus_areas', table_name='funding_opportunities')
+    op.execute('DROP INDEX IF EXISTS ix_funding_opportunities_title_trgm')
+    op.drop_index('ix_funding_opportunities_search_vector', table_name='funding_opportunities')
+    op.drop_column('funding_opportunities', 'search_vector')
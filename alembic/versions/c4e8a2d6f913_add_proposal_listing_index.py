@@ -0,0 +1,30 @@
+"""Add composite index for keyset proposal listing
+
+Revision ID: c4e8a2d6f913
+Revises: b7d2f4a8c1e3
+Create Date: 2026-10-19 12:21:05.318774
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e8a2d6f913'
+down_revision: Union[str, None] = 'b7d2f4a8c1e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_proposals_user_listing',
+        'proposals',
+        ['user_id', 'is_active', sa.text('created_at DESC'), sa.text('id DESC')],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_proposals_user_listing', table_name='proposals')
@@ -0,0 +1,176 @@
+"""Move proposal prompts and opportunity snapshots into content_blobs
+
+Revision ID: d9f1b3c5e7a2
+Revises: c4e8a2d6f913
+Create Date: 2026-10-19 14:02:33.871406
+
+"""
+from typing import Sequence, Union
+import json
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from utils.blob_codec import compress, decompress, encode_text, encode_json, content_hash
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9f1b3c5e7a2'
+down_revision: Union[str, None] = 'c4e8a2d6f913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BATCH_SIZE = 500
+
+content_blobs = sa.table(
+    'content_blobs',
+    sa.column('hash', sa.String),
+    sa.column('codec', sa.String),
+    sa.column('data', sa.LargeBinary),
+    sa.column('raw_size', sa.Integer),
+    sa.column('created_at', sa.DateTime),
+)
+
+
+def _blob_row(raw: bytes) -> dict:
+    codec, data = compress(raw)
+    return {
+        'hash': content_hash(raw),
+        'codec': codec,
+        'data': data,
+        'raw_size': len(raw),
+        'created_at': sa.func.now(),
+    }
+
+
+def upgrade() -> None:
+    op.create_table('content_blobs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('codec', sa.String(length=16), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('raw_size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    op.add_column('proposals', sa.Column('generation_prompt_hash', sa.String(length=64), nullable=True))
+    op.add_column('proposals', sa.Column('funding_opportunity_snapshot_hash', sa.String(length=64), nullable=True))
+
+    # Backfill in keyset batches so memory stays bounded on large tables
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = (
+            "SELECT id, generation_prompt, funding_opportunity_snapshot::text AS snapshot "
+            "FROM proposals "
+        )
+        params = {'limit': BATCH_SIZE}
+        if last_id is not None:
+            query += "WHERE id > :last_id "
+            params['last_id'] = last_id
+        query += "ORDER BY id LIMIT :limit"
+        rows = bind.execute(sa.text(query), params).all()
+        if not rows:
+            break
+
+        blobs = {}
+        updates = []
+        for row in rows:
+            prompt_hash = None
+            if row.generation_prompt is not None:
+                raw = encode_text(row.generation_prompt)
+                prompt_hash = content_hash(raw)
+                blobs.setdefault(prompt_hash, raw)
+
+            snapshot_hash = None
+            if row.snapshot is not None and row.snapshot != 'null':
+                raw = encode_json(json.loads(row.snapshot))
+                snapshot_hash = content_hash(raw)
+                blobs.setdefault(snapshot_hash, raw)
+
+            updates.append({
+                'proposal_id': row.id,
+                'prompt_hash': prompt_hash,
+                'snapshot_hash': snapshot_hash,
+            })
+
+        if blobs:
+            bind.execute(
+                postgresql.insert(content_blobs)
+                .values([_blob_row(raw) for raw in blobs.values()])
+                .on_conflict_do_nothing(index_elements=['hash'])
+            )
+        bind.execute(
+            sa.text(
+                "UPDATE proposals SET generation_prompt_hash = :prompt_hash, "
+                "funding_opportunity_snapshot_hash = :snapshot_hash "
+                "WHERE id = :proposal_id"
+            ),
+            updates,
+        )
+        last_id = rows[-1].id
+
+    op.create_foreign_key(
+        'fk_proposals_generation_prompt_hash', 'proposals', 'content_blobs',
+        ['generation_prompt_hash'], ['hash']
+    )
+    op.create_foreign_key(
+        'fk_proposals_funding_opportunity_snapshot_hash', 'proposals', 'content_blobs',
+        ['funding_opportunity_snapshot_hash'], ['hash']
+    )
+    op.drop_column('proposals', 'generation_prompt')
+    op.drop_column('proposals', 'funding_opportunity_snapshot')
+
+
+def downgrade() -> None:
+    op.add_column('proposals', sa.Column('generation_prompt', sa.Text(), nullable=True))
+    op.add_column('proposals', sa.Column('funding_opportunity_snapshot', sa.JSON(), nullable=True))
+
+    bind = op.get_bind()
+    last_id = None
+    while True:
+        query = "SELECT id, generation_prompt_hash, funding_opportunity_snapshot_hash FROM proposals "
+        params = {'limit': BATCH_SIZE}
+        if last_id is not None:
+            query += "WHERE id > :last_id "
+            params['last_id'] = last_id
+        query += "ORDER BY id LIMIT :limit"
+        rows = bind.execute(sa.text(query), params).all()
+        if not rows:
+            break
+
+        hashes = {
+            h for row in rows
+            for h in (row.generation_prompt_hash, row.funding_opportunity_snapshot_hash)
+            if h
+        }
+        raw_by_hash = {}
+        if hashes:
+            for blob in bind.execute(
+                sa.text("SELECT hash, codec, data FROM content_blobs WHERE hash = ANY(:hashes)"),
+                {'hashes': list(hashes)},
+            ):
+                raw_by_hash[blob.hash] = decompress(blob.codec, blob.data).decode('utf-8')
+
+        bind.execute(
+            sa.text(
+                "UPDATE proposals SET generation_prompt = :prompt, "
+                "funding_opportunity_snapshot = CAST(:snapshot AS json) "
+                "WHERE id = :proposal_id"
+            ),
+            [
+                {
+                    'proposal_id': row.id,
+                    'prompt': raw_by_hash.get(row.generation_prompt_hash, ''),
+                    'snapshot': raw_by_hash.get(row.funding_opportunity_snapshot_hash),
+                }
+                for row in rows
+            ],
+        )
+        last_id = rows[-1].id
+
+    op.alter_column('proposals', 'generation_prompt', nullable=False)
+    op.drop_constraint('fk_proposals_funding_opportunity_snapshot_hash', 'proposals', type_='foreignkey')
+    op.drop_constraint('fk_proposals_generation_prompt_hash', 'proposals', type_='foreignkey')
+    op.drop_column('proposals', 'funding_opportunity_snapshot_hash')
+    op.drop_column('proposals', 'generation_prompt_hash')
+    op.drop_table('content_blobs')
@@ -0,0 +1,38 @@
+"""Add proposal_revisions for delta-encoded version history
+
+Revision ID: e2a4c6e8f015
+Revises: d9f1b3c5e7a2
+Create Date: 2026-10-19 15:37:52.094112
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a4c6e8f015'
+down_revision: Union[str, None] = 'd9f1b3c5e7a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('proposal_revisions',
+        sa.Column('proposal_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False),
+        sa.Column('kind', sa.String(length=16), nullable=False),
+        sa.Column('snapshot', sa.Text(), nullable=True),
+        sa.Column('delta', sa.JSON(), nullable=True),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('changes', sa.JSON(), nullable=True),
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['proposal_id'], ['proposals.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('proposal_id', 'version')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('proposal_revisions')
@@ -0,0 +1,52 @@
+"""Add usage_monthly_rollup and backfill it from usage_ledger
+
+Revision ID: f3b5d7e9a126
+Revises: e2a4c6e8f015
+Create Date: 2026-10-19 18:12:40.517302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b5d7e9a126'
+down_revision: Union[str, None] = 'e2a4c6e8f015'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('usage_monthly_rollup',
+        sa.Column('user_id', sa.String(length=255), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('action_type', sa.String(length=50), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('plan_name', sa.String(length=100), nullable=False),
+        sa.Column('monthly_limit', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint('user_id', 'month', 'action_type')
+    )
+
+    # One aggregate pass; plan fields come from each group's latest entry
+    op.execute(
+        """
+        INSERT INTO usage_monthly_rollup
+            (user_id, month, action_type, count, plan_name, monthly_limit, updated_at)
+        SELECT
+            user_id,
+            date_trunc('month', created_at)::date,
+            action_type,
+            SUM(count),
+            (array_agg(plan_name ORDER BY created_at DESC))[1],
+            (array_agg(monthly_limit ORDER BY created_at DESC))[1],
+            MAX(created_at)
+        FROM usage_ledger
+        GROUP BY user_id, date_trunc('month', created_at)::date, action_type
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('usage_monthly_rollup')
@@ -56,7 +56,16 @@ async def init_db():
     """Initialize database tables"""
     async with engine.begin() as conn:
         # Import all models to ensure they're registered
-        from models import ngo_profiles, proposals, funding_opportunities, users
+        from models import (
+            ngo_profiles,
+            proposals,
+            funding_opportunities,
+            users,
+            alignment_scores,
+            job_state,
+            content_blob,
+            proposal_revision,
+        )
 
         # Create tables (only creates if they don't exist)
         await conn.run_sync(Base.metadata.create_all)
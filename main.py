@@ -1,4 +1,5 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
@@ -6,12 +7,22 @@ import logging
 from db import init_db
 
 # Import route modules
-from routes import proposal_routes, profile, auth_routes, admin_ui, usage_routes
+from routes import (
+    proposal_routes,
+    profile,
+    auth_routes,
+    admin_ui,
+    usage_routes,
+    match_routes,
+    opportunity_routes,
+)
 
 # Import configuration modules
 from utils.logging_config import configure_logging, RequestIDMiddleware
+from utils.compression import CompressionMiddleware
 from utils.error_handlers import setup_error_handlers
 from utils.sentry_config import setup_sentry
+from utils.background_tasks import start_periodic_task, stop_tasks
 
 # Global app health status
 APP_HEALTH = {"status": "unknown", "db": "unknown", "error": None}
@@ -27,6 +38,7 @@ logger = logging.getLogger(__name__)
 async def lifespan(app: FastAPI):
     """Application lifespan events with resilient startup"""
     global APP_HEALTH
+    background_tasks = []
     
     # Startup - resilient DB initialization
     try:
@@ -37,11 +49,74 @@ async def lifespan(app: FastAPI):
         APP_HEALTH = {"status": "degraded", "db": "down", "error": str(e)}
         logger.error(f"Database initialization failed: {e}", exc_info=True)
         # Don't raise - allow app to start in degraded mode
+
+    # Background jobs only make sense with a working database
+    if APP_HEALTH["db"] == "up":
+        from services.alignment_service import refresh_alignment_matrix_job
+        from services.ledger_partitions import maintain_usage_ledger_job
+        from services.opportunity_cache import poll_opportunity_cache_job
+
+        background_tasks.append(
+            start_periodic_task(
+                "alignment_matrix_refresh",
+                float(os.getenv("ALIGNMENT_REFRESH_INTERVAL_SECONDS", "900")),
+                refresh_alignment_matrix_job,
+            )
+        )
+        background_tasks.append(
+            start_periodic_task(
+                "opportunity_cache_poll",
+                float(os.getenv("OPPORTUNITY_CACHE_POLL_SECONDS", "60")),
+                poll_opportunity_cache_job,
+            )
+        )
+        background_tasks.append(
+            start_periodic_task(
+                "usage_ledger_maintenance",
+                float(os.getenv("USAGE_LEDGER_MAINTENANCE_INTERVAL_SECONDS", "86400")),
+                maintain_usage_ledger_job,
+            )
+        )
+    
+    # Usage ledger writes are batched in the background; this also replays
+    # events spooled to disk by the last shutdown
+    from services.usage_writer import usage_writer
+
+    if APP_HEALTH["db"] == "up":
+        try:
+            # Ledger rows need this month's partition to exist
+            from services.ledger_partitions import ensure_ledger_partitions
+
+            await ensure_ledger_partitions()
+            await usage_writer.start()
+        except Exception as e:
+            logger.error(f"Usage writer failed to start: {e}", exc_info=True)
+    
+    # Load the embedding model and semantic index now rather than on the
+    # first generate request
+    from utils.embeddings import get_semantic_index
+
+    try:
+        if await run_in_threadpool(get_semantic_index) is None:
+            logger.info("No semantic index built yet; alignment scores skip the semantic bonus")
+    except Exception as e:
+        logger.error(f"Semantic index failed to load: {e}", exc_info=True)
+    
+    # Spawn export render workers up front so the first export is not slow
+    from services.export_executor import export_executor
+
+    try:
+        await export_executor.start()
+    except Exception as e:
+        logger.error(f"Export executor failed to start: {e}", exc_info=True)
     
     yield
     
     # Shutdown
-    pass
+    await stop_tasks(background_tasks)
+    # Writes queued usage, spooling it to disk if the database is unreachable
+    await usage_writer.stop()
+    export_executor.shutdown()
 
 
 app = FastAPI(
@@ -52,6 +127,7 @@ app = FastAPI(
 )
 
 # Add middleware in correct order
+app.add_middleware(CompressionMiddleware)
 app.add_middleware(RequestIDMiddleware)
 
 # Set up error handlers
@@ -94,7 +170,7 @@ app.add_middleware(
         "Cookie",
         "Set-Cookie",
     ],
-    expose_headers=["Set-Cookie", "Authorization"],
+    expose_headers=["Set-Cookie", "Authorization", "X-Next-Cursor"],
 )
 
 # Include routers
@@ -102,6 +178,10 @@ app.include_router(auth_routes.router, prefix="/api/auth", tags=["authentication
 app.include_router(profile.router, prefix="/api/profile", tags=["profile"])
 app.include_router(proposal_routes.router, prefix="/api/proposals", tags=["proposals"])
 app.include_router(usage_routes.router, prefix="/api/usage", tags=["usage"])
+app.include_router(match_routes.router, prefix="/api/matches", tags=["matches"])
+app.include_router(
+    opportunity_routes.router, prefix="/api/opportunities", tags=["opportunities"]
+)
 app.include_router(admin_ui.router, prefix="/admin", tags=["admin"])
 
 
@@ -198,6 +278,8 @@ async def root():
             "profiles": "/api/profile",
             "proposals": "/api/proposals/*",
             "usage": "/api/usage/*",
+            "matches": "/api/matches",
+            "opportunities": "/api/opportunities/search",
         },
     }
 
@@ -6,8 +6,12 @@ from .ngo_profiles import NGOProfile
 from .proposals import Proposal
 from .funding_opportunities import FundingOpportunity
 from .users import User
-from .usage import UsageLedger
+from .usage import UsageLedger, UsageMonthlyRollup
 from .idempotency import IdempotencyRecord
+from .alignment_scores import AlignmentScore
+from .job_state import BackgroundJobState
+from .content_blob import ContentBlob
+from .proposal_revision import ProposalRevision
 
 __all__ = [
     "NGOProfile",
@@ -15,5 +19,10 @@ __all__ = [
     "FundingOpportunity",
     "User",
     "UsageLedger",
+    "UsageMonthlyRollup",
     "IdempotencyRecord",
+    "AlignmentScore",
+    "BackgroundJobState",
+    "ContentBlob",
+    "ProposalRevision",
 ]
@@ -0,0 +1,48 @@
+from sqlalchemy import Column, DateTime, Integer, Float, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID
+from datetime import datetime
+from db import Base
+
+
+class AlignmentScore(Base):
+    """
+    Precomputed profile x funding opportunity alignment score.
+
+    The table is sparse: pairs with no alignment at all are not stored.
+    Rows are maintained by the alignment matrix refresh job.
+    """
+
+    __tablename__ = "alignment_scores"
+
+    ngo_profile_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("ngo_profiles.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    funding_opportunity_id = Column(
+        Integer, primary_key=True
+    )  # References ReqAgent's funding_opportunities
+
+    score = Column(Float, nullable=False)  # 0.0-1.0 alignment
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (
+        # Serves "top-N per profile" keyset pagination as an index range scan
+        Index(
+            "ix_alignment_scores_profile_rank",
+            ngo_profile_id,
+            score.desc(),
+            funding_opportunity_id.desc(),
+        ),
+        # Serves column invalidation when an opportunity changes
+        Index("ix_alignment_scores_funding_opportunity_id", funding_opportunity_id),
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            "ngo_profile_id": str(self.ngo_profile_id),
+            "funding_opportunity_id": self.funding_opportunity_id,
+            "score": self.score,
+            "computed_at": self.computed_at.isoformat() if self.computed_at else None,
+        }
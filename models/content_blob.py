@@ -0,0 +1,45 @@
+from sqlalchemy import Column, String, DateTime, Integer, LargeBinary
+from datetime import datetime
+import json
+from db import Base
+from utils.blob_codec import decompress
+
+
+class ContentBlob(Base):
+    """
+    Content-addressed, compressed storage for large proposal blobs
+
+    Blobs are keyed by the SHA-256 of their uncompressed bytes, so identical
+    prompts and opportunity snapshots are stored once. Rows are immutable.
+    """
+
+    __tablename__ = "content_blobs"
+
+    hash = Column(String(64), primary_key=True)  # SHA-256 hex of raw bytes
+    codec = Column(String(16), nullable=False)  # zstd, zlib or none
+    data = Column(LargeBinary, nullable=False)  # Compressed bytes
+    raw_size = Column(Integer, nullable=False)  # Uncompressed size in bytes
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def raw_bytes(self) -> bytes:
+        """Decompressed content"""
+        return decompress(self.codec, self.data)
+
+    def as_text(self) -> str:
+        """Content decoded as UTF-8 text"""
+        return self.raw_bytes().decode("utf-8")
+
+    def as_json(self):
+        """Content decoded as JSON"""
+        return json.loads(self.raw_bytes())
+
+    def to_dict(self):
+        """Convert model to dictionary (metadata only)"""
+        return {
+            "hash": self.hash,
+            "codec": self.codec,
+            "stored_size": len(self.data) if self.data is not None else None,
+            "raw_size": self.raw_size,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
@@ -1,7 +1,31 @@
-from sqlalchemy import Column, String, Text, DateTime, JSON, Boolean, Integer, Float
+from sqlalchemy import (
+    Column,
+    String,
+    Text,
+    DateTime,
+    JSON,
+    Boolean,
+    Integer,
+    Float,
+    Computed,
+    Index,
+    cast,
+    text,
+)
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from datetime import datetime
 from db import Base
 
+# Weighted document for full-text search: title, then keywords, then description.
+# Kept in sync with the generated column created by migration b7d2f4a8c1e3.
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(jsonb_to_tsvector('english', coalesce(keywords::jsonb, '[]'::jsonb), "
+    "'[\"string\"]'), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+
 
 class FundingOpportunity(Base):
     """
@@ -69,6 +93,36 @@ class FundingOpportunity(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     is_archived = Column(Boolean, default=False, nullable=False)
 
+    # Full-text search document, generated by Postgres; never loaded by default
+    search_vector = deferred(
+        Column(TSVECTOR, Computed(SEARCH_VECTOR_EXPRESSION, persisted=True))
+    )
+
+    __table_args__ = (
+        Index(
+            "ix_funding_opportunities_search_vector",
+            "search_vector",
+            postgresql_using="gin",
+        ),
+        # ix_funding_opportunities_title_trgm (trigram title search) needs the
+        # pg_trgm extension, so only the migration creates it, when available
+        Index(
+            "ix_funding_opportunities_focus_areas",
+            cast(text("focus_areas"), JSONB),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_funding_opportunities_geographic_focus",
+            cast(text("geographic_focus"), JSONB),
+            postgresql_using="gin",
+        ),
+        Index(
+            "ix_funding_opportunities_open_deadline",
+            "application_deadline",
+            postgresql_where=text("is_active AND NOT is_archived"),
+        ),
+    )
+
     def to_dict(self):
         """Convert model to dictionary"""
         return {
@@ -0,0 +1,30 @@
+from sqlalchemy import Column, String, DateTime, JSON
+from datetime import datetime
+from db import Base
+
+
+class BackgroundJobState(Base):
+    """Persistent bookkeeping for periodic background jobs (watermarks, last run)"""
+
+    __tablename__ = "background_job_state"
+
+    job_name = Column(String(100), primary_key=True)
+
+    # High-water mark of source rows already processed by the job
+    watermark = Column(DateTime, nullable=True)
+    last_run_at = Column(DateTime, nullable=True)
+    last_run_stats = Column(JSON, nullable=True)
+
+    updated_at = Column(
+        DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False
+    )
+
+    def to_dict(self):
+        """Convert model to dictionary"""
+        return {
+            "job_name": self.job_name,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+            "last_run_at": self.last_run_at.isoformat() if self.last_run_at else None,
+            "last_run_stats": self.last_run_stats,
+            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
+        }
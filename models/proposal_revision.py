@@ -0,0 +1,47 @@
+from sqlalchemy import Column, String, Text, DateTime, JSON, Integer, ForeignKey
+from sqlalchemy.dialects.postgresql import UUID
+from sqlalchemy.orm import deferred
+from datetime import datetime
+from db import Base
+
+
+class ProposalRevision(Base):
+    """
+    One saved version of a proposal
+
+    Most revisions store a line delta against the previous version; every
+    few versions a full snapshot is stored so reconstructing any version
+    reads at most a handful of rows.
+    """
+
+    __tablename__ = "proposal_revisions"
+
+    proposal_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("proposals.id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    version = Column(Integer, primary_key=True)
+
+    kind = Column(String(16), nullable=False)  # snapshot or delta
+    snapshot = deferred(Column(Text, nullable=True))  # Full content (snapshots)
+    delta = deferred(Column(JSON, nullable=True))  # Ops against version - 1 (deltas)
+    size = Column(Integer, nullable=False)  # Characters stored in snapshot/delta
+
+    # Other fields changed by the same save (title, executive_summary, status)
+    changes = Column(JSON, nullable=True)
+
+    user_id = Column(String(255), nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    def to_dict(self):
+        """Convert model to dictionary (metadata only)"""
+        return {
+            "proposal_id": str(self.proposal_id),
+            "version": self.version,
+            "kind": self.kind,
+            "size": self.size,
+            "changes": self.changes,
+            "user_id": self.user_id,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+        }
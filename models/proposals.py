@@ -8,15 +8,17 @@ from sqlalchemy import (
     Integer,
     ForeignKey,
     Float,
+    Index,
 )
 from sqlalchemy.dialects.postgresql import UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy.ext.asyncio import AsyncAttrs
+from sqlalchemy.orm import relationship, deferred
 from datetime import datetime
 import uuid
 from db import Base
 
 
-class Proposal(Base):
+class Proposal(AsyncAttrs, Base):
     """Proposal model for storing generated proposals"""
 
     __tablename__ = "proposals"
@@ -32,11 +34,18 @@ class Proposal(Base):
 
     # Proposal Content
     title = Column(String(500), nullable=False)
-    content = Column(Text, nullable=False)  # Full proposal text
+    # Large columns are deferred (content into the "body" group): list queries
+    # never load them, and touching them without undefer_group("body") raises
+    # instead of issuing a lazy load (which async sessions cannot do anyway).
+    content = deferred(
+        Column(Text, nullable=False), group="body", raiseload=True
+    )  # Full proposal text
     executive_summary = Column(Text, nullable=True)
 
     # Generation Metadata
-    generation_prompt = Column(Text, nullable=False)  # Prompt used for generation
+    generation_prompt_hash = Column(
+        String(64), ForeignKey("content_blobs.hash"), nullable=True
+    )  # Prompt used for generation (see ContentBlob)
     donor_template_used = Column(String(255), nullable=True)  # Template identifier
     ai_model_used = Column(String(100), nullable=False)  # e.g., "gpt-4"
     generation_timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -51,7 +60,8 @@ class Proposal(Base):
     # User Interactions
     user_rating = Column(Integer, nullable=True)  # 1-5 star rating
     user_feedback = Column(Text, nullable=True)  # User comments
-    edit_history = Column(JSON, nullable=True)  # Track user edits
+    # Legacy full-copy edit log; no longer written (see ProposalRevision)
+    edit_history = deferred(Column(JSON, nullable=True), raiseload=True)
 
     # Status & Workflow
     status = Column(
@@ -70,9 +80,9 @@ class Proposal(Base):
     last_exported_at = Column(DateTime, nullable=True)
 
     # Funding Opportunity Snapshot (for reference)
-    funding_opportunity_snapshot = Column(
-        JSON, nullable=True
-    )  # Snapshot of funding opp at generation time
+    funding_opportunity_snapshot_hash = Column(
+        String(64), ForeignKey("content_blobs.hash"), nullable=True
+    )  # Snapshot of funding opp at generation time (see ContentBlob)
 
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -84,6 +94,25 @@ class Proposal(Base):
     is_active = Column(Boolean, default=True, nullable=False)
     is_archived = Column(Boolean, default=False, nullable=False)
 
+    # Deduplicated blobs; load with `await proposal.load_generation_prompt()` etc.
+    generation_prompt_blob = relationship(
+        "ContentBlob", foreign_keys=[generation_prompt_hash], viewonly=True
+    )
+    funding_opportunity_snapshot_blob = relationship(
+        "ContentBlob", foreign_keys=[funding_opportunity_snapshot_hash], viewonly=True
+    )
+
+    __table_args__ = (
+        # Serves keyset-paginated listing (newest first) as an index range scan
+        Index(
+            "ix_proposals_user_listing",
+            user_id,
+            is_active,
+            created_at.desc(),
+            id.desc(),
+        ),
+    )
+
     def to_dict(self):
         """Convert model to dictionary"""
         return {
@@ -94,7 +123,7 @@ class Proposal(Base):
             "title": self.title,
             "content": self.content,
             "executive_summary": self.executive_summary,
-            "generation_prompt": self.generation_prompt,
+            "generation_prompt_hash": self.generation_prompt_hash,
             "donor_template_used": self.donor_template_used,
             "ai_model_used": self.ai_model_used,
             "generation_timestamp": (
@@ -107,7 +136,6 @@ class Proposal(Base):
             "completeness_score": self.completeness_score,
             "user_rating": self.user_rating,
             "user_feedback": self.user_feedback,
-            "edit_history": self.edit_history,
             "status": self.status,
             "version": self.version,
             "parent_proposal_id": (
@@ -118,13 +146,23 @@ class Proposal(Base):
             "last_exported_at": (
                 self.last_exported_at.isoformat() if self.last_exported_at else None
             ),
-            "funding_opportunity_snapshot": self.funding_opportunity_snapshot,
+            "funding_opportunity_snapshot_hash": self.funding_opportunity_snapshot_hash,
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
             "is_active": self.is_active,
             "is_archived": self.is_archived,
         }
 
+    async def load_generation_prompt(self):
+        """Load the generation prompt from the content store"""
+        blob = await self.awaitable_attrs.generation_prompt_blob
+        return blob.as_text() if blob else None
+
+    async def load_funding_opportunity_snapshot(self):
+        """Load the funding opportunity snapshot from the content store"""
+        blob = await self.awaitable_attrs.funding_opportunity_snapshot_blob
+        return blob.as_json() if blob else None
+
     def to_summary_dict(self):
         """Convert model to summary dictionary (for lists)"""
         return {
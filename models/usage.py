@@ -1,24 +1,33 @@
-from sqlalchemy import Column, String, Integer, DateTime, Boolean
+from sqlalchemy import Column, String, Integer, DateTime, Date, Boolean, Index
 from sqlalchemy.dialects.postgresql import UUID
-from datetime import datetime, timezone, timedelta
+from datetime import date, datetime, timezone, timedelta
 import uuid
 from db import Base
 
 
 class UsageLedger(Base):
-    """Usage tracking for API limits and billing"""
+    """
+    Usage tracking for API limits and billing
+
+    Range-partitioned by month on created_at (see services.ledger_partitions),
+    so created_at is part of the primary key.
+    """
 
     __tablename__ = "usage_ledger"
+    __table_args__ = (
+        Index("ix_usage_ledger_user_action_created", "user_id", "action_type", "created_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
-    user_id = Column(String(255), nullable=False, index=True)
+    user_id = Column(String(255), nullable=False)
 
     # Usage tracking
     action_type = Column(String(50), nullable=False)  # 'generate', 'export', etc.
     count = Column(Integer, default=1, nullable=False)
 
     # Timestamps
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow, primary_key=True)
 
     # Plan information (cached for quick lookup)
     plan_name = Column(String(100), default="free", nullable=False)
@@ -51,3 +60,29 @@ class UsageLedger(Base):
             return current_start.replace(year=current_start.year + 1, month=1)
         else:
             return current_start.replace(month=current_start.month + 1)
+
+
+class UsageMonthlyRollup(Base):
+    """
+    Per-(user, month, action) usage totals
+
+    Maintained by UsageService alongside every ledger insert, so the
+    monthly summary reads a few primary-key rows instead of summing the
+    ledger. plan_name and monthly_limit are those of the latest entry.
+    """
+
+    __tablename__ = "usage_monthly_rollup"
+
+    user_id = Column(String(255), primary_key=True)
+    month = Column(Date, primary_key=True)  # First day of the month (UTC)
+    action_type = Column(String(50), primary_key=True)
+
+    count = Column(Integer, default=0, nullable=False)
+    plan_name = Column(String(100), default="free", nullable=False)
+    monthly_limit = Column(Integer, default=10, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    @staticmethod
+    def month_of(moment: datetime) -> date:
+        """Rollup month of a (UTC) timestamp"""
+        return moment.date().replace(day=1)
@@ -18,6 +18,8 @@ class PromptBuilder:
         profile: NGOProfile,
         funding_opportunity: FundingOpportunity,
         custom_instructions: Optional[str] = None,
+        funding_opportunity_text: Optional[str] = None,
+        donor_template: Optional[str] = None,
     ) -> str:
         """
         Build a comprehensive prompt for proposal generation
@@ -26,15 +28,24 @@ class PromptBuilder:
             profile: NGO profile containing organization information
             funding_opportunity: Funding opportunity details
             custom_instructions: Optional custom instructions from user
+            funding_opportunity_text: Optional pre-formatted opportunity section
+                (see format_funding_opportunity)
+            donor_template: Optional pre-resolved donor template
 
         Returns:
             str: Complete prompt for AI generation
         """
         try:
             # Get donor-specific template
-            donor_template = self.donor_templates.get_template(
-                funding_opportunity.donor_organization
-            )
+            if donor_template is None:
+                donor_template = self.donor_templates.get_template(
+                    funding_opportunity.donor_organization
+                )
+
+            if funding_opportunity_text is None:
+                funding_opportunity_text = self.format_funding_opportunity(
+                    funding_opportunity
+                )
 
             # Build the prompt
             prompt = f"""
@@ -44,7 +55,7 @@ ORGANIZATION PROFILE:
 {self._format_organization_profile(profile)}
 
 FUNDING OPPORTUNITY:
-{self._format_funding_opportunity(funding_opportunity)}
+{funding_opportunity_text}
 
 DONOR-SPECIFIC GUIDELINES:
 {donor_template}
@@ -129,7 +140,7 @@ Website: {profile.website or 'Not specified'}
             logger.error(f"Error formatting organization profile: {str(e)}")
             return "Organization profile formatting error"
 
-    def _format_funding_opportunity(
+    def format_funding_opportunity(
         self, funding_opportunity: FundingOpportunity
     ) -> str:
         """Format funding opportunity for the prompt"""
@@ -215,7 +226,7 @@ ENHANCEMENT REQUEST:
 {enhancement_request}
 
 FUNDING OPPORTUNITY CONTEXT:
-{self._format_funding_opportunity(funding_opportunity)}
+{self.format_funding_opportunity(funding_opportunity)}
 
 ENHANCEMENT GUIDELINES:
 1. Maintain the overall structure and quality of the original proposal
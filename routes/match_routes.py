@@ -0,0 +1,62 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any
+from pydantic import BaseModel
+from db import get_db_session
+from services.alignment_service import AlignmentService
+from utils.auth import get_current_user_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class MatchItem(BaseModel):
+    """Schema for a single funding opportunity match"""
+
+    opportunity: Dict[str, Any]
+    alignment_score: float
+
+
+class MatchListResponse(BaseModel):
+    """Schema for a page of funding opportunity matches"""
+
+    items: List[MatchItem]
+    next_cursor: Optional[str]
+
+
+@router.get("/", response_model=MatchListResponse)
+async def get_matches(
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    """Get best-aligned funding opportunities for the current user's profile"""
+    try:
+        alignment_service = AlignmentService(db)
+        page = await alignment_service.get_top_matches_for_user(
+            current_user_id, limit=limit, cursor=cursor
+        )
+
+        if page is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Profile not found",
+            )
+
+        matches, next_cursor = page
+        return MatchListResponse(
+            items=[MatchItem(**match) for match in matches], next_cursor=next_cursor
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching matches: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
@@ -0,0 +1,69 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional, Dict, Any
+from datetime import datetime
+from pydantic import BaseModel
+from db import get_db_session
+from services.opportunity_service import OpportunityService
+from utils.auth import get_current_user_id
+import logging
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter()
+
+
+class OpportunitySearchResponse(BaseModel):
+    """Schema for a page of funding opportunity search results"""
+
+    items: List[Dict[str, Any]]
+    limit: int
+    offset: int
+    has_more: bool
+
+
+@router.get("/search", response_model=OpportunitySearchResponse)
+async def search_opportunities(
+    q: Optional[str] = Query(None, min_length=2, max_length=200),
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    amount_min: Optional[float] = Query(None, ge=0),
+    amount_max: Optional[float] = Query(None, ge=0),
+    currency: Optional[str] = Query(None, min_length=3, max_length=10),
+    focus_area: Optional[List[str]] = Query(None),
+    geography: Optional[List[str]] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0, le=10000),
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id),
+):
+    """Search active funding opportunities with ranked full-text search and filters"""
+    if amount_min is not None and amount_max is not None and amount_min > amount_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="amount_min must not exceed amount_max",
+        )
+
+    try:
+        opportunity_service = OpportunityService(db)
+        items, has_more = await opportunity_service.search(
+            limit=limit,
+            offset=offset,
+            q=q,
+            deadline_from=deadline_from,
+            deadline_to=deadline_to,
+            amount_min=amount_min,
+            amount_max=amount_max,
+            currency=currency,
+            focus_areas=focus_area,
+            geography=geography,
+        )
+        return OpportunitySearchResponse(
+            items=items, limit=limit, offset=offset, has_more=has_more
+        )
+    except Exception as e:
+        logger.error(f"Error searching opportunities: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error",
+        )
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from pydantic import BaseModel, Field
 from db import get_db_session
 from services.ngo_profile_manager import NGOProfileManager
 from utils.auth import get_current_user_id
+from utils.etag import make_etag, etag_matches, set_etag, not_modified
 import logging
 
 logger = logging.getLogger(__name__)
@@ -55,6 +56,8 @@ async def get_profile_manager(
 
 @router.get("/", response_model=Optional[ProfileResponse])
 async def get_profile(
+    http_response: Response,
+    if_none_match: Optional[str] = Header(None),
     profile_manager: NGOProfileManager = Depends(get_profile_manager),
     current_user_id: str = Depends(get_current_user_id),
 ):
@@ -62,6 +65,7 @@ async def get_profile(
     Get NGO profile for current user.
 
     Returns profile data with confidence score and readiness status.
+    Supports conditional GET via ETag / If-None-Match.
     """
     try:
         # Convert user_id from string to int for the manager
@@ -71,6 +75,15 @@ async def get_profile(
             else int(current_user_id)
         )
 
+        # Answer conditional requests from the version key alone
+        profile_version = await profile_manager.get_profile_version(user_id)
+        if not profile_version:
+            return None
+
+        etag = make_etag("profile", *profile_version)
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
         # Get profile data
         profile_data = await profile_manager.get_profile(user_id)
 
@@ -78,7 +91,7 @@ async def get_profile(
             return None
 
         # Get confidence score
-        confidence_score = await profile_manager.score_profile(user_id)
+        confidence_score = profile_manager.score_profile_data(profile_data)
 
         # Determine if profile is ready (score >= 60)
         profile_ready = confidence_score >= 60
@@ -98,6 +111,7 @@ async def get_profile(
         logger.info(
             f"Retrieved profile for user {user_id} with score {confidence_score}"
         )
+        set_etag(http_response, etag)
         return response
 
     except ValueError as e:
@@ -1,14 +1,29 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Header
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
+from uuid import UUID
 from pydantic import BaseModel, Field, validator
-from db import get_db_session
+from db import get_db_session, AsyncSessionLocal
 from services.proposal_service import ProposalService
-from services.usage_service import UsageService
+from services.usage_service import UsageService, UsageLimitExceeded
 from services.idempotency_service import IdempotencyService
+from services.proposal_revision_service import ProposalRevisionService
+from services.export_cache import export_cache, export_cache_key
+from services.export_executor import export_executor, ExportQueueFull, ExportTimeout
+from services.bulk_export import BULK_EXPORT_MAX_PROPOSALS, BulkExportItem, stream_bulk_export
 from utils.auth import get_current_user_id, get_current_user_id_flexible
 from utils.error_handlers import create_error_response
+from utils.etag import make_etag, etag_matches, set_etag, not_modified
+from utils.serialization import dump_row, dump_rows, json_response
+from utils.export_utils import (
+    EXPORT_MEDIA_TYPES, TEXT_EXPORT_FORMATS, ProposalSnapshot, export_filename, iter_text_export
+)
+from utils.document_model import document_for, is_document_cached
+from utils.file_responses import RangeFileResponse, content_disposition
 import logging
+import orjson
 import os
 
 logger = logging.getLogger(__name__)
@@ -66,6 +81,14 @@ class ProposalRate(BaseModel):
     feedback: Optional[str] = Field(None, max_length=1000, description="Optional feedback")
 
 
+class ProposalBulkExport(BaseModel):
+    """Schema for exporting several proposals as one ZIP"""
+    proposal_ids: List[UUID] = Field(
+        ..., min_length=1, max_length=BULK_EXPORT_MAX_PROPOSALS, description="Proposals to export"
+    )
+    format: str = Field("pdf", pattern="^(pdf|docx)$", description="Export format")
+
+
 class ProposalResponse(BaseModel):
     """Schema for proposal response"""
     id: str
@@ -84,6 +107,30 @@ class ProposalResponse(BaseModel):
     updated_at: str
 
 
+class ProposalRevisionSummary(BaseModel):
+    """Schema for a proposal revision (metadata only)"""
+    version: int
+    kind: str
+    size: int
+    changes: Optional[dict]
+    user_id: str
+    created_at: str
+
+
+class ProposalRevisionList(BaseModel):
+    """Schema for a page of proposal revisions"""
+    items: List[ProposalRevisionSummary]
+    next_cursor: Optional[str]
+
+
+class ProposalVersionResponse(BaseModel):
+    """Schema for a reconstructed proposal version"""
+    id: str
+    version: int
+    current_version: int
+    content: str
+
+
 class ProposalSummary(BaseModel):
     """Schema for proposal summary (for lists)"""
     id: str
@@ -95,6 +142,55 @@ class ProposalSummary(BaseModel):
     updated_at: str
 
 
+# Fields encoded straight from the ORM row on the hot endpoints
+PROPOSAL_RESPONSE_FIELDS = tuple(ProposalResponse.model_fields)
+PROPOSAL_SUMMARY_FIELDS = tuple(ProposalSummary.model_fields)
+
+
+FIELDS_QUERY_DESCRIPTION = (
+    "Comma-separated proposal fields to return (id is always included). "
+    "Unrequested columns are neither read nor encoded."
+)
+
+
+def parse_fields(fields: Optional[str], default: tuple) -> tuple:
+    """
+    Validate a fields= parameter against ProposalResponse
+
+    Returns the requested fields in schema order, or default if none given.
+    """
+    if not fields:
+        return default
+    requested = {field.strip() for field in fields.split(",") if field.strip()}
+    unknown = requested.difference(PROPOSAL_RESPONSE_FIELDS)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown fields: {', '.join(sorted(unknown))}"
+        )
+    requested.add("id")
+    return tuple(field for field in PROPOSAL_RESPONSE_FIELDS if field in requested)
+
+
+def version_etag(proposal_id, version, updated_at, fields: tuple = PROPOSAL_RESPONSE_FIELDS) -> str:
+    """ETag of a proposal representation; sparse fieldsets get their own tag"""
+    if fields == PROPOSAL_RESPONSE_FIELDS:
+        return make_etag("proposal", proposal_id, version, updated_at)
+    return make_etag("proposal", proposal_id, version, updated_at, ",".join(fields))
+
+
+def is_new_download(range_header: Optional[str]) -> bool:
+    """Whether an export request starts a download (no Range, or from byte 0)"""
+    if not range_header:
+        return True
+    return range_header.replace(" ", "").lower().startswith("bytes=0-")
+
+
+def proposal_etag(proposal, fields: tuple = PROPOSAL_RESPONSE_FIELDS) -> str:
+    """ETag of a loaded proposal (matches the version-key ETag)"""
+    return version_etag(proposal.id, proposal.version, proposal.updated_at, fields)
+
+
 @router.post("/generate", response_model=ProposalResponse, status_code=status.HTTP_201_CREATED)
 async def generate_proposal(
     generate_data: ProposalGenerate,
@@ -103,15 +199,35 @@ async def generate_proposal(
     current_user_id: str = Depends(get_current_user_id_flexible),
     idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
 ):
-    """Generate a new proposal using AI with idempotency and rate limiting"""
+    """
+    Generate a new proposal using AI with idempotency and rate limiting
+
+    A rate limit slot and a unit of monthly quota are reserved before the
+    LLM call and released if generation fails, so concurrent requests
+    cannot all pass the limits.
+    """
+    usage_service = UsageService(db)
+    reservation = None
     try:
         logger.info(f"🚀 Generating proposal for user: {current_user_id}")
         
-        # Rate limiting check
-        usage_service = UsageService(db)
+        # Rate limit and quota reservation
         rate_limit = int(os.getenv("RATE_LIMIT_GENERATE_PER_MINUTE", "5"))
         
-        if not await usage_service.check_rate_limit(current_user_id, "generate", rate_limit):
+        try:
+            reservation = await usage_service.reserve_usage(
+                current_user_id, "generate", rate_limit,
+                check_quota=os.getenv("MONTHLY_QUOTA_ENFORCED", "true").lower() == "true"
+            )
+        except UsageLimitExceeded as e:
+            if e.kind == "quota":
+                logger.warning(f"Monthly quota exceeded for user {current_user_id}")
+                return create_error_response(
+                    code="QUOTA_EXCEEDED",
+                    message=f"Monthly quota exceeded. Your plan allows {e.limit} actions per month.",
+                    status_code=429,
+                    details={"limit": e.limit, "action": "generate", **e.details}
+                )
             logger.warning(f"Rate limit exceeded for user {current_user_id}")
             return create_error_response(
                 code="RATE_LIMIT_EXCEEDED",
@@ -135,7 +251,7 @@ async def generate_proposal(
             if cached_response:
                 response_data, status_code = cached_response
                 logger.info(f"Returning cached proposal for idempotency key: {idempotency_key}")
-                return ProposalResponse(**response_data)
+                return json_response(response_data, status_code=status_code)
         
         # Validate input using the Pydantic model validation
         # This will automatically trigger our validator and raise ValidationError if invalid
@@ -161,10 +277,10 @@ async def generate_proposal(
             )
         
         # Record usage
-        await usage_service.record_usage(current_user_id, "generate")
+        await usage_service.commit_usage(reservation)
         
         # Prepare response
-        response_data = proposal.to_dict()
+        body = dump_row(proposal, PROPOSAL_RESPONSE_FIELDS)
         
         # Store idempotency record if key provided
         if idempotency_key:
@@ -172,13 +288,13 @@ async def generate_proposal(
                 user_id=current_user_id,
                 idempotency_key=idempotency_key,
                 endpoint="generate_proposal",
-                response_data=response_data,
+                response_data=orjson.loads(body),
                 status_code=201,
                 request_data=generate_data.dict()
             )
         
         logger.info(f"✅ Proposal generated successfully for user: {current_user_id}")
-        return ProposalResponse(**response_data)
+        return json_response(body, status_code=status.HTTP_201_CREATED)
         
     except ValueError as e:
         logger.warning(f"Proposal generation validation failed: {str(e)}")
@@ -195,26 +311,41 @@ async def generate_proposal(
             message="An unexpected error occurred during proposal generation",
             status_code=500
         )
+    finally:
+        # Nothing generated (error or idempotent replay): give the slot back
+        if reservation is not None:
+            await usage_service.release_usage(reservation)
 
 
 @router.get("/", response_model=List[ProposalSummary])
 async def get_proposals(
-    limit: int = 50,
-    offset: int = 0,
+    limit: int = Query(50, ge=1, le=200),
+    offset: int = Query(0, ge=0),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from the X-Next-Cursor header of the previous page"),
     status_filter: Optional[str] = None,
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get all proposals for current user"""
+    """Get all proposals for current user (newest first, cursor-paginated)"""
+    selected = parse_fields(fields, PROPOSAL_SUMMARY_FIELDS)
     try:
         proposal_service = ProposalService(db)
-        proposals = await proposal_service.get_user_proposals(
+        proposals, next_cursor = await proposal_service.get_user_proposals_page(
             user_id=current_user_id,
             limit=limit,
+            cursor=cursor,
             offset=offset,
-            status=status_filter
+            status=status_filter,
+            fields=selected if fields else None
+        )
+        headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+        return json_response(dump_rows(proposals, selected), headers=headers)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
         )
-        return [ProposalSummary(**proposal.to_summary_dict()) for proposal in proposals]
     except Exception as e:
         logger.error(f"Error fetching proposals: {str(e)}")
         raise HTTPException(
@@ -226,13 +357,33 @@ async def get_proposals(
 @router.get("/{proposal_id}", response_model=ProposalResponse)
 async def get_proposal(
     proposal_id: str,
+    if_none_match: Optional[str] = Header(None),
+    fields: Optional[str] = Query(None, description=FIELDS_QUERY_DESCRIPTION),
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Get specific proposal by ID"""
+    """Get specific proposal by ID (supports If-None-Match and fields=)"""
+    selected = parse_fields(fields, PROPOSAL_RESPONSE_FIELDS)
     try:
         proposal_service = ProposalService(db)
-        proposal = await proposal_service.get_proposal_by_id(proposal_id, current_user_id)
+
+        if if_none_match:
+            # Revalidation only needs the version key, not the body
+            version_key = await proposal_service.get_proposal_version_key(proposal_id, current_user_id)
+            if not version_key:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Proposal not found"
+                )
+            etag = version_etag(*version_key, fields=selected)
+            if etag_matches(if_none_match, etag):
+                return not_modified(etag)
+
+        proposal = await proposal_service.get_proposal_by_id(
+            proposal_id,
+            current_user_id,
+            fields=selected if fields else None
+        )
         
         if not proposal:
             raise HTTPException(
@@ -240,7 +391,9 @@ async def get_proposal(
                 detail="Proposal not found"
             )
         
-        return ProposalResponse(**proposal.to_dict())
+        response = json_response(dump_row(proposal, selected))
+        set_etag(response, proposal_etag(proposal, selected))
+        return response
     except HTTPException:
         raise
     except Exception as e:
@@ -255,6 +408,7 @@ async def get_proposal(
 async def update_proposal(
     proposal_id: str,
     update_data: ProposalUpdate,
+    response: Response,
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id)
 ):
@@ -277,6 +431,7 @@ async def update_proposal(
                 detail="Proposal not found"
             )
         
+        set_etag(response, proposal_etag(proposal))
         return ProposalResponse(**proposal.to_dict())
     except HTTPException:
         raise
@@ -288,10 +443,95 @@ async def update_proposal(
         )
 
 
+@router.get("/{proposal_id}/revisions", response_model=ProposalRevisionList)
+async def get_proposal_revisions(
+    proposal_id: str,
+    limit: int = Query(50, ge=1, le=200),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """List the revisions of a proposal, newest first"""
+    try:
+        proposal_service = ProposalService(db)
+        proposal = await proposal_service.get_proposal_by_id(
+            proposal_id, current_user_id, include_body=False
+        )
+        
+        if not proposal:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proposal not found"
+            )
+        
+        revision_service = ProposalRevisionService(db)
+        revisions, next_cursor = await revision_service.list_revisions(
+            proposal.id, limit=limit, cursor=cursor
+        )
+        return ProposalRevisionList(
+            items=[ProposalRevisionSummary(**revision) for revision in revisions],
+            next_cursor=next_cursor
+        )
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error fetching proposal revisions: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
+@router.get("/{proposal_id}/versions/{version}", response_model=ProposalVersionResponse)
+async def get_proposal_version(
+    proposal_id: str,
+    version: int,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """Get the content of a proposal as of a given version"""
+    try:
+        proposal_service = ProposalService(db)
+        proposal = await proposal_service.get_proposal_by_id(proposal_id, current_user_id)
+        
+        if not proposal:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Proposal not found"
+            )
+        
+        revision_service = ProposalRevisionService(db)
+        content = await revision_service.get_version_content(proposal, version)
+        
+        if content is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Version not found"
+            )
+        
+        return ProposalVersionResponse(
+            id=str(proposal.id),
+            version=version,
+            current_version=proposal.version,
+            content=content
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching proposal version: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+
+
 @router.post("/{proposal_id}/rate", response_model=ProposalResponse)
 async def rate_proposal(
     proposal_id: str,
     rating_data: ProposalRate,
+    response: Response,
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id)
 ):
@@ -311,6 +551,7 @@ async def rate_proposal(
                 detail="Proposal not found"
             )
         
+        set_etag(response, proposal_etag(proposal))
         return ProposalResponse(**proposal.to_dict())
     except HTTPException:
         raise
@@ -350,20 +591,88 @@ async def archive_proposal(
         )
 
 
+async def export_text(
+    db: AsyncSession,
+    proposal_service: ProposalService,
+    proposal_id: str,
+    user_id: str,
+    export_format: str,
+    if_none_match: Optional[str]
+):
+    """Stream an HTML or Markdown export rendered from the cached document model"""
+    proposal = await proposal_service.get_proposal_by_id(proposal_id, user_id, include_body=False)
+    if not proposal:
+        return create_error_response(
+            code="PROPOSAL_NOT_FOUND",
+            message="Proposal not found",
+            status_code=404
+        )
+    
+    etag = f'"{export_cache_key(proposal, export_format)}"'
+    if etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    
+    if not is_document_cached(proposal.id, proposal.version):
+        await db.refresh(proposal, attribute_names=["content"])
+    document = document_for(proposal)
+    # The body streams after the session is closed, so render from a copy
+    snapshot = ProposalSnapshot.from_proposal(proposal, include_content=False)
+    await proposal_service.track_export(proposal_id, export_format)
+    
+    return StreamingResponse(
+        iter_text_export(export_format, snapshot, document),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": content_disposition(export_filename(proposal, export_format)),
+            "ETag": etag,
+            "Cache-Control": "private, no-cache",
+        }
+    )
+
+
 @router.get("/{proposal_id}/export/{format}")
 async def export_proposal(
     proposal_id: str,
     format: str,
+    range_header: Optional[str] = Header(None, alias="Range"),
+    if_range: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id)
 ):
-    """Export proposal in specified format (PDF, DOCX) with rate limiting"""
+    """
+    Export proposal as PDF, DOCX, HTML or Markdown
+
+    PDF and DOCX are rate limited and rendered files are cached per proposal
+    version and metadata, so repeat downloads are a file send with
+    Content-Length and Range support. HTML and Markdown are streamed
+    straight from the parsed document and are not rate limited.
+    """
+    reservation = None
     try:
-        # Rate limiting check
+        export_format = format.lower()
+        if export_format not in EXPORT_MEDIA_TYPES:
+            return create_error_response(
+                code="INVALID_FORMAT",
+                message="Unsupported format. Use 'pdf', 'docx', 'html' or 'md'",
+                status_code=400,
+                details={"supported_formats": list(EXPORT_MEDIA_TYPES)}
+            )
+        
+        proposal_service = ProposalService(db)
         usage_service = UsageService(db)
+        
+        if export_format in TEXT_EXPORT_FORMATS:
+            return await export_text(
+                db, proposal_service, proposal_id, current_user_id, export_format, if_none_match
+            )
+        
+        # Rate limit reservation, released unless the export is sent
         rate_limit = int(os.getenv("RATE_LIMIT_EXPORT_PER_MINUTE", "10"))
         
-        if not await usage_service.check_rate_limit(current_user_id, "export", rate_limit):
+        try:
+            reservation = await usage_service.reserve_usage(current_user_id, "export", rate_limit)
+        except UsageLimitExceeded:
             logger.warning(f"Export rate limit exceeded for user {current_user_id}")
             return create_error_response(
                 code="RATE_LIMIT_EXCEEDED",
@@ -372,16 +681,10 @@ async def export_proposal(
                 details={"limit": rate_limit, "action": "export"}
             )
         
-        if format.lower() not in ["pdf", "docx"]:
-            return create_error_response(
-                code="INVALID_FORMAT",
-                message="Unsupported format. Use 'pdf' or 'docx'",
-                status_code=400,
-                details={"supported_formats": ["pdf", "docx"]}
-            )
-        
-        proposal_service = ProposalService(db)
-        proposal = await proposal_service.get_proposal_by_id(proposal_id, current_user_id)
+        # Content is only loaded if the export has to be rendered
+        proposal = await proposal_service.get_proposal_by_id(
+            proposal_id, current_user_id, include_body=False
+        )
         
         if not proposal:
             return create_error_response(
@@ -390,28 +693,60 @@ async def export_proposal(
                 status_code=404
             )
         
-        # Import export utilities
-        from utils.export_utils import generate_docx, generate_pdf
-        
-        if format.lower() == "docx":
-            file_content, filename = generate_docx(proposal)
-            media_type = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-        else:  # pdf
-            file_content, filename = generate_pdf(proposal)
-            media_type = "application/pdf"
-        
-        # Update export tracking
-        await proposal_service.track_export(proposal_id, format.lower())
+        media_type = EXPORT_MEDIA_TYPES[export_format]
+        filename = export_filename(proposal, export_format)
+        cache_key = export_cache_key(proposal, export_format)
+        etag = f'"{cache_key}"'
+        
+        cached_file = await run_in_threadpool(export_cache.open, cache_key, export_format)
+        if cached_file is None:
+            await db.refresh(proposal, attribute_names=["content"])
+            # The worker process writes the document to this file and the
+            # response streams it back, so it is never held in memory here
+            temp_path = await run_in_threadpool(export_cache.new_temp_path)
+            try:
+                filename = await export_executor.render(
+                    export_format, ProposalSnapshot.from_proposal(proposal), temp_path
+                )
+            except ExportQueueFull:
+                export_cache.discard(temp_path)
+                logger.warning(f"Export queue full, rejecting export of proposal {proposal_id}")
+                busy_response = create_error_response(
+                    code="EXPORT_BUSY",
+                    message="Too many exports in progress. Please retry shortly.",
+                    status_code=503
+                )
+                busy_response.headers["Retry-After"] = "5"
+                return busy_response
+            except ExportTimeout:
+                logger.error(f"Export of proposal {proposal_id} to {export_format} timed out")
+                return create_error_response(
+                    code="EXPORT_TIMEOUT",
+                    message="Rendering the export took too long.",
+                    status_code=504
+                )
+            except Exception:
+                export_cache.discard(temp_path)
+                raise
+            cached_file = await run_in_threadpool(
+                export_cache.commit, cache_key, export_format, temp_path
+            )
         
-        # Record usage for rate limiting
-        await usage_service.record_usage(current_user_id, "export")
+        # Resumed downloads (Range past byte 0) are not counted again
+        if is_new_download(range_header):
+            # Update export tracking
+            await proposal_service.track_export(proposal_id, export_format)
+            
+            # Record usage for rate limiting
+            await usage_service.commit_usage(reservation)
         
-        # Return file response
-        from fastapi.responses import Response
-        return Response(
-            content=file_content,
+        return RangeFileResponse(
+            cached_file,
             media_type=media_type,
-            headers={"Content-Disposition": f"attachment; filename={filename}"}
+            filename=filename,
+            range_header=range_header,
+            if_range=if_range,
+            etag=etag
         )
         
     except HTTPException:
@@ -421,4 +756,121 @@ async def export_proposal(
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
-        ) 
\ No newline at end of file
+        )
+    finally:
+        # Failed, rejected or resumed downloads do not count
+        if reservation is not None:
+            await usage_service.release_usage(reservation)
+
+@router.post("/export")
+async def bulk_export_proposals(
+    export_request: ProposalBulkExport,
+    db: AsyncSession = Depends(get_db_session),
+    current_user_id: str = Depends(get_current_user_id)
+):
+    """
+    Export several proposals as one ZIP, streamed as each file is ready
+
+    Every proposal is reserved against the export rate limit up front.
+    Usage and export tracking are recorded once the archive is complete,
+    only for the proposals that made it into it; the rest of the
+    reservation is given back.
+    """
+    reservation = None
+    streaming = False
+    try:
+        export_format = export_request.format
+        proposal_ids = [str(proposal_id) for proposal_id in dict.fromkeys(export_request.proposal_ids)]
+        
+        usage_service = UsageService(db)
+        rate_limit = int(os.getenv("RATE_LIMIT_EXPORT_PER_MINUTE", "10"))
+        
+        try:
+            reservation = await usage_service.reserve_usage(
+                current_user_id, "export", rate_limit, count=len(proposal_ids)
+            )
+        except UsageLimitExceeded:
+            logger.warning(f"Export rate limit exceeded for user {current_user_id}")
+            return create_error_response(
+                code="RATE_LIMIT_EXCEEDED",
+                message=f"Rate limit exceeded. Maximum {rate_limit} exports per minute.",
+                status_code=429,
+                details={"limit": rate_limit, "action": "export", "requested": len(proposal_ids)}
+            )
+        
+        proposal_service = ProposalService(db)
+        proposals = {
+            str(proposal.id): proposal
+            for proposal in await proposal_service.get_proposals_for_export(proposal_ids, current_user_id)
+        }
+        missing = [proposal_id for proposal_id in proposal_ids if proposal_id not in proposals]
+        if missing:
+            return create_error_response(
+                code="PROPOSAL_NOT_FOUND",
+                message="Some proposals were not found",
+                status_code=404,
+                details={"proposal_ids": missing}
+            )
+        
+        items = []
+        to_render = []
+        for proposal_id in proposal_ids:
+            proposal = proposals[proposal_id]
+            cache_key = export_cache_key(proposal, export_format)
+            item = BulkExportItem(
+                proposal_id=proposal_id,
+                filename=export_filename(proposal, export_format),
+                cache_key=cache_key,
+                file=await run_in_threadpool(export_cache.open, cache_key, export_format)
+            )
+            if item.file is None:
+                to_render.append(item)
+            items.append(item)
+        
+        try:
+            if to_render:
+                # Load content only for the proposals that have to be rendered
+                await proposal_service.get_proposals_for_export(
+                    [item.proposal_id for item in to_render], current_user_id, include_body=True
+                )
+                for item in to_render:
+                    item.snapshot = ProposalSnapshot.from_proposal(proposals[item.proposal_id])
+        except Exception:
+            for item in items:
+                if item.file is not None:
+                    item.file.close()
+            raise
+        
+        async def record_exports(exported_ids: List[str]):
+            # Runs while the response streams, after this request's session
+            # may be gone, so it uses its own
+            async with AsyncSessionLocal() as session:
+                await ProposalService(session).track_exports(exported_ids, export_format)
+                await UsageService(session).commit_usage(reservation, count=len(exported_ids))
+        
+        async def stream_archive():
+            try:
+                async for chunk in stream_bulk_export(items, export_format, on_complete=record_exports):
+                    yield chunk
+            finally:
+                # Aborted download or nothing exported
+                await usage_service.release_usage(reservation)
+        
+        streaming = True
+        return StreamingResponse(
+            stream_archive(),
+            media_type="application/zip",
+            headers={"Content-Disposition": content_disposition(f"proposals_{export_format}.zip")}
+        )
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error bulk exporting proposals: {str(e)}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error"
+        )
+    finally:
+        if reservation is not None and not streaming:
+            await usage_service.release_usage(reservation)
@@ -1,9 +1,12 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Response
 from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 from pydantic import BaseModel
 from db import get_db_session
-from services.usage_service import UsageService
+from services.usage_service import UsageService, default_usage_summary
+from models.usage import UsageLedger
 from utils.auth import get_current_user_id
+from utils.etag import make_etag, etag_matches, set_etag, not_modified
 import logging
 
 logger = logging.getLogger(__name__)
@@ -23,14 +26,35 @@ class UsageSummaryResponse(BaseModel):
 
 @router.get("/summary", response_model=UsageSummaryResponse)
 async def get_usage_summary(
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db_session),
     current_user_id: str = Depends(get_current_user_id),
 ):
     """Get current month usage summary for authenticated user"""
     try:
         usage_service = UsageService(db)
-        summary = await usage_service.get_usage_summary(current_user_id)
 
+        # The summary only changes with a new ledger entry or a new month
+        last_entry_at = await usage_service.get_usage_version(current_user_id)
+        etag = make_etag(
+            "usage",
+            current_user_id,
+            UsageLedger.get_current_month_start(),
+            last_entry_at,
+        )
+        if etag_matches(if_none_match, etag):
+            return not_modified(etag)
+
+        try:
+            summary = await usage_service.get_usage_summary(current_user_id)
+        except Exception:
+            # Serve the defaults, but without an ETag and uncacheable so the
+            # client does not keep revalidating against a made-up summary
+            response.headers["Cache-Control"] = "no-store"
+            return UsageSummaryResponse(**default_usage_summary())
+
+        set_etag(response, etag)
         return UsageSummaryResponse(**summary)
 
     except Exception as e:
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark response compression for typical proposal payloads.
+
+Serves ProposalResponse-shaped JSON (10-30 KB of prose) through
+CompressionMiddleware in-process and reports, per Accept-Encoding:
+bytes on the wire, server-side latency, and modeled end-to-end latency over
+a slow link (latency + bytes / bandwidth + server time).
+
+Usage:
+    python scripts/benchmark_compression.py --bandwidth-kbps 1000 --rtt-ms 150
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import httpx  # noqa: E402
+from fastapi import FastAPI  # noqa: E402
+
+from utils.compression import CompressionMiddleware, brotli  # noqa: E402
+
+WORDS = (
+    "community health education water sanitation resilience livelihoods women "
+    "youth capacity monitoring evaluation budget outcomes partners district "
+    "training beneficiaries sustainability climate adaptation agriculture "
+    "the and of to in for with by on through will our programme project"
+).split()
+
+
+def make_proposal(size_kb: int, seed: int) -> dict:
+    rng = random.Random(seed)
+    sections = []
+    while sum(len(s) for s in sections) < size_kb * 1024:
+        sentence_count = rng.randint(4, 9)
+        paragraph = " ".join(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(8, 20))).capitalize() + "."
+            for _ in range(sentence_count)
+        )
+        sections.append(f"## Section {len(sections) + 1}\n\n{paragraph}\n\n")
+    content = "".join(sections)
+    return {
+        "id": "4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11",
+        "user_id": "user-123",
+        "funding_opportunity_id": 42,
+        "title": "Strengthening Community Health Systems",
+        "content": content,
+        "executive_summary": content[:600],
+        "status": "draft",
+        "version": 3,
+        "confidence_score": 0.82,
+        "alignment_score": 0.76,
+        "completeness_score": 0.9,
+        "user_rating": None,
+        "created_at": "2026-10-01T09:00:00",
+        "updated_at": "2026-10-02T10:30:00",
+    }
+
+
+def make_app(payloads: dict) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/proposal/{size_kb}")
+    async def proposal(size_kb: int):
+        return payloads[size_kb]
+
+    return app
+
+
+async def run(sizes, encodings, runs, bandwidth_kbps, rtt_ms):
+    payloads = {size: make_proposal(size, size) for size in sizes}
+    transport = httpx.ASGITransport(app=make_app(payloads))
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        print(
+            f"{'size':>6} {'encoding':>9} {'wire bytes':>11} {'ratio':>6} "
+            f"{'server ms':>10} {'e2e ms':>9}"
+        )
+        for size in sizes:
+            identity_bytes = None
+            for encoding in encodings:
+                timings = []
+                wire_bytes = 0
+                for _ in range(runs):
+                    started = time.perf_counter()
+                    response = await client.get(
+                        f"/proposal/{size}", headers={"Accept-Encoding": encoding}
+                    )
+                    timings.append((time.perf_counter() - started) * 1000)
+                    # Content-Length is the encoded size on the wire
+                    wire_bytes = int(response.headers["content-length"])
+                if identity_bytes is None:
+                    identity_bytes = wire_bytes
+                server_ms = statistics.median(timings)
+                transfer_ms = wire_bytes * 8 / (bandwidth_kbps * 1000) * 1000
+                print(
+                    f"{size:>4}KB {encoding:>9} {wire_bytes:>11} "
+                    f"{identity_bytes / wire_bytes:>5.1f}x {server_ms:>10.2f} "
+                    f"{rtt_ms + transfer_ms + server_ms:>9.1f}"
+                )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="10,20,30", help="Payload sizes in KB")
+    parser.add_argument("--runs", type=int, default=50)
+    parser.add_argument("--bandwidth-kbps", type=float, default=1000.0)
+    parser.add_argument("--rtt-ms", type=float, default=150.0)
+    args = parser.parse_args()
+
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+    sizes = [int(size) for size in args.sizes.split(",")]
+    asyncio.run(run(sizes, encodings, args.runs, args.bandwidth_kbps, args.rtt_ms))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark DOCX export on a long proposal.
+
+Compares the previous generate_docx (a fresh Document() per export and
+add_paragraph/add_heading with style names) with the template writer
+(cached base document, prebuilt styled paragraphs).
+
+Usage:
+    python scripts/benchmark_docx_export.py --words 20000
+"""
+
+import argparse
+import io
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from docx import Document  # noqa: E402
+
+from scripts.benchmark_export_loop_lag import make_snapshot  # noqa: E402
+from utils.document_model import HEADING, LIST, document_for  # noqa: E402
+from utils.export_utils import generate_docx  # noqa: E402
+
+
+def legacy_docx(snapshot) -> int:
+    doc = Document()
+    title = doc.add_heading(snapshot.title, 0)
+    title.alignment = 1
+    doc.add_paragraph(f"Proposal ID: {snapshot.id}")
+    doc.add_heading('Executive Summary', level=1)
+    doc.add_paragraph(snapshot.executive_summary)
+    doc.add_heading('Proposal Content', level=1)
+    for block in document_for(snapshot).blocks:
+        if block.kind == HEADING:
+            doc.add_heading(block.text, level=2 if block.level <= 2 else 3)
+        elif block.kind == LIST:
+            for item in block.items:
+                doc.add_paragraph(item, style='List Bullet')
+        else:
+            doc.add_paragraph(block.text)
+    doc.add_page_break()
+    doc.add_heading('Proposal Information', level=1)
+    doc.add_paragraph(f"Status: {snapshot.status.title()}")
+    file_stream = io.BytesIO()
+    doc.save(file_stream)
+    return len(file_stream.getvalue())
+
+
+def template_docx(snapshot) -> int:
+    content, _ = generate_docx(snapshot)
+    return len(content)
+
+
+def timed(work, snapshot, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = work(snapshot)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot(args.words)
+    # Lists are what made per-paragraph style lookups expensive
+    snapshot.content += "\n\n" + "\n".join(f"- Activity {n}" for n in range(args.words // 20))
+    template_docx(snapshot)  # load the template once, as a worker would
+    print(f"{args.words} words, median of {args.repeat}")
+    for name, work in (("legacy docx", legacy_docx), ("template docx", template_docx)):
+        median_ms, result = timed(work, snapshot, args.repeat)
+        print(f"{name:<14} {median_ms:>8.1f} ms  ({result} bytes)")
+
+
+if __name__ == "__main__":
+    main()
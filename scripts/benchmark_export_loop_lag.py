@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark event-loop lag while exports render.
+
+Runs a 5 ms ticker on the event loop and measures how late it wakes up
+while N exports of a long proposal render, first inline on the loop (the
+old export_proposal behaviour) and then through the export process pool.
+
+Usage:
+    python scripts/benchmark_export_loop_lag.py --words 20000 --exports 4 --format pdf
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from services.export_executor import ExportExecutor  # noqa: E402
+from utils.export_utils import ProposalSnapshot, render_export  # noqa: E402
+
+TICK_SECONDS = 0.005
+
+WORDS = (
+    "community health education water sanitation resilience livelihoods women "
+    "youth capacity monitoring evaluation budget outcomes partners district "
+    "the and of to in for with by on through will our programme project"
+).split()
+
+
+def make_snapshot(word_count: int) -> ProposalSnapshot:
+    paragraphs = []
+    for n in range(word_count // 120):
+        words = " ".join(WORDS[(n * 7 + i) % len(WORDS)] for i in range(120))
+        paragraphs.append(f"## Section {n}" if n % 8 == 0 else words.capitalize() + ".")
+    return ProposalSnapshot(
+        id="4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11",
+        title="Strengthening Community Health Systems",
+        content="\n\n".join(paragraphs),
+        executive_summary=" ".join(WORDS * 4),
+        status="draft",
+        version=3,
+        confidence_score=0.82,
+        user_rating=4,
+    )
+
+
+async def measure_lag(work) -> dict:
+    lags = []
+    done = asyncio.Event()
+
+    async def ticker():
+        while not done.is_set():
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lags.append((time.perf_counter() - started - TICK_SECONDS) * 1000)
+
+    tick_task = asyncio.create_task(ticker())
+    await asyncio.sleep(TICK_SECONDS * 2)
+    started = time.perf_counter()
+    await work()
+    elapsed = time.perf_counter() - started
+    done.set()
+    await tick_task
+    lags.sort()
+    return {
+        "wall_s": elapsed,
+        "max_lag_ms": lags[-1],
+        "p99_lag_ms": lags[int(len(lags) * 0.99) - 1] if len(lags) > 1 else lags[-1],
+        "median_lag_ms": statistics.median(lags),
+    }
+
+
+async def run(word_count: int, exports: int, format: str, workers: int, directory: str):
+    snapshot = make_snapshot(word_count)
+    paths = [os.path.join(directory, f"export{n}.{format}") for n in range(exports)]
+
+    async def inline():
+        for path in paths:
+            render_export(format, snapshot, path)
+            await asyncio.sleep(0)
+
+    executor = ExportExecutor(max_workers=workers, max_pending=exports, timeout=300)
+    await executor.start()
+
+    async def pooled():
+        await asyncio.gather(*(executor.render(format, snapshot, path) for path in paths))
+
+    try:
+        print(f"{exports} x {format}, {word_count} words, {workers} workers")
+        print(f"{'mode':<8} {'wall s':>7} {'max lag ms':>11} {'p99 lag ms':>11} {'median ms':>10}")
+        for name, work in (("inline", inline), ("pool", pooled)):
+            result = await measure_lag(work)
+            print(
+                f"{name:<8} {result['wall_s']:>7.2f} {result['max_lag_ms']:>11.1f} "
+                f"{result['p99_lag_ms']:>11.1f} {result['median_lag_ms']:>10.2f}"
+            )
+    finally:
+        executor.shutdown()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--exports", type=int, default=4)
+    parser.add_argument("--format", choices=["docx", "pdf"], default="pdf")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(args.words, args.exports, args.format, args.workers, directory))
+
+
+if __name__ == "__main__":
+    main()
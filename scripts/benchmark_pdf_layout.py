@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark PDF text layout on a long proposal.
+
+Compares the previous generate_pdf wrapping loop (get_string_width on a
+growing line for every word, one cell() per line) with TextLayout (cached
+word widths, single-pass greedy breaking, text() per line), and times the
+full PDF export.
+
+Usage:
+    python scripts/benchmark_pdf_layout.py --words 20000
+    PDF_FONT_PATH=/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf \
+        python scripts/benchmark_pdf_layout.py --words 20000
+"""
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fpdf import FPDF  # noqa: E402
+
+from scripts.benchmark_export_loop_lag import make_snapshot  # noqa: E402
+from utils.export_utils import generate_pdf  # noqa: E402
+from utils.pdf_layout import TextLayout  # noqa: E402
+
+
+def paragraphs(snapshot):
+    return [p.strip() for p in snapshot.content.split("\n\n") if p.strip() and not p.startswith("#")]
+
+
+def legacy_layout(snapshot) -> int:
+    pdf = FPDF()
+    layout = TextLayout(pdf)
+    pdf.add_page()
+    layout.set_font("", 11)
+    for paragraph in paragraphs(snapshot):
+        for line in layout.clean(paragraph).split("\n"):
+            current_line = ""
+            for word in line.split(" "):
+                test_line = current_line + word + " "
+                if pdf.get_string_width(test_line) < 180:
+                    current_line = test_line
+                else:
+                    if current_line:
+                        pdf.cell(0, 6, current_line.strip(), new_x="LMARGIN", new_y="NEXT")
+                    current_line = word + " "
+            if current_line:
+                pdf.cell(0, 6, current_line.strip(), new_x="LMARGIN", new_y="NEXT")
+        pdf.ln(3)
+    return pdf.page
+
+
+def text_layout(snapshot) -> int:
+    pdf = FPDF()
+    layout = TextLayout(pdf)
+    pdf.add_page()
+    layout.set_font("", 11)
+    for paragraph in paragraphs(snapshot):
+        layout.write_text(paragraph, 6)
+        pdf.ln(3)
+    return pdf.page
+
+
+def full_export(snapshot) -> int:
+    content, _ = generate_pdf(snapshot)
+    return len(content)
+
+
+def timed(work, snapshot, repeat: int):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = work(snapshot)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings), result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--words", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    snapshot = make_snapshot(args.words)
+    print(f"{args.words} words, median of {args.repeat}")
+    for name, work in (("legacy layout", legacy_layout), ("TextLayout", text_layout), ("full export", full_export)):
+        median_ms, result = timed(work, snapshot, args.repeat)
+        print(f"{name:<14} {median_ms:>8.1f} ms  ({result})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Benchmark proposal listing: full-row loads vs. the summary projection.
+
+Seeds N proposals with realistic body sizes for a throwaway user (unless
+--no-seed), then lists them repeatedly both ways and reports median latency
+and peak Python memory (tracemalloc).
+
+Usage:
+    python scripts/benchmark_proposal_listing.py --count 500 --runs 20
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import select, delete, and_  # noqa: E402
+from sqlalchemy.orm import undefer_group  # noqa: E402
+
+from db import AsyncSessionLocal  # noqa: E402
+from models.ngo_profiles import NGOProfile  # noqa: E402
+from models.proposals import Proposal  # noqa: E402
+from services.proposal_service import ProposalService  # noqa: E402
+
+BENCH_USER_ID = "benchmark-proposal-listing"
+
+
+async def seed(count: int):
+    """Replace the benchmark user's proposals with count fresh rows"""
+    paragraph = "Our programme strengthens community health systems. " * 20
+    content = "\n\n".join(f"## Section {n}\n{paragraph}" for n in range(25))
+    async with AsyncSessionLocal() as session:
+        profile_id = (await session.execute(select(NGOProfile.id).limit(1))).scalar()
+        if profile_id is None:
+            raise SystemExit("Need at least one NGO profile to attach proposals to")
+
+        await session.execute(delete(Proposal).where(Proposal.user_id == BENCH_USER_ID))
+        start = datetime.utcnow()
+        for n in range(count):
+            session.add(
+                Proposal(
+                    user_id=BENCH_USER_ID,
+                    ngo_profile_id=profile_id,
+                    funding_opportunity_id=1,
+                    title=f"Benchmark proposal {n}",
+                    content=content,
+                    ai_model_used="benchmark",
+                    edit_history=[{"changes": {"content": content}, "version": 1}],
+                    created_at=start - timedelta(seconds=n),
+                    updated_at=start,
+                )
+            )
+        await session.commit()
+
+
+async def list_full(limit: int):
+    """Previous behaviour: every column of every row"""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(Proposal)
+            .options(undefer_group("body"))
+            .where(and_(Proposal.user_id == BENCH_USER_ID, Proposal.is_active == True))
+            .order_by(Proposal.created_at.desc())
+            .limit(limit)
+        )
+        return [proposal.to_summary_dict() for proposal in result.scalars().all()]
+
+
+async def list_summary(limit: int):
+    """Current behaviour: summary projection only"""
+    async with AsyncSessionLocal() as session:
+        service = ProposalService(session)
+        proposals = await service.get_user_proposals(BENCH_USER_ID, limit=limit)
+        return [proposal.to_summary_dict() for proposal in proposals]
+
+
+async def measure(name: str, listing, limit: int, runs: int):
+    await listing(limit)  # warm up connections and statement caches
+
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        await listing(limit)
+        timings.append((time.perf_counter() - started) * 1000)
+
+    tracemalloc.start()
+    rows = await listing(limit)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(
+        f"{name:<10} rows={len(rows):<5} median={statistics.median(timings):8.2f} ms  "
+        f"p95={sorted(timings)[int(len(timings) * 0.95) - 1]:8.2f} ms  "
+        f"peak_mem={peak / 1024 / 1024:7.2f} MiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--no-seed", action="store_true")
+    args = parser.parse_args()
+
+    if not args.no_seed:
+        await seed(args.count)
+
+    await measure("full", list_full, args.count, args.runs)
+    await measure("summary", list_summary, args.count, args.runs)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
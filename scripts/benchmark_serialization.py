@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark proposal response serialization: Pydantic vs. direct orjson.
+
+Compares, per response, the default FastAPI path (to_dict -> response model
+-> jsonable_encoder -> json.dumps) with utils.serialization (row -> orjson)
+for the payloads of get_proposal / generate (one full proposal) and
+get_proposals (a page of summaries). Reports median time and peak Python
+memory (tracemalloc) while building one response body.
+
+Usage:
+    python scripts/benchmark_serialization.py --content-kb 20 --page-size 50
+"""
+
+import argparse
+import statistics
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+
+from models.proposals import Proposal  # noqa: E402
+from routes.proposal_routes import (  # noqa: E402
+    PROPOSAL_RESPONSE_FIELDS,
+    PROPOSAL_SUMMARY_FIELDS,
+    ProposalResponse,
+    ProposalSummary,
+)
+from utils.serialization import dump_row, dump_rows  # noqa: E402
+
+
+def make_proposal(n: int, content_kb: int) -> Proposal:
+    paragraph = "Our programme strengthens community health systems. " * 10
+    content = ""
+    while len(content) < content_kb * 1024:
+        content += f"## Section {len(content) // 500}\n\n{paragraph}\n\n"
+    created = datetime(2026, 10, 1) + timedelta(minutes=n)
+    return Proposal(
+        id=uuid.uuid4(),
+        user_id="user-123",
+        ngo_profile_id=uuid.uuid4(),
+        funding_opportunity_id=42,
+        title=f"Community health proposal {n}",
+        content=content,
+        executive_summary=content[:600],
+        status="draft",
+        version=3,
+        confidence_score=0.82,
+        alignment_score=0.76,
+        completeness_score=0.9,
+        user_rating=None,
+        created_at=created,
+        updated_at=created + timedelta(hours=1),
+    )
+
+
+def pydantic_proposal(proposal):
+    return JSONResponse(jsonable_encoder(ProposalResponse(**proposal.to_dict()))).body
+
+
+def orjson_proposal(proposal):
+    return dump_row(proposal, PROPOSAL_RESPONSE_FIELDS)
+
+
+def pydantic_list(proposals):
+    models = [ProposalSummary(**p.to_summary_dict()) for p in proposals]
+    return JSONResponse(jsonable_encoder(models)).body
+
+
+def orjson_list(proposals):
+    return dump_rows(proposals, PROPOSAL_SUMMARY_FIELDS)
+
+
+def measure(func, arg, runs: int):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        body = func(arg)
+        timings.append((time.perf_counter() - started) * 1e6)
+
+    tracemalloc.start()
+    func(arg)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return statistics.median(timings), peak, len(body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--content-kb", type=int, default=20)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    proposal = make_proposal(0, args.content_kb)
+    page = [make_proposal(n, args.content_kb) for n in range(args.page_size)]
+
+    cases = [
+        ("get_proposal", proposal, pydantic_proposal, orjson_proposal),
+        (f"get_proposals x{args.page_size}", page, pydantic_list, orjson_list),
+    ]
+    print(f"{'endpoint':<20} {'path':<9} {'median us':>10} {'peak KiB':>9} {'bytes':>8}")
+    for name, arg, legacy, fast in cases:
+        assert legacy(arg) is not None and fast(arg) is not None
+        for label, func in (("pydantic", legacy), ("orjson", fast)):
+            median_us, peak, size = measure(func, arg, args.runs)
+            print(f"{name:<20} {label:<9} {median_us:>10.1f} {peak / 1024:>9.1f} {size:>8}")
+
+
+if __name__ == "__main__":
+    main()
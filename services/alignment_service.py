@@ -0,0 +1,484 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, delete, insert, and_, or_, not_, tuple_, text
+from sqlalchemy.orm import load_only
+from typing import Optional, List, Dict, Any, Tuple
+from models.alignment_scores import AlignmentScore
+from models.job_state import BackgroundJobState
+from models.ngo_profiles import NGOProfile
+from models.funding_opportunities import FundingOpportunity
+from utils.alignment_matrix import encode_sides, score_matrix, sparse_entries
+from utils.pagination import encode_cursor, decode_cursor
+from utils.embeddings import (
+    SemanticIndex,
+    EMBEDDING_INDEX_DIR,
+    build_vector_index,
+    create_engine,
+    get_semantic_index,
+    opportunity_text,
+    profile_text,
+    stale_ids,
+)
+from datetime import datetime
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Arbitrary constant key so only one worker refreshes the matrix at a time
+ALIGNMENT_REFRESH_LOCK_KEY = 726001
+INSERT_BATCH_SIZE = 5000
+
+
+class AlignmentService:
+    """Service for the precomputed profile x funding opportunity alignment matrix"""
+
+    JOB_NAME = "alignment_matrix"
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+        self.min_score = float(os.getenv("ALIGNMENT_MIN_SCORE", "0.0"))
+        self.semantic_enabled = os.getenv(
+            "SEMANTIC_MATCHING_ENABLED", "true"
+        ).lower() in ("true", "1", "yes")
+
+    async def refresh_matrix(self, full: bool = False) -> Dict[str, Any]:
+        """
+        Recompute alignment scores for profiles and opportunities changed
+        since the last run (or everything when full=True / on first run)
+
+        Returns:
+            Dict with refresh statistics
+        """
+        try:
+            locked = await self.db_session.execute(
+                text("SELECT pg_try_advisory_xact_lock(:key)"),
+                {"key": ALIGNMENT_REFRESH_LOCK_KEY},
+            )
+            if not locked.scalar():
+                logger.info("Alignment matrix refresh already running elsewhere, skipping")
+                await self.db_session.rollback()
+                return {"skipped": True}
+
+            run_started = datetime.utcnow()
+            state = await self.db_session.get(BackgroundJobState, self.JOB_NAME)
+            watermark = None if full or not state else state.watermark
+
+            profiles = await self._load_profiles()
+            opportunities = await self._load_opportunities()
+
+            active_profiles = [p for p in profiles if p["is_active"]]
+            active_opportunities = [o for o in opportunities if o["is_active"]]
+
+            if watermark is None:
+                changed_profile_ids = {p["id"] for p in profiles}
+                changed_opportunity_ids = {o["id"] for o in opportunities}
+                await self.db_session.execute(delete(AlignmentScore))
+            else:
+                changed_profile_ids = {
+                    p["id"] for p in profiles if p["updated_at"] > watermark
+                }
+                changed_opportunity_ids = {
+                    o["id"] for o in opportunities if o["updated_at"] > watermark
+                }
+                if changed_profile_ids or changed_opportunity_ids:
+                    await self.db_session.execute(
+                        delete(AlignmentScore).where(
+                            or_(
+                                AlignmentScore.ngo_profile_id.in_(
+                                    list(changed_profile_ids)
+                                ),
+                                AlignmentScore.funding_opportunity_id.in_(
+                                    list(changed_opportunity_ids)
+                                ),
+                            )
+                        )
+                    )
+
+            # Idle runs leave the scores and the semantic index untouched
+            entries = []
+            if changed_profile_ids or changed_opportunity_ids:
+                profile_vectors, opportunity_vectors = await self._semantic_vectors(
+                    active_profiles,
+                    active_opportunities,
+                    changed_profile_ids,
+                    changed_opportunity_ids,
+                    refit=watermark is None,
+                )
+
+                entries = await asyncio.to_thread(
+                    self._score_changed,
+                    active_profiles,
+                    active_opportunities,
+                    changed_profile_ids,
+                    changed_opportunity_ids,
+                    profile_vectors,
+                    opportunity_vectors,
+                )
+                for start in range(0, len(entries), INSERT_BATCH_SIZE):
+                    await self.db_session.execute(
+                        insert(AlignmentScore), entries[start:start + INSERT_BATCH_SIZE]
+                    )
+
+            stats = {
+                "changed_profiles": len(changed_profile_ids),
+                "changed_opportunities": len(changed_opportunity_ids),
+                "scores_written": len(entries),
+                "full_refresh": watermark is None,
+            }
+
+            if not state:
+                state = BackgroundJobState(job_name=self.JOB_NAME)
+                self.db_session.add(state)
+            state.watermark = run_started
+            state.last_run_at = datetime.utcnow()
+            state.last_run_stats = stats
+
+            await self.db_session.commit()
+            logger.info(f"Refreshed alignment matrix: {stats}")
+            return stats
+
+        except Exception as e:
+            await self.db_session.rollback()
+            logger.error(f"Error refreshing alignment matrix: {str(e)}")
+            raise
+
+    def _score_changed(
+        self,
+        profiles: List[Dict[str, Any]],
+        opportunities: List[Dict[str, Any]],
+        changed_profile_ids: set,
+        changed_opportunity_ids: set,
+        profile_vectors=None,
+        opportunity_vectors=None,
+    ) -> List[Dict[str, Any]]:
+        """Score changed rows against all columns and changed columns against the rest"""
+        if not profiles or not opportunities:
+            return []
+
+        profile_side, opportunity_side = encode_sides(
+            profiles, opportunities, profile_vectors, opportunity_vectors
+        )
+        changed_rows = [
+            i for i, p in enumerate(profiles) if p["id"] in changed_profile_ids
+        ]
+        unchanged_rows = [
+            i for i, p in enumerate(profiles) if p["id"] not in changed_profile_ids
+        ]
+        changed_cols = [
+            j for j, o in enumerate(opportunities) if o["id"] in changed_opportunity_ids
+        ]
+
+        entries = []
+        if changed_rows:
+            rows = profile_side.take(changed_rows)
+            entries.extend(
+                sparse_entries(
+                    score_matrix(rows, opportunity_side),
+                    rows.ids,
+                    opportunity_side.ids,
+                    self.min_score,
+                )
+            )
+        if unchanged_rows and changed_cols:
+            rows = profile_side.take(unchanged_rows)
+            cols = opportunity_side.take(changed_cols)
+            entries.extend(
+                sparse_entries(
+                    score_matrix(rows, cols), rows.ids, cols.ids, self.min_score
+                )
+            )
+        return entries
+
+    async def _semantic_vectors(
+        self,
+        profiles: List[Dict[str, Any]],
+        opportunities: List[Dict[str, Any]],
+        changed_profile_ids: set,
+        changed_opportunity_ids: set,
+        refit: bool,
+    ):
+        """
+        Embed profiles and opportunities, reusing vectors of unchanged rows
+
+        The engine is (re)fitted on full refreshes only, so vectors of
+        unchanged rows stay comparable between incremental runs. When the
+        previous index already holds every row unchanged it is reused as is,
+        without writing a new index version.
+
+        Returns:
+            Tuple of (profile vectors, opportunity vectors) row-aligned with
+            the inputs, or (None, None) when semantic matching is unavailable
+        """
+        if not self.semantic_enabled:
+            return None, None
+
+        try:
+            previous = None if refit else get_semantic_index()
+            profile_ids = [p["id"] for p in profiles]
+            opportunity_ids = [o["id"] for o in opportunities]
+            stale_profiles = stale_ids(
+                previous.profiles if previous else None, profile_ids, changed_profile_ids
+            )
+            stale_opportunities = stale_ids(
+                previous.opportunities if previous else None,
+                opportunity_ids,
+                changed_opportunity_ids,
+            )
+            if (
+                previous is not None
+                and not stale_profiles
+                and not stale_opportunities
+                and previous.profiles.ids == profile_ids
+                and previous.opportunities.ids == opportunity_ids
+            ):
+                return previous.profiles.vectors, previous.opportunities.vectors
+
+            profile_texts = await self._load_profile_texts(stale_profiles)
+            opportunity_texts = await self._load_opportunity_texts(stale_opportunities)
+
+            def build() -> SemanticIndex:
+                if previous is None:
+                    engine = create_engine()
+                    engine.fit(
+                        list(profile_texts.values()) + list(opportunity_texts.values())
+                    )
+                else:
+                    engine = previous.engine
+                index = SemanticIndex(
+                    engine,
+                    build_vector_index(
+                        engine,
+                        previous.opportunities if previous else None,
+                        opportunity_ids,
+                        changed_opportunity_ids,
+                        opportunity_texts,
+                    ),
+                    build_vector_index(
+                        engine,
+                        previous.profiles if previous else None,
+                        profile_ids,
+                        changed_profile_ids,
+                        profile_texts,
+                    ),
+                )
+                index.save(EMBEDDING_INDEX_DIR)
+                return index
+
+            index = await asyncio.to_thread(build)
+            return index.profiles.vectors, index.opportunities.vectors
+
+        except Exception as e:
+            # Structured matching still works without embeddings
+            logger.error(f"Error updating semantic index: {str(e)}")
+            return None, None
+
+    async def _load_profile_texts(self, profile_ids: List) -> Dict[Any, str]:
+        """Load embedding text for the given profiles"""
+        if not profile_ids:
+            return {}
+        result = await self.db_session.execute(
+            select(
+                NGOProfile.id,
+                NGOProfile.mission_statement,
+                NGOProfile.focus_areas,
+                NGOProfile.programs_services,
+            ).where(NGOProfile.id.in_(profile_ids))
+        )
+        return {row.id: profile_text(dict(row._mapping)) for row in result}
+
+    async def _load_opportunity_texts(self, opportunity_ids: List) -> Dict[Any, str]:
+        """Load embedding text for the given opportunities"""
+        if not opportunity_ids:
+            return {}
+        result = await self.db_session.execute(
+            select(
+                FundingOpportunity.id,
+                FundingOpportunity.title,
+                FundingOpportunity.description,
+                FundingOpportunity.focus_areas,
+                FundingOpportunity.keywords,
+            ).where(FundingOpportunity.id.in_(opportunity_ids))
+        )
+        return {row.id: opportunity_text(dict(row._mapping)) for row in result}
+
+    async def _load_profiles(self) -> List[Dict[str, Any]]:
+        """Load only the profile columns the matrix needs"""
+        result = await self.db_session.execute(
+            select(
+                NGOProfile.id,
+                NGOProfile.updated_at,
+                NGOProfile.is_active,
+                NGOProfile.focus_areas,
+                NGOProfile.geographic_scope,
+                NGOProfile.organization_type,
+                NGOProfile.programs_services,
+            )
+        )
+        return [dict(row._mapping) for row in result]
+
+    async def _load_opportunities(self) -> List[Dict[str, Any]]:
+        """Load only the opportunity columns the matrix needs"""
+        result = await self.db_session.execute(
+            select(
+                FundingOpportunity.id,
+                FundingOpportunity.updated_at,
+                and_(
+                    FundingOpportunity.is_active, not_(FundingOpportunity.is_archived)
+                ).label("is_active"),
+                FundingOpportunity.focus_areas,
+                FundingOpportunity.geographic_focus,
+                FundingOpportunity.organization_types,
+                FundingOpportunity.keywords,
+            )
+        )
+        return [dict(row._mapping) for row in result]
+
+    async def get_top_matches(
+        self, profile_id, limit: int = 20, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        Get the best-aligned active opportunities for a profile
+
+        Args:
+            profile_id: NGO profile id
+            limit: Page size
+            cursor: Opaque cursor from a previous page
+
+        Returns:
+            Tuple of (matches, next_cursor); next_cursor is None on the last page
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = (
+            select(AlignmentScore.score, FundingOpportunity)
+            .join(
+                FundingOpportunity,
+                FundingOpportunity.id == AlignmentScore.funding_opportunity_id,
+            )
+            .where(
+                and_(
+                    AlignmentScore.ngo_profile_id == profile_id,
+                    FundingOpportunity.is_active == True,
+                    FundingOpportunity.is_archived == False,
+                )
+            )
+            .options(
+                load_only(
+                    FundingOpportunity.id,
+                    FundingOpportunity.title,
+                    FundingOpportunity.donor_organization,
+                    FundingOpportunity.funding_type,
+                    FundingOpportunity.amount_min,
+                    FundingOpportunity.amount_max,
+                    FundingOpportunity.currency,
+                    FundingOpportunity.application_deadline,
+                    FundingOpportunity.focus_areas,
+                    FundingOpportunity.priority_score,
+                )
+            )
+        )
+
+        if cursor:
+            last_score, last_opportunity_id = decode_cursor(cursor, 2)
+            query = query.where(
+                tuple_(AlignmentScore.score, AlignmentScore.funding_opportunity_id)
+                < tuple_(float(last_score), int(last_opportunity_id))
+            )
+
+        query = query.order_by(
+            AlignmentScore.score.desc(), AlignmentScore.funding_opportunity_id.desc()
+        ).limit(limit + 1)
+
+        try:
+            rows = (await self.db_session.execute(query)).all()
+        except Exception as e:
+            logger.error(f"Error fetching matches for profile {profile_id}: {str(e)}")
+            raise
+
+        matches = [
+            {"opportunity": opportunity.to_summary_dict(), "alignment_score": score}
+            for score, opportunity in rows[:limit]
+        ]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last_score, last_opportunity = rows[limit - 1]
+            next_cursor = encode_cursor(last_score, last_opportunity.id)
+
+        return matches, next_cursor
+
+    async def get_top_matches_for_user(
+        self, user_id: str, limit: int = 20, cursor: Optional[str] = None
+    ) -> Optional[Tuple[List[Dict[str, Any]], Optional[str]]]:
+        """Get top matches for a user's active profile, or None without a profile"""
+        result = await self.db_session.execute(
+            select(NGOProfile.id).where(
+                and_(NGOProfile.user_id == user_id, NGOProfile.is_active == True)
+            )
+        )
+        profile_id = result.scalar_one_or_none()
+        if profile_id is None:
+            return None
+
+        matches, next_cursor = await self.get_top_matches(
+            profile_id, limit=limit, cursor=cursor
+        )
+        if not matches and not cursor:
+            # New or edited profiles have no matrix rows until the next refresh
+            matches = await self.get_semantic_matches(profile_id, limit=limit)
+        return matches, next_cursor
+
+    async def get_semantic_matches(
+        self, profile_id, limit: int = 20
+    ) -> List[Dict[str, Any]]:
+        """
+        Top-k opportunities by embedding similarity, straight from the vector index
+
+        Returns:
+            List of matches (empty if no semantic index has been built yet)
+        """
+        index = get_semantic_index()
+        if index is None:
+            return []
+
+        vector = index.profiles.get(profile_id)
+        if vector is None:
+            texts = await self._load_profile_texts([profile_id])
+            if not texts:
+                return []
+            vector = (await asyncio.to_thread(index.engine.embed, [texts[profile_id]]))[0]
+
+        # Over-fetch since some indexed opportunities may have been deactivated
+        candidates = dict(index.opportunities.search(vector, k=limit * 2))
+        if not candidates:
+            return []
+
+        result = await self.db_session.execute(
+            select(FundingOpportunity).where(
+                and_(
+                    FundingOpportunity.id.in_(list(candidates)),
+                    FundingOpportunity.is_active == True,
+                    FundingOpportunity.is_archived == False,
+                )
+            )
+        )
+        opportunities = sorted(
+            result.scalars().all(), key=lambda o: candidates[o.id], reverse=True
+        )
+        return [
+            {
+                "opportunity": opportunity.to_summary_dict(),
+                "alignment_score": round(max(candidates[opportunity.id], 0.0), 4),
+            }
+            for opportunity in opportunities[:limit]
+        ]
+
+
+async def refresh_alignment_matrix_job():
+    """Background job entry point: refresh the matrix in its own session"""
+    from db import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        await AlignmentService(session).refresh_matrix()
@@ -0,0 +1,190 @@
+from fastapi.concurrency import run_in_threadpool
+from typing import Optional, List, Dict, BinaryIO, Iterator, AsyncIterator, Awaitable, Callable, Tuple
+from services.export_cache import export_cache
+from services.export_executor import export_executor
+from utils.export_utils import ProposalSnapshot
+import asyncio
+import logging
+import os
+import zipfile
+
+logger = logging.getLogger(__name__)
+
+BULK_EXPORT_MAX_PROPOSALS = int(os.getenv("BULK_EXPORT_MAX_PROPOSALS", "50"))
+CHUNK_SIZE = 64 * 1024
+ERRORS_FILENAME = "export_errors.txt"
+
+
+class ZipStream:
+    """
+    ZIP archive written to a buffer that is drained as it grows
+
+    zipfile treats the buffer as an unseekable stream and writes each
+    entry's sizes after its data, so entries can be added one chunk at a
+    time. Entries are stored, not deflated: DOCX and PDF are already
+    compressed.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._names: Dict[str, int] = {}
+        self._zip = zipfile.ZipFile(self, "w", compression=zipfile.ZIP_STORED)
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        """Bytes written since the last drain"""
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+    def unique_name(self, name: str) -> str:
+        """Suffix repeated names ("Title (2).pdf") so no entry is shadowed"""
+        count = self._names.get(name, 0) + 1
+        self._names[name] = count
+        if count == 1:
+            return name
+        stem, ext = os.path.splitext(name)
+        return self.unique_name(f"{stem} ({count}){ext}")
+
+    def iter_entry(self, name: str, file: BinaryIO) -> Iterator[bytes]:
+        """Add a file as an entry, yielding archive bytes as they are produced"""
+        with self._zip.open(self.unique_name(name), "w") as entry:
+            while True:
+                chunk = file.read(CHUNK_SIZE)
+                if not chunk:
+                    break
+                entry.write(chunk)
+                data = self.drain()
+                if data:
+                    yield data
+        data = self.drain()
+        if data:
+            yield data
+
+    def add_text(self, name: str, text: str) -> bytes:
+        self._zip.writestr(self.unique_name(name), text)
+        return self.drain()
+
+    def close(self) -> bytes:
+        """Write the central directory and return the final bytes"""
+        self._zip.close()
+        return self.drain()
+
+
+class BulkExportItem:
+    """
+    One proposal in a bulk export
+
+    Either file (a cached render, already open) or snapshot (to render) is set.
+    """
+
+    __slots__ = ("proposal_id", "filename", "cache_key", "file", "snapshot")
+
+    def __init__(
+        self,
+        proposal_id: str,
+        filename: str,
+        cache_key: str,
+        file: Optional[BinaryIO] = None,
+        snapshot: Optional[ProposalSnapshot] = None,
+    ):
+        self.proposal_id = proposal_id
+        self.filename = filename
+        self.cache_key = cache_key
+        self.file = file
+        self.snapshot = snapshot
+
+
+async def _render(item: BulkExportItem, format: str) -> BinaryIO:
+    temp_path = await run_in_threadpool(export_cache.new_temp_path)
+    try:
+        await export_executor.render(format, item.snapshot, temp_path)
+    except BaseException:
+        export_cache.discard(temp_path)
+        raise
+    return await run_in_threadpool(export_cache.commit, item.cache_key, format, temp_path)
+
+
+async def _next_chunk(chunks: Iterator[bytes]) -> Optional[bytes]:
+    return await run_in_threadpool(next, chunks, None)
+
+
+async def stream_bulk_export(
+    items: List[BulkExportItem],
+    format: str,
+    on_complete: Optional[Callable[[List[str]], Awaitable[None]]] = None,
+) -> AsyncIterator[bytes]:
+    """
+    Stream a ZIP of exported proposals
+
+    Cached exports are written first; the rest are rendered on the export
+    executor, at most one per worker for this archive, and added as each
+    finishes. Failed renders (including a full export queue) are listed in
+    export_errors.txt instead of aborting the download.
+
+    on_complete is awaited with the ids of the proposals written to the
+    archive, just before its last bytes are sent; an aborted download
+    calls nothing.
+    """
+    archive = ZipStream()
+    semaphore = asyncio.Semaphore(export_executor.max_workers)
+
+    async def render(item: BulkExportItem) -> Tuple[BulkExportItem, Optional[BinaryIO]]:
+        async with semaphore:
+            try:
+                return item, await _render(item, format)
+            except Exception as e:
+                logger.error(f"Error rendering proposal {item.proposal_id} for bulk export: {str(e)}")
+                errors.append(f"{item.filename} ({item.proposal_id}): {str(e) or type(e).__name__}")
+                return item, None
+
+    ready = [item for item in items if item.file is not None]
+    tasks = [asyncio.ensure_future(render(item)) for item in items if item.file is None]
+    errors = []
+    exported = []
+    try:
+        for item in ready:
+            chunks = archive.iter_entry(item.filename, item.file)
+            while (chunk := await _next_chunk(chunks)) is not None:
+                yield chunk
+            item.file.close()
+            item.file = None
+            exported.append(item.proposal_id)
+
+        for next_done in asyncio.as_completed(tasks):
+            item, file = await next_done
+            if file is None:
+                continue
+            try:
+                chunks = archive.iter_entry(item.filename, file)
+                while (chunk := await _next_chunk(chunks)) is not None:
+                    yield chunk
+            finally:
+                file.close()
+            exported.append(item.proposal_id)
+
+        if errors:
+            yield archive.add_text(
+                ERRORS_FILENAME,
+                f"{len(errors)} of {len(items)} proposals could not be exported:\n"
+                + "\n".join(errors) + "\n",
+            )
+        if on_complete is not None and exported:
+            await on_complete(exported)
+        yield await run_in_threadpool(archive.close)
+    finally:
+        # Client went away or an error escaped: release everything still open
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+            elif not task.cancelled() and task.result()[1] is not None:
+                task.result()[1].close()
+        for item in ready:
+            if item.file is not None:
+                item.file.close()
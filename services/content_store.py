@@ -0,0 +1,95 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from typing import Optional, Dict, Any
+from collections import OrderedDict
+from models.content_blob import ContentBlob
+from utils.blob_codec import compress, encode_text, encode_json, content_hash
+import logging
+import json
+import os
+
+logger = logging.getLogger(__name__)
+
+# Blobs are immutable, so decompressed bytes can be shared process-wide
+DECODED_CACHE_SIZE = int(os.getenv("CONTENT_STORE_CACHE_SIZE", "256"))
+
+_decoded_cache: "OrderedDict[str, bytes]" = OrderedDict()
+
+
+def _cache_get(blob_hash: str):
+    value = _decoded_cache.get(blob_hash)
+    if value is not None:
+        _decoded_cache.move_to_end(blob_hash)
+    return value
+
+
+def _cache_put(blob_hash: str, raw: bytes):
+    _decoded_cache[blob_hash] = raw
+    _decoded_cache.move_to_end(blob_hash)
+    while len(_decoded_cache) > DECODED_CACHE_SIZE:
+        _decoded_cache.popitem(last=False)
+
+
+def blob_row(raw: bytes) -> Dict[str, Any]:
+    """Build a content_blobs row (hash, codec, compressed data) for raw bytes"""
+    codec, data = compress(raw)
+    return {
+        "hash": content_hash(raw),
+        "codec": codec,
+        "data": data,
+        "raw_size": len(raw),
+    }
+
+
+class ContentStore:
+    """Deduplicating, compressed blob store backed by the content_blobs table"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def put_text(self, value: str) -> str:
+        """Store text and return its hash"""
+        return await self._put(encode_text(value))
+
+    async def put_json(self, value: Any) -> str:
+        """Store a JSON-serializable value and return its hash"""
+        return await self._put(encode_json(value))
+
+    async def _put(self, raw: bytes) -> str:
+        row = blob_row(raw)
+        # Identical content is already stored under the same key
+        await self.db_session.execute(
+            insert(ContentBlob).values(**row).on_conflict_do_nothing(index_elements=["hash"])
+        )
+        return row["hash"]
+
+    async def get_text(self, blob_hash: Optional[str]) -> Optional[str]:
+        """Load text stored with put_text"""
+        raw = await self.get_bytes(blob_hash)
+        return raw.decode("utf-8") if raw is not None else None
+
+    async def get_json(self, blob_hash: Optional[str]) -> Optional[Any]:
+        """Load a value stored with put_json"""
+        raw = await self.get_bytes(blob_hash)
+        return json.loads(raw) if raw is not None else None
+
+    async def get_bytes(self, blob_hash: Optional[str]) -> Optional[bytes]:
+        """Load the decompressed bytes of a blob"""
+        if not blob_hash:
+            return None
+        cached = _cache_get(blob_hash)
+        if cached is not None:
+            return cached
+
+        result = await self.db_session.execute(
+            select(ContentBlob).where(ContentBlob.hash == blob_hash)
+        )
+        blob = result.scalar_one_or_none()
+        if blob is None:
+            logger.error(f"Content blob {blob_hash} not found")
+            return None
+
+        raw = blob.raw_bytes()
+        _cache_put(blob_hash, raw)
+        return raw
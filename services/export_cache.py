@@ -0,0 +1,185 @@
+from typing import Optional, Dict, Any, BinaryIO, List, Tuple
+from utils.export_utils import EXPORT_RENDERER_VERSION, EXPORT_METADATA_FIELDS
+import hashlib
+import logging
+import os
+import tempfile
+
+logger = logging.getLogger(__name__)
+
+
+def export_cache_key(proposal, format: str) -> str:
+    """
+    Cache key for a rendered export
+
+    Edits always bump Proposal.version; the other fields the renderer
+    prints (scores, rating) can change without a version bump, so the
+    printed fields' values are part of the key too.
+    """
+    parts = [str(proposal.id), str(proposal.version), format, EXPORT_RENDERER_VERSION]
+    parts.extend(repr(getattr(proposal, field)) for field in EXPORT_METADATA_FIELDS)
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+class ExportCache:
+    """
+    Size-bounded LRU cache of rendered exports on local disk
+
+    Files are written atomically (temp file + rename), so concurrent workers
+    sharing the directory never see partial output. Recency is the file
+    mtime, refreshed on every hit.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_bytes: Optional[int] = None):
+        self.directory = directory or os.getenv("EXPORT_CACHE_DIR", "data/export_cache")
+        self.max_bytes = max_bytes or int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+        self.enabled = os.getenv("EXPORT_CACHE_ENABLED", "true").lower() == "true"
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Running estimate of the directory size; rescanned when over the limit
+        self._approx_bytes: Optional[int] = None
+
+    def _path(self, key: str, format: str) -> str:
+        return os.path.join(self.directory, f"{key}.{format}")
+
+    def open(self, key: str, format: str) -> Optional[BinaryIO]:
+        """Open a cached export for reading, or None on a miss"""
+        if not self.enabled:
+            return None
+        path = self._path(key, format)
+        try:
+            file = open(path, "rb")
+        except OSError:
+            self.misses += 1
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass  # Evicted meanwhile; the open handle stays readable
+        self.hits += 1
+        return file
+
+    def new_temp_path(self) -> str:
+        """
+        Create an empty temp file for a renderer to write into
+
+        It lives in the cache directory so commit() is an atomic rename;
+        with the cache disabled (or its directory unusable) it is a plain
+        temp file.
+        """
+        if self.enabled:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                fd, path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+                os.close(fd)
+                return path
+            except OSError as e:
+                logger.error(f"Export cache directory unusable: {str(e)}")
+        fd, path = tempfile.mkstemp(suffix=".tmp")
+        os.close(fd)
+        return path
+
+    def commit(self, key: str, format: str, temp_path: str) -> BinaryIO:
+        """
+        Move a rendered temp file into the cache and open it for reading
+
+        If it cannot be cached, the temp file is opened and unlinked, so it
+        is removed once the response closes it.
+        """
+        in_cache_dir = os.path.dirname(os.path.abspath(temp_path)) == os.path.abspath(self.directory)
+        if self.enabled and in_cache_dir:
+            path = self._path(key, format)
+            try:
+                os.replace(temp_path, path)
+                file = open(path, "rb")
+            except OSError as e:
+                logger.error(f"Error writing export cache entry {key}.{format}: {str(e)}")
+            else:
+                self._account(os.fstat(file.fileno()).st_size)
+                return file
+
+        file = open(temp_path, "rb")
+        os.unlink(temp_path)
+        return file
+
+    def discard(self, temp_path: str):
+        """Remove a temp file whose render failed"""
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+
+    def store(self, key: str, format: str, data: bytes) -> BinaryIO:
+        """Store rendered bytes and return them opened for reading"""
+        temp_path = self.new_temp_path()
+        try:
+            with open(temp_path, "wb") as tmp:
+                tmp.write(data)
+        except BaseException:
+            self.discard(temp_path)
+            raise
+        return self.commit(key, format, temp_path)
+
+    def _account(self, size: int):
+        if self._approx_bytes is None:
+            self._approx_bytes = self._scan_size()
+        else:
+            self._approx_bytes += size
+        if self._approx_bytes > self.max_bytes:
+            self.evict()
+
+    def _entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return entries
+        for name in names:
+            if name.endswith(".tmp"):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def evict(self) -> int:
+        """Remove least recently used files until under max_bytes; returns files removed"""
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+                removed += 1
+            except FileNotFoundError:
+                pass  # Another worker evicted it
+            total -= size
+        self._approx_bytes = total
+        self.evictions += removed
+        if removed:
+            logger.info(f"Evicted {removed} export cache entries")
+        return removed
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        return {
+            "enabled": self.enabled,
+            "directory": self.directory,
+            "approx_bytes": self._approx_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+export_cache = ExportCache()
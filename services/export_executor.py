@@ -0,0 +1,150 @@
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any
+from utils.export_utils import ProposalSnapshot, render_export
+import asyncio
+import logging
+import multiprocessing
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class ExportQueueFull(Exception):
+    """Too many exports are already rendering or waiting for a worker"""
+
+
+class ExportTimeout(Exception):
+    """An export did not finish rendering in time"""
+
+
+def _warm_up() -> int:
+    return os.getpid()
+
+
+def _remove(path: str):
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
+
+
+class ExportExecutor:
+    """
+    Process pool for CPU-bound DOCX/PDF rendering
+
+    Keeps rendering off the event loop. Admission is bounded: once
+    max_pending renders are queued or running, new requests are rejected
+    immediately instead of piling up behind the pool. A slot is only freed
+    when its render actually finishes, so a timed-out render that is still
+    running keeps counting against the limit.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.max_workers = max_workers or int(
+            os.getenv("EXPORT_WORKERS", str(min(2, os.cpu_count() or 1)))
+        )
+        self.max_pending = max_pending or int(
+            os.getenv("EXPORT_MAX_PENDING", str(self.max_workers * 4))
+        )
+        self.timeout = timeout or float(os.getenv("EXPORT_RENDER_TIMEOUT_SECONDS", "30"))
+        # Recycle workers to bound memory growth from large documents
+        self.max_tasks_per_child = int(os.getenv("EXPORT_WORKER_MAX_TASKS", "200"))
+        self.pending = 0
+        self.rejected = 0
+        self.timeouts = 0
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            # spawn: forking a process that holds asyncpg connections and
+            # threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                max_tasks_per_child=self.max_tasks_per_child or None,
+            )
+        return self._pool
+
+    async def start(self):
+        """Start the workers ahead of the first export"""
+        loop = asyncio.get_running_loop()
+        pool = self._get_pool()
+        await asyncio.gather(
+            *(loop.run_in_executor(pool, _warm_up) for _ in range(self.max_workers))
+        )
+        logger.info(f"Export executor started with {self.max_workers} workers")
+
+    def shutdown(self):
+        """Stop the workers, dropping queued renders"""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def _release(self):
+        self.pending -= 1
+
+    def _release_from_worker_thread(self, loop: asyncio.AbstractEventLoop):
+        try:
+            loop.call_soon_threadsafe(self._release)
+        except RuntimeError:
+            pass  # Loop already closed during shutdown
+
+    async def render(self, format: str, snapshot: ProposalSnapshot, path: str) -> str:
+        """
+        Render an export to a file in a worker process
+
+        Only the path crosses the process boundary; the document itself is
+        written straight to disk by the worker. On timeout or cancellation
+        the file is removed once the worker finishes with it.
+
+        Returns:
+            Download filename for the export
+
+        Raises:
+            ExportQueueFull: If max_pending renders are already in flight
+            ExportTimeout: If rendering takes longer than the timeout
+        """
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ExportQueueFull(f"{self.pending} exports already pending")
+
+        loop = asyncio.get_running_loop()
+        try:
+            future = self._get_pool().submit(render_export, format, snapshot, path)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool once
+            logger.error("Export process pool broken, restarting")
+            self._pool = None
+            future = self._get_pool().submit(render_export, format, snapshot, path)
+
+        self.pending += 1
+        future.add_done_callback(lambda f: self._release_from_worker_thread(loop))
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            # The worker may still be writing; remove the file once it stops
+            future.add_done_callback(lambda f: _remove(path))
+            raise ExportTimeout(f"Rendering {format} took longer than {self.timeout}s")
+        except asyncio.CancelledError:
+            future.add_done_callback(lambda f: _remove(path))
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and admission statistics"""
+        return {
+            "workers": self.max_workers,
+            "max_pending": self.max_pending,
+            "pending": self.pending,
+            "rejected": self.rejected,
+            "timeouts": self.timeouts,
+        }
+
+
+export_executor = ExportExecutor()
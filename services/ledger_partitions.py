@@ -0,0 +1,163 @@
+"""
+Monthly partitions of usage_ledger.
+
+usage_ledger is range-partitioned on created_at, one partition per UTC
+month named usage_ledger_yYYYYmMM. A maintenance job keeps partitions
+created USAGE_LEDGER_PARTITIONS_AHEAD months ahead and retires partitions
+older than USAGE_LEDGER_RETENTION_MONTHS: each is copied to a gzipped CSV
+in USAGE_LEDGER_ARCHIVE_DIR, then detached and dropped. Monthly totals
+stay in usage_monthly_rollup, so summaries are unaffected.
+
+The SQL builders here are shared with the Alembic migration that
+partitions the table.
+"""
+
+import gzip
+import logging
+import os
+import re
+from datetime import date, datetime
+from typing import List, Optional
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+USAGE_LEDGER_PARTITIONS_AHEAD = int(os.getenv("USAGE_LEDGER_PARTITIONS_AHEAD", "3"))
+# 0 keeps every partition
+USAGE_LEDGER_RETENTION_MONTHS = int(os.getenv("USAGE_LEDGER_RETENTION_MONTHS", "24"))
+USAGE_LEDGER_ARCHIVE_DIR = os.getenv("USAGE_LEDGER_ARCHIVE_DIR", "data/usage_archive")
+
+PARENT_TABLE = "usage_ledger"
+_PARTITION_NAME = re.compile(r"^usage_ledger_y(\d{4})m(\d{2})$")
+
+LIST_PARTITIONS_SQL = (
+    "SELECT child.relname FROM pg_inherits "
+    "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+    "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+    f"WHERE parent.relname = '{PARENT_TABLE}'"
+)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_start(moment: datetime) -> date:
+    return moment.date().replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{PARENT_TABLE}_y{month.year:04d}m{month.month:02d}"
+
+
+def partition_month(name: str) -> Optional[date]:
+    """Month of a partition name, or None for other tables"""
+    match = _PARTITION_NAME.match(name)
+    return date(int(match.group(1)), int(match.group(2)), 1) if match else None
+
+
+def create_partition_sql(month: date) -> str:
+    """CREATE TABLE statement for the partition holding month"""
+    return (
+        f"CREATE TABLE IF NOT EXISTS {partition_name(month)} "
+        f"PARTITION OF {PARENT_TABLE} "
+        f"FOR VALUES FROM ('{month.isoformat()}') TO ('{add_months(month, 1).isoformat()}')"
+    )
+
+
+def months_between(first: date, last: date) -> List[date]:
+    """first, the months after it, up to and including last"""
+    months = []
+    while first <= last:
+        months.append(first)
+        first = add_months(first, 1)
+    return months
+
+
+async def ensure_ledger_partitions(months_ahead: Optional[int] = None) -> List[str]:
+    """
+    Create any missing partitions from this month to months_ahead ahead
+
+    Returns:
+        Names of the partitions that did not exist before
+    """
+    from db import engine
+
+    ahead = USAGE_LEDGER_PARTITIONS_AHEAD if months_ahead is None else months_ahead
+    current = month_start(datetime.utcnow())
+    async with engine.begin() as conn:
+        existing = set((await conn.execute(text(LIST_PARTITIONS_SQL))).scalars().all())
+        created = []
+        for month in months_between(current, add_months(current, ahead)):
+            if partition_name(month) not in existing:
+                await conn.execute(text(create_partition_sql(month)))
+                created.append(partition_name(month))
+    if created:
+        logger.info(f"Created usage_ledger partitions: {', '.join(created)}")
+    return created
+
+
+async def _archive_partition(conn, name: str, directory: str) -> str:
+    """Copy a partition to <directory>/<name>.csv.gz and return the path"""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{name}.csv.gz")
+    temp_path = f"{path}.tmp"
+    archive = await run_in_threadpool(gzip.open, temp_path, "wb")
+    try:
+        async def write(chunk: bytes):
+            await run_in_threadpool(archive.write, chunk)
+
+        raw = await conn.get_raw_connection()
+        await raw.driver_connection.copy_from_table(
+            name, output=write, format="csv", header=True
+        )
+    finally:
+        await run_in_threadpool(archive.close)
+    os.replace(temp_path, path)
+    return path
+
+
+async def retire_ledger_partitions(
+    retention_months: Optional[int] = None, archive_dir: Optional[str] = None
+) -> List[str]:
+    """
+    Archive, detach and drop partitions older than the retention period
+
+    A partition is only dropped after its archive has been written.
+
+    Returns:
+        Paths of the archives written
+    """
+    from db import engine
+
+    retention = USAGE_LEDGER_RETENTION_MONTHS if retention_months is None else retention_months
+    if retention <= 0:
+        return []
+    directory = archive_dir or USAGE_LEDGER_ARCHIVE_DIR
+    cutoff = add_months(month_start(datetime.utcnow()), -retention)
+
+    async with engine.connect() as conn:
+        names = (await conn.execute(text(LIST_PARTITIONS_SQL))).scalars().all()
+    expired = sorted(
+        name for name in names
+        if partition_month(name) is not None and partition_month(name) < cutoff
+    )
+
+    archives = []
+    for name in expired:
+        async with engine.begin() as conn:
+            path = await _archive_partition(conn, name, directory)
+            await conn.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+            await conn.execute(text(f"DROP TABLE {name}"))
+        logger.info(f"Archived usage_ledger partition {name} to {path}")
+        archives.append(path)
+    return archives
+
+
+async def maintain_usage_ledger_job():
+    """Background job entry point: create upcoming partitions, retire old ones"""
+    await ensure_ledger_partitions()
+    await retire_ledger_partitions()
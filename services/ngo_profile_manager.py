@@ -1,7 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.exc import IntegrityError
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
+from datetime import datetime
 from models.ngo_profiles import NGOProfile
 import logging
 
@@ -62,6 +63,32 @@ class NGOProfileManager:
             logger.error(f"Error retrieving profile for user {user_id}: {str(e)}")
             return None
     
+    async def get_profile_version(self, user_id: int) -> Optional[Tuple[Any, datetime]]:
+        """
+        Returns (id, updated_at) of the active profile without loading it.
+        
+        Used to answer conditional GETs cheaply.
+        
+        Args:
+            user_id: The user ID to look up
+            
+        Returns:
+            Tuple of (id, updated_at) or None if no profile exists
+        """
+        try:
+            result = await self.db_session.execute(
+                select(NGOProfile.id, NGOProfile.updated_at).where(
+                    NGOProfile.user_id == str(user_id),
+                    NGOProfile.is_active == True
+                )
+            )
+            row = result.first()
+            return tuple(row) if row else None
+            
+        except Exception as e:
+            logger.error(f"Error retrieving profile version for user {user_id}: {str(e)}")
+            raise
+    
     async def create_or_update_profile(self, user_id: int, data: Dict[str, Any]) -> bool:
         """
         Upserts a profile based on user ID.
@@ -0,0 +1,177 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from typing import Optional, Dict, Any
+from collections import OrderedDict
+from models.funding_opportunities import FundingOpportunity
+from prompts.prompt_builder import PromptBuilder
+from datetime import datetime, timedelta
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+
+class CachedOpportunity:
+    """One version of a funding opportunity with its precomputed serializations"""
+
+    __slots__ = ("opportunity", "updated_at", "snapshot", "prompt_fragment", "donor_template")
+
+    def __init__(self, opportunity: FundingOpportunity, prompt_builder: PromptBuilder):
+        self.opportunity = opportunity
+        self.updated_at = opportunity.updated_at
+        # Computed once per version instead of once per generate call
+        self.snapshot = opportunity.to_dict()
+        self.prompt_fragment = prompt_builder.format_funding_opportunity(opportunity)
+        self.donor_template = prompt_builder.get_donor_template(
+            opportunity.donor_organization
+        )
+
+
+class OpportunityCache:
+    """
+    Bounded in-process read-through cache of active funding opportunities
+
+    FundingOpportunity is a read-only mirror of ReqAgent data, so entries are
+    only invalidated by a periodic delta poll on updated_at.
+    """
+
+    def __init__(self, max_size: Optional[int] = None, poll_overlap_seconds: Optional[float] = None):
+        self.max_size = max_size or int(os.getenv("OPPORTUNITY_CACHE_SIZE", "1000"))
+        # Re-read a small window behind the watermark to tolerate late commits
+        self.poll_overlap = timedelta(
+            seconds=poll_overlap_seconds
+            if poll_overlap_seconds is not None
+            else float(os.getenv("OPPORTUNITY_CACHE_POLL_OVERLAP_SECONDS", "5"))
+        )
+        # Stays None after the first poll while the table is empty
+        self.watermark: Optional[datetime] = None
+        self._polled = False
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[int, CachedOpportunity]" = OrderedDict()
+        self._prompt_builder = PromptBuilder()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(
+        self, db_session: AsyncSession, funding_opportunity_id: int
+    ) -> Optional[CachedOpportunity]:
+        """Get an active opportunity, loading it on a miss"""
+        entry = self._entries.get(funding_opportunity_id)
+        if entry is not None:
+            self._entries.move_to_end(funding_opportunity_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        result = await db_session.execute(
+            select(FundingOpportunity).where(
+                and_(
+                    FundingOpportunity.id == funding_opportunity_id,
+                    FundingOpportunity.is_active == True,
+                )
+            )
+        )
+        opportunity = result.scalar_one_or_none()
+        if opportunity is None:
+            return None
+
+        # Detach so the object can be shared across sessions read-only
+        db_session.expunge(opportunity)
+        return self._store(opportunity)
+
+    def _store(self, opportunity: FundingOpportunity) -> CachedOpportunity:
+        entry = CachedOpportunity(opportunity, self._prompt_builder)
+        self._entries[opportunity.id] = entry
+        self._entries.move_to_end(opportunity.id)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, funding_opportunity_id: Optional[int] = None):
+        """Drop one entry, or everything when no id is given"""
+        if funding_opportunity_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(funding_opportunity_id, None)
+
+    async def refresh(self, db_session: AsyncSession) -> Dict[str, Any]:
+        """
+        Delta poll: reload cached opportunities changed since the watermark
+
+        Returns:
+            Dict with poll statistics
+        """
+        if not self._polled:
+            # First poll only establishes the watermark
+            result = await db_session.execute(select(func.max(FundingOpportunity.updated_at)))
+            self.watermark = result.scalar()
+            self._polled = True
+            return {"changed": 0, "reloaded": 0, "evicted": 0}
+
+        query = select(
+            FundingOpportunity.id,
+            FundingOpportunity.updated_at,
+            FundingOpportunity.is_active,
+            FundingOpportunity.is_archived,
+        )
+        if self.watermark is not None:
+            query = query.where(FundingOpportunity.updated_at > self.watermark - self.poll_overlap)
+        # Without a watermark the table was empty, so every row is a change
+        result = await db_session.execute(query)
+        changed = result.all()
+        if not changed:
+            return {"changed": 0, "reloaded": 0, "evicted": 0}
+
+        newest = max(row.updated_at for row in changed)
+        self.watermark = newest if self.watermark is None else max(self.watermark, newest)
+
+        stale = []
+        evicted = 0
+        for row in changed:
+            entry = self._entries.get(row.id)
+            if entry is None:
+                continue
+            if not row.is_active or row.is_archived:
+                self.invalidate(row.id)
+                evicted += 1
+            elif entry.updated_at != row.updated_at:
+                stale.append(row.id)
+
+        if stale:
+            reloaded = await db_session.execute(
+                select(FundingOpportunity).where(FundingOpportunity.id.in_(stale))
+            )
+            for opportunity in reloaded.scalars().all():
+                db_session.expunge(opportunity)
+                if opportunity.id in self._entries:
+                    # Replace in place without promoting it in the LRU order
+                    self._entries[opportunity.id] = CachedOpportunity(
+                        opportunity, self._prompt_builder
+                    )
+
+        stats = {"changed": len(changed), "reloaded": len(stale), "evicted": evicted}
+        logger.info(f"Funding opportunity cache poll: {stats}")
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache size and hit statistics"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "watermark": self.watermark.isoformat() if self.watermark else None,
+        }
+
+
+opportunity_cache = OpportunityCache()
+
+
+async def poll_opportunity_cache_job():
+    """Background job entry point: delta-poll the cache in its own session"""
+    from db import AsyncSessionLocal
+
+    async with AsyncSessionLocal() as session:
+        await opportunity_cache.refresh(session)
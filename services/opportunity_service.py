@@ -0,0 +1,183 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, and_, or_, func, cast, literal, text, Float
+from sqlalchemy.dialects.postgresql import JSONB, array
+from sqlalchemy.orm import load_only
+from sqlalchemy.sql import Select
+from typing import Optional, List, Dict, Any, Tuple
+from datetime import datetime
+from models.funding_opportunities import FundingOpportunity
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+# Text search configuration used by the generated search_vector column
+SEARCH_CONFIG = "english"
+
+# Trigram title matching is used when pg_trgm is installed; this can only
+# switch it off
+TRIGRAM_SEARCH_ENABLED = os.getenv("OPPORTUNITY_SEARCH_TRIGRAM", "true").lower() == "true"
+
+# Whether pg_trgm is installed; checked on the first search
+_trigram_available: Optional[bool] = None
+
+SUMMARY_COLUMNS = (
+    FundingOpportunity.id,
+    FundingOpportunity.title,
+    FundingOpportunity.donor_organization,
+    FundingOpportunity.funding_type,
+    FundingOpportunity.amount_min,
+    FundingOpportunity.amount_max,
+    FundingOpportunity.currency,
+    FundingOpportunity.application_deadline,
+    FundingOpportunity.focus_areas,
+    FundingOpportunity.priority_score,
+)
+
+
+def build_search_query(
+    q: Optional[str] = None,
+    deadline_from: Optional[datetime] = None,
+    deadline_to: Optional[datetime] = None,
+    amount_min: Optional[float] = None,
+    amount_max: Optional[float] = None,
+    currency: Optional[str] = None,
+    focus_areas: Optional[List[str]] = None,
+    geography: Optional[List[str]] = None,
+    trigram: bool = False,
+) -> Select:
+    """
+    Build the ranked opportunity search query
+
+    Every predicate is written so that it can be served by one of the
+    funding_opportunities indexes (search_vector GIN, title trigram GIN,
+    JSONB GIN on focus_areas/geographic_focus, partial deadline btree).
+    trigram adds pg_trgm title matching, so only pass it when the
+    extension is installed (see trigram_search_available).
+
+    Returns:
+        Select yielding (FundingOpportunity, rank) rows, best match first
+    """
+    conditions = [
+        FundingOpportunity.is_active == True,
+        FundingOpportunity.is_archived == False,
+    ]
+
+    if q:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+        text_match = FundingOpportunity.search_vector.op("@@")(ts_query)
+        rank = func.ts_rank_cd(FundingOpportunity.search_vector, ts_query)
+        if trigram:
+            # Catches misspelled and partial titles the stemmed text search misses
+            text_match = or_(text_match, FundingOpportunity.title.op("%")(q))
+            rank = rank + func.similarity(FundingOpportunity.title, q)
+        conditions.append(text_match)
+    else:
+        rank = literal(0.0, Float)
+
+    if deadline_from is not None:
+        conditions.append(FundingOpportunity.application_deadline >= deadline_from)
+    if deadline_to is not None:
+        conditions.append(FundingOpportunity.application_deadline <= deadline_to)
+
+    # Amount filters match opportunities whose funding range overlaps the requested one
+    if amount_min is not None:
+        conditions.append(
+            or_(
+                FundingOpportunity.amount_max == None,
+                FundingOpportunity.amount_max >= amount_min,
+            )
+        )
+    if amount_max is not None:
+        conditions.append(
+            or_(
+                FundingOpportunity.amount_min == None,
+                FundingOpportunity.amount_min <= amount_max,
+            )
+        )
+
+    if currency:
+        conditions.append(FundingOpportunity.currency == currency.upper())
+
+    # ?| (has any) is served by the JSONB GIN expression indexes
+    if focus_areas:
+        conditions.append(
+            cast(FundingOpportunity.focus_areas, JSONB).has_any(array(focus_areas))
+        )
+    if geography:
+        conditions.append(
+            cast(FundingOpportunity.geographic_focus, JSONB).has_any(array(geography))
+        )
+
+    rank = rank.label("rank")
+    query = (
+        select(FundingOpportunity, rank)
+        .where(and_(*conditions))
+        .options(load_only(*SUMMARY_COLUMNS))
+    )
+    if q:
+        return query.order_by(rank.desc(), FundingOpportunity.id.desc())
+    return query.order_by(
+        FundingOpportunity.application_deadline.asc().nulls_last(),
+        FundingOpportunity.id.desc(),
+    )
+
+
+async def trigram_search_available(db_session: AsyncSession) -> bool:
+    """Whether title search can use pg_trgm (checked once per process)"""
+    global _trigram_available
+
+    if not TRIGRAM_SEARCH_ENABLED:
+        return False
+    if _trigram_available is None:
+        try:
+            result = await db_session.execute(
+                text("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+            )
+        except Exception as e:
+            # Not cached, so the next search checks again
+            logger.error(f"Error checking for the pg_trgm extension: {str(e)}")
+            return False
+        _trigram_available = result.scalar() is not None
+        if not _trigram_available:
+            logger.warning("pg_trgm extension not installed; title search uses full-text matching only")
+    return _trigram_available
+
+
+class OpportunityService:
+    """Service for browsing and searching funding opportunities"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def search(
+        self, limit: int = 20, offset: int = 0, **filters: Any
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Search active funding opportunities
+
+        Args:
+            limit: Page size
+            offset: Number of results to skip
+            filters: Keyword arguments accepted by build_search_query
+
+        Returns:
+            Tuple of (results, has_more)
+        """
+        if "trigram" not in filters:
+            filters["trigram"] = await trigram_search_available(self.db_session)
+        query = build_search_query(**filters).limit(limit + 1).offset(offset)
+
+        try:
+            rows = (await self.db_session.execute(query)).all()
+        except Exception as e:
+            logger.error(f"Error searching funding opportunities: {str(e)}")
+            raise
+
+        has_more = len(rows) > limit
+        results = []
+        for opportunity, rank in rows[:limit]:
+            item = opportunity.to_summary_dict()
+            item["rank"] = round(float(rank), 4)
+            results.append(item)
+        return results, has_more
@@ -0,0 +1,171 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from sqlalchemy.orm import undefer
+from typing import Optional, List, Dict, Any, Tuple
+from models.proposals import Proposal
+from models.proposal_revision import ProposalRevision
+from utils.text_diff import make_delta, apply_delta, delta_size
+from utils.pagination import encode_cursor, decode_cursor
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+KIND_SNAPSHOT = "snapshot"
+KIND_DELTA = "delta"
+
+# A full snapshot is stored at least every this many versions
+SNAPSHOT_INTERVAL = max(1, int(os.getenv("PROPOSAL_SNAPSHOT_INTERVAL", "10")))
+
+
+class ProposalRevisionService:
+    """Service for recording and reconstructing proposal content versions"""
+
+    def __init__(self, db_session: AsyncSession):
+        self.db_session = db_session
+
+    async def record_revision(
+        self,
+        proposal: Proposal,
+        old_content: str,
+        new_content: str,
+        new_version: int,
+        user_id: str,
+        changes: Optional[Dict[str, Any]] = None,
+    ) -> ProposalRevision:
+        """
+        Record a new version (added to the session, not committed)
+
+        The first edit of a proposal also stores the pre-edit content as the
+        base snapshot, so history starts at the version that was edited.
+        """
+        last_snapshot = await self._last_snapshot_version(proposal.id, new_version)
+        if last_snapshot is None:
+            self.db_session.add(
+                ProposalRevision(
+                    proposal_id=proposal.id,
+                    version=proposal.version,
+                    kind=KIND_SNAPSHOT,
+                    snapshot=old_content,
+                    size=len(old_content),
+                    user_id=proposal.user_id,
+                )
+            )
+            last_snapshot = proposal.version
+
+        if new_version - last_snapshot >= SNAPSHOT_INTERVAL:
+            revision = ProposalRevision(
+                proposal_id=proposal.id,
+                version=new_version,
+                kind=KIND_SNAPSHOT,
+                snapshot=new_content,
+                size=len(new_content),
+                changes=changes or None,
+                user_id=user_id,
+            )
+        else:
+            delta = make_delta(old_content, new_content)
+            revision = ProposalRevision(
+                proposal_id=proposal.id,
+                version=new_version,
+                kind=KIND_DELTA,
+                delta=delta,
+                size=delta_size(delta),
+                changes=changes or None,
+                user_id=user_id,
+            )
+
+        self.db_session.add(revision)
+        return revision
+
+    async def _last_snapshot_version(self, proposal_id, at_or_before: int) -> Optional[int]:
+        result = await self.db_session.execute(
+            select(func.max(ProposalRevision.version)).where(
+                and_(
+                    ProposalRevision.proposal_id == proposal_id,
+                    ProposalRevision.kind == KIND_SNAPSHOT,
+                    ProposalRevision.version <= at_or_before,
+                )
+            )
+        )
+        return result.scalar()
+
+    async def list_revisions(
+        self, proposal_id, limit: int = 50, cursor: Optional[str] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        """
+        List revision metadata, newest first (content is not loaded)
+
+        Returns:
+            Tuple of (revisions, next_cursor)
+
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        query = select(ProposalRevision).where(ProposalRevision.proposal_id == proposal_id)
+        if cursor:
+            (last_version,) = decode_cursor(cursor, 1)
+            query = query.where(ProposalRevision.version < int(last_version))
+        query = query.order_by(ProposalRevision.version.desc()).limit(limit + 1)
+
+        try:
+            revisions = list((await self.db_session.execute(query)).scalars().all())
+        except Exception as e:
+            logger.error(f"Error listing revisions for proposal {proposal_id}: {str(e)}")
+            raise
+
+        next_cursor = None
+        if len(revisions) > limit:
+            revisions = revisions[:limit]
+            next_cursor = encode_cursor(revisions[-1].version)
+        return [revision.to_dict() for revision in revisions], next_cursor
+
+    async def get_version_content(self, proposal: Proposal, version: int) -> Optional[str]:
+        """
+        Reconstruct the content of a proposal at a given version
+
+        Reads the nearest snapshot at or before the version plus the deltas
+        after it (at most PROPOSAL_SNAPSHOT_INTERVAL rows).
+
+        Returns:
+            The content, or None if the version is unknown
+        """
+        if version == proposal.version:
+            return proposal.content
+        if version < 1 or version > proposal.version:
+            return None
+
+        base_version = await self._last_snapshot_version(proposal.id, version)
+        if base_version is None:
+            # Version predates recorded history
+            return None
+
+        result = await self.db_session.execute(
+            select(ProposalRevision)
+            .options(undefer(ProposalRevision.snapshot), undefer(ProposalRevision.delta))
+            .where(
+                and_(
+                    ProposalRevision.proposal_id == proposal.id,
+                    ProposalRevision.version >= base_version,
+                    ProposalRevision.version <= version,
+                )
+            )
+            .order_by(ProposalRevision.version)
+        )
+        revisions = result.scalars().all()
+
+        content = None
+        expected_version = base_version
+        for revision in revisions:
+            if revision.version != expected_version:
+                logger.error(
+                    f"Revision history of proposal {proposal.id} has a gap at version {expected_version}"
+                )
+                return None
+            if revision.kind == KIND_SNAPSHOT:
+                content = revision.snapshot
+            else:
+                content = apply_delta(content, revision.delta)
+            expected_version += 1
+
+        return content if expected_version == version + 1 else None
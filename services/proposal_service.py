@@ -1,17 +1,52 @@
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_
-from typing import Optional, List, Dict, Any
+from sqlalchemy import select, update, delete, and_, tuple_, inspect, case, cast, func, JSON
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import load_only, undefer_group
+from typing import Optional, List, Dict, Any, Tuple, Sequence
+from datetime import datetime
 from models.proposals import Proposal
 from models.ngo_profiles import NGOProfile
 from models.funding_opportunities import FundingOpportunity
 from utils.openai_client import OpenAIClient
 from utils.scoring import calculate_proposal_scores
 from prompts.prompt_builder import PromptBuilder
+from services.opportunity_cache import opportunity_cache
+from services.content_store import ContentStore
+from services.proposal_revision_service import ProposalRevisionService
+from utils.pagination import encode_cursor, decode_cursor
 import logging
 import json
+import uuid
 
 logger = logging.getLogger(__name__)
 
+# Columns needed by Proposal.to_summary_dict() and keyset pagination
+SUMMARY_COLUMNS = (
+    Proposal.id,
+    Proposal.title,
+    Proposal.status,
+    Proposal.confidence_score,
+    Proposal.user_rating,
+    Proposal.created_at,
+    Proposal.updated_at,
+)
+
+# Columns always loaded with a sparse fieldset (identity, keyset cursor, ETag)
+PROJECTION_KEY_COLUMNS = (
+    Proposal.id,
+    Proposal.version,
+    Proposal.created_at,
+    Proposal.updated_at,
+)
+
+
+def projection_columns(fields: Sequence[str]) -> List[Any]:
+    """Map response field names to the Proposal columns that must be loaded"""
+    names = [column.key for column in PROJECTION_KEY_COLUMNS]
+    names.extend(field for field in fields if field not in names)
+    return [getattr(Proposal, name) for name in names]
+
 
 class ProposalService:
     """Service for generating and managing proposals"""
@@ -34,33 +69,41 @@ class ProposalService:
             if not profile:
                 raise ValueError(f"No profile found for user {user_id}")
             
-            # Get funding opportunity
-            funding_opportunity = await self._get_funding_opportunity(funding_opportunity_id)
-            if not funding_opportunity:
+            # Get funding opportunity (cached with its precomputed serializations)
+            cached_opportunity = await opportunity_cache.get(self.db_session, funding_opportunity_id)
+            if not cached_opportunity:
                 raise ValueError(f"No funding opportunity found with ID {funding_opportunity_id}")
+            funding_opportunity = cached_opportunity.opportunity
             
             # Build prompt
             prompt = self.prompt_builder.build_proposal_prompt(
                 profile=profile,
                 funding_opportunity=funding_opportunity,
-                custom_instructions=custom_instructions
+                custom_instructions=custom_instructions,
+                funding_opportunity_text=cached_opportunity.prompt_fragment,
+                donor_template=cached_opportunity.donor_template
             )
             
             # Get donor-specific template
-            donor_template = self.prompt_builder.get_donor_template(
-                funding_opportunity.donor_organization
-            )
+            donor_template = cached_opportunity.donor_template
             
             # Generate proposal using OpenAI
             ai_response = await self.openai_client.generate_proposal(prompt)
             
-            # Calculate quality scores
-            scores = calculate_proposal_scores(
+            # Calculate quality scores; the semantic part embeds the proposal,
+            # which is CPU-bound, so keep it off the event loop
+            scores = await run_in_threadpool(
+                calculate_proposal_scores,
                 proposal_content=ai_response["content"],
                 funding_opportunity=funding_opportunity,
                 ngo_profile=profile
             )
             
+            # Large, highly repetitive blobs go to the deduplicating content store
+            content_store = ContentStore(self.db_session)
+            prompt_hash = await content_store.put_text(prompt)
+            snapshot_hash = await content_store.put_json(cached_opportunity.snapshot)
+            
             # Create proposal record
             proposal = Proposal(
                 user_id=user_id,
@@ -69,18 +112,18 @@ class ProposalService:
                 title=ai_response.get("title", f"Proposal for {funding_opportunity.title}"),
                 content=ai_response["content"],
                 executive_summary=ai_response.get("executive_summary"),
-                generation_prompt=prompt,
+                generation_prompt_hash=prompt_hash,
                 donor_template_used=donor_template,
                 ai_model_used=ai_response.get("model", "gpt-4"),
                 confidence_score=scores.get("confidence_score"),
                 alignment_score=scores.get("alignment_score"),
                 completeness_score=scores.get("completeness_score"),
-                funding_opportunity_snapshot=funding_opportunity.to_dict()
+                funding_opportunity_snapshot_hash=snapshot_hash
             )
             
             self.db_session.add(proposal)
             await self.db_session.commit()
-            await self.db_session.refresh(proposal)
+            await self._refresh_proposal(proposal)
             
             logger.info(f"Generated proposal for user {user_id}, funding opportunity {funding_opportunity_id}")
             return proposal
@@ -140,6 +183,8 @@ class ProposalService:
                 funding_data=None  # No specific funding opportunity
             )
             
+            prompt_hash = await ContentStore(self.db_session).put_text(prompt)
+            
             # Create proposal record
             proposal = Proposal(
                 user_id=user_id,
@@ -148,18 +193,18 @@ class ProposalService:
                 title=ai_response.get("title", "Custom Proposal"),
                 content=ai_response["content"],
                 executive_summary=ai_response.get("executive_summary"),
-                generation_prompt=prompt,
+                generation_prompt_hash=prompt_hash,
                 donor_template_used=prompt_type,
                 ai_model_used=ai_response.get("model", "gpt-4"),
                 confidence_score=scores.get("confidence_score"),
                 alignment_score=scores.get("alignment_score", 0),  # No specific opportunity to align with
                 completeness_score=scores.get("completeness_score"),
-                funding_opportunity_snapshot=None
+                funding_opportunity_snapshot_hash=None
             )
             
             self.db_session.add(proposal)
             await self.db_session.commit()
-            await self.db_session.refresh(proposal)
+            await self._refresh_proposal(proposal)
             
             logger.info(f"Custom proposal generated for user {user_id}")
             return proposal
@@ -169,11 +214,53 @@ class ProposalService:
             logger.error(f"Error generating custom proposal for user {user_id}: {str(e)}")
             raise
     
-    async def get_proposal_by_id(self, proposal_id: str, user_id: str) -> Optional[Proposal]:
-        """Get proposal by ID (with user access check)"""
+    async def get_proposal_by_id(
+        self,
+        proposal_id: str,
+        user_id: str,
+        include_body: bool = True,
+        fields: Optional[Sequence[str]] = None
+    ) -> Optional[Proposal]:
+        """
+        Get proposal by ID (with user access check)
+        
+        Args:
+            include_body: Load the deferred "body" columns (content)
+            fields: Only load these columns (plus id/version/timestamps);
+                other attributes raise on access. Overrides include_body.
+        """
+        try:
+            query = select(Proposal).where(
+                and_(
+                    Proposal.id == proposal_id,
+                    Proposal.user_id == user_id,
+                    Proposal.is_active == True
+                )
+            )
+            if fields is not None:
+                query = query.options(load_only(*projection_columns(fields), raiseload=True))
+            elif include_body:
+                query = query.options(undefer_group("body"))
+            result = await self.db_session.execute(query)
+            proposal = result.scalar_one_or_none()
+            return proposal
+        except Exception as e:
+            logger.error(f"Error fetching proposal {proposal_id} for user {user_id}: {str(e)}")
+            raise
+
+    async def get_proposal_version_key(
+        self,
+        proposal_id: str,
+        user_id: str
+    ) -> Optional[Tuple[Any, int, datetime]]:
+        """
+        Get (id, version, updated_at) of a proposal without loading the row
+
+        Used to answer conditional GETs; returns None if not found.
+        """
         try:
             result = await self.db_session.execute(
-                select(Proposal).where(
+                select(Proposal.id, Proposal.version, Proposal.updated_at).where(
                     and_(
                         Proposal.id == proposal_id,
                         Proposal.user_id == user_id,
@@ -181,39 +268,117 @@ class ProposalService:
                     )
                 )
             )
-            proposal = result.scalar_one_or_none()
-            return proposal
+            row = result.first()
+            return tuple(row) if row else None
         except Exception as e:
-            logger.error(f"Error fetching proposal {proposal_id} for user {user_id}: {str(e)}")
+            logger.error(f"Error fetching version of proposal {proposal_id} for user {user_id}: {str(e)}")
             raise
-    
-    async def get_user_proposals(
+
+    async def get_proposals_for_export(
         self,
+        proposal_ids: Sequence[str],
         user_id: str,
-        limit: int = 50,
-        offset: int = 0,
-        status: Optional[str] = None
+        include_body: bool = False
     ) -> List[Proposal]:
-        """Get all proposals for a user"""
+        """
+        Get several of a user's proposals in one query, in no particular order
+        
+        Proposals that do not exist, are archived or belong to another user
+        are left out.
+        """
         try:
             query = select(Proposal).where(
                 and_(
+                    Proposal.id.in_(proposal_ids),
                     Proposal.user_id == user_id,
                     Proposal.is_active == True
                 )
             )
-            
-            if status:
-                query = query.where(Proposal.status == status)
-            
-            query = query.limit(limit).offset(offset).order_by(Proposal.created_at.desc())
-            
+            if include_body:
+                query = query.options(undefer_group("body"))
             result = await self.db_session.execute(query)
-            proposals = result.scalars().all()
-            return list(proposals)
+            return list(result.scalars().all())
+        except Exception as e:
+            logger.error(f"Error fetching proposals for export for user {user_id}: {str(e)}")
+            raise
+    
+    async def get_user_proposals(
+        self,
+        user_id: str,
+        limit: int = 50,
+        offset: int = 0,
+        status: Optional[str] = None
+    ) -> List[Proposal]:
+        """Get all proposals for a user"""
+        proposals, _ = await self.get_user_proposals_page(
+            user_id=user_id,
+            limit=limit,
+            offset=offset,
+            status=status
+        )
+        return proposals
+    
+    async def get_user_proposals_page(
+        self,
+        user_id: str,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        status: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None
+    ) -> Tuple[List[Proposal], Optional[str]]:
+        """
+        Get a page of a user's proposals, newest first
+        
+        Pages are keyed on (created_at, id) so they stay stable while new
+        proposals are created; offset is only honoured without a cursor.
+        Only the summary columns are loaded unless fields names others.
+        
+        Returns:
+            Tuple of (proposals, next_cursor); next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is invalid
+        """
+        columns = SUMMARY_COLUMNS if fields is None else projection_columns(fields)
+        query = select(Proposal).options(load_only(*columns, raiseload=True)).where(
+            and_(
+                Proposal.user_id == user_id,
+                Proposal.is_active == True
+            )
+        )
+        
+        if status:
+            query = query.where(Proposal.status == status)
+        
+        if cursor:
+            last_created_at, last_id = decode_cursor(cursor, 2)
+            try:
+                last_created_at = datetime.fromisoformat(last_created_at)
+                last_id = uuid.UUID(last_id)
+            except (TypeError, ValueError):
+                raise ValueError("Invalid pagination cursor")
+            query = query.where(
+                tuple_(Proposal.created_at, Proposal.id) < tuple_(last_created_at, last_id)
+            )
+        elif offset:
+            query = query.offset(offset)
+        
+        query = query.order_by(Proposal.created_at.desc(), Proposal.id.desc()).limit(limit + 1)
+        
+        try:
+            result = await self.db_session.execute(query)
+            proposals = list(result.scalars().all())
         except Exception as e:
             logger.error(f"Error fetching proposals for user {user_id}: {str(e)}")
             raise
+        
+        next_cursor = None
+        if len(proposals) > limit:
+            proposals = proposals[:limit]
+            last = proposals[-1]
+            next_cursor = encode_cursor(last.created_at.isoformat(), str(last.id))
+        return proposals, next_cursor
     
     async def update_proposal(
         self,
@@ -227,28 +392,34 @@ class ProposalService:
             if not proposal:
                 return None
             
-            # Track edit history
-            edit_history = proposal.edit_history or []
-            edit_record = {
-                "timestamp": str(proposal.updated_at),
-                "changes": updates,
-                "version": proposal.version
-            }
-            edit_history.append(edit_record)
+            old_content = proposal.content
             
             # Update fields
             for field, value in updates.items():
                 if hasattr(proposal, field):
                     setattr(proposal, field, value)
             
-            # Increment version if content changed
-            if "content" in updates:
-                proposal.version += 1
-            
-            proposal.edit_history = edit_history
+            # Every edit is a new version, storing only the content diff;
+            # metadata-only edits get an unchanged-content revision so they
+            # stay in the history too
+            changes = {
+                field: value for field, value in updates.items()
+                if field != "content" and hasattr(proposal, field)
+            }
+            if "content" in updates or changes:
+                new_version = proposal.version + 1
+                await ProposalRevisionService(self.db_session).record_revision(
+                    proposal=proposal,
+                    old_content=old_content,
+                    new_content=updates.get("content", old_content),
+                    new_version=new_version,
+                    user_id=user_id,
+                    changes=changes
+                )
+                proposal.version = new_version
             
             await self.db_session.commit()
-            await self.db_session.refresh(proposal)
+            await self._refresh_proposal(proposal)
             
             logger.info(f"Updated proposal {proposal_id} for user {user_id}")
             return proposal
@@ -279,7 +450,7 @@ class ProposalService:
                 proposal.user_feedback = feedback
             
             await self.db_session.commit()
-            await self.db_session.refresh(proposal)
+            await self._refresh_proposal(proposal)
             
             logger.info(f"Rated proposal {proposal_id} with {rating} stars")
             return proposal
@@ -315,6 +486,17 @@ class ProposalService:
             logger.error(f"Error archiving proposal {proposal_id}: {str(e)}")
             raise
     
+    async def _refresh_proposal(self, proposal: Proposal):
+        """Reload a proposal including its deferred "body" columns"""
+        # A plain refresh() skips deferred columns and would leave them unloadable
+        await self.db_session.refresh(
+            proposal,
+            attribute_names=[
+                attr.key for attr in inspect(Proposal).column_attrs
+                if attr.key != "edit_history"
+            ]
+        )
+    
     async def _get_user_profile(self, user_id: str) -> Optional[NGOProfile]:
         """Get user's NGO profile"""
         result = await self.db_session.execute(
@@ -328,23 +510,25 @@ class ProposalService:
         return result.scalar_one_or_none()
     
     async def _get_funding_opportunity(self, funding_opportunity_id: int) -> Optional[FundingOpportunity]:
-        """Get funding opportunity by ID"""
-        result = await self.db_session.execute(
-            select(FundingOpportunity).where(
-                and_(
-                    FundingOpportunity.id == funding_opportunity_id,
-                    FundingOpportunity.is_active == True
-                )
-            )
-        )
-        return result.scalar_one_or_none()
+        """Get funding opportunity by ID (served from the opportunity cache)"""
+        cached_opportunity = await opportunity_cache.get(self.db_session, funding_opportunity_id)
+        return cached_opportunity.opportunity if cached_opportunity else None
     
     async def track_export(self, proposal_id: str, format: str) -> bool:
         """Track proposal export"""
         try:
             from datetime import datetime
             result = await self.db_session.execute(
-                select(Proposal).where(Proposal.id == proposal_id)
+                select(Proposal)
+                .options(
+                    load_only(
+                        Proposal.id,
+                        Proposal.exported_formats,
+                        Proposal.export_count,
+                        Proposal.last_exported_at,
+                    )
+                )
+                .where(Proposal.id == proposal_id)
             )
             proposal = result.scalar_one_or_none()
             
@@ -367,4 +551,38 @@ class ProposalService:
         except Exception as e:
             await self.db_session.rollback()
             logger.error(f"Error tracking export for proposal {proposal_id}: {str(e)}")
-            return False 
\ No newline at end of file
+            return False
+
+    async def track_exports(self, proposal_ids: Sequence[str], format: str) -> bool:
+        """Track an export of several proposals with a single UPDATE"""
+        try:
+            # The column holds SQL NULL or JSON null before the first export
+            stored = cast(Proposal.exported_formats, JSONB)
+            formats = case(
+                (func.jsonb_typeof(stored) == "array", stored),
+                else_=func.jsonb_build_array(),
+            )
+            await self.db_session.execute(
+                update(Proposal)
+                .where(Proposal.id.in_(proposal_ids))
+                .values(
+                    exported_formats=cast(
+                        case(
+                            (formats.contains([format]), formats),
+                            else_=formats.op("||")(func.jsonb_build_array(format)),
+                        ),
+                        JSON,
+                    ),
+                    export_count=Proposal.export_count + 1,
+                    last_exported_at=datetime.utcnow(),
+                )
+                .execution_options(synchronize_session=False)
+            )
+            await self.db_session.commit()
+            logger.info(f"Tracked export of {len(proposal_ids)} proposals to {format}")
+            return True
+            
+        except Exception as e:
+            await self.db_session.rollback()
+            logger.error(f"Error tracking bulk export to {format}: {str(e)}")
+            return False
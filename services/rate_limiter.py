@@ -0,0 +1,259 @@
+"""
+Sliding-window rate limiting for generate and export calls.
+
+Each (user, action) key keeps the timestamps and counts of its recent
+actions; a check sums the ones from the last window (60 seconds), so the
+limit holds for any 60-second span instead of resetting on the minute.
+
+The default backend keeps windows in process memory, which makes a check a
+dictionary lookup instead of a SUM over usage_ledger, but limits each
+worker process separately. Set RATE_LIMIT_REDIS_URL to share windows
+between workers through Redis or any server speaking the Redis protocol
+(KeyDB, Dragonfly, Valkey); that needs the optional redis package.
+
+usage_ledger is still written for billing and monthly quotas; it is no
+longer read for rate limits.
+"""
+
+import logging
+import os
+import time
+import uuid
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+RATE_LIMIT_WINDOW_SECONDS = float(os.getenv("RATE_LIMIT_WINDOW_SECONDS", "60"))
+
+
+class MemoryBackend:
+    """Sliding windows held in this process"""
+
+    name = "memory"
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        # key -> deque of [timestamp, count, reservation token], oldest first
+        self._windows: Dict[str, Deque[list]] = {}
+        self._totals: Dict[str, int] = {}
+
+    def _prune(self, key: str, window: float) -> int:
+        events = self._windows.get(key)
+        if events is None:
+            return 0
+        cutoff = self.clock() - window
+        total = self._totals[key]
+        while events and events[0][0] <= cutoff:
+            total -= events.popleft()[1]
+        if not events:
+            del self._windows[key]
+            del self._totals[key]
+            return 0
+        self._totals[key] = total
+        return total
+
+    async def total(self, key: str, window: float) -> int:
+        return self._prune(key, window)
+
+    async def add(self, key: str, count: int, window: float):
+        self._prune(key, window)
+        self._append(key, count, None)
+
+    def _append(self, key: str, count: int, token: Optional[str]):
+        self._windows.setdefault(key, deque()).append([self.clock(), count, token])
+        self._totals[key] = self._totals.get(key, 0) + count
+
+    async def reserve(self, key: str, count: int, limit: int, window: float) -> Optional[str]:
+        # No await between the check and the append, so this is atomic
+        # within the event loop
+        if self._prune(key, window) + count > limit:
+            return None
+        token = uuid.uuid4().hex
+        self._append(key, count, token)
+        return token
+
+    async def release(self, key: str, token: str, reserved: int, keep: int, window: float):
+        for event in self._windows.get(key, ()):
+            if event[2] == token:
+                released = event[1] - keep
+                event[1] = keep
+                self._totals[key] -= released
+                break
+
+    def sweep(self, window: float) -> int:
+        """Drop expired events of every key; returns the keys left"""
+        for key in list(self._windows):
+            self._prune(key, window)
+        return len(self._windows)
+
+    def size(self) -> int:
+        return len(self._windows)
+
+
+class RedisBackend:
+    """
+    Sliding windows in a shared Redis-protocol server
+
+    Each key is a sorted set of "<count>:<unique id>" members scored by
+    timestamp; old members are trimmed on every call and the key expires
+    once idle for a window.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, prefix: str = "ratelimit:"):
+        try:
+            import redis.asyncio as redis_asyncio
+        except ImportError:
+            raise ImportError(
+                "RATE_LIMIT_REDIS_URL requires the optional package redis"
+            )
+        self._redis = redis_asyncio.from_url(url)
+        self.prefix = prefix
+
+    async def total(self, key: str, window: float) -> int:
+        key = self.prefix + key
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, "-inf", now - window)
+        pipe.zrange(key, 0, -1)
+        _, members = await pipe.execute()
+        return sum(int(member.split(b":", 1)[0]) for member in members)
+
+    async def add(self, key: str, count: int, window: float):
+        key = self.prefix + key
+        now = time.time()
+        pipe = self._redis.pipeline(transaction=True)
+        pipe.zremrangebyscore(key, "-inf", now - window)
+        pipe.zadd(key, {f"{count}:{uuid.uuid4().hex}": now})
+        pipe.expire(key, int(window) + 1)
+        await pipe.execute()
+
+    async def reserve(self, key: str, count: int, limit: int, window: float) -> Optional[str]:
+        token = uuid.uuid4().hex
+        reserved = await self._redis.eval(
+            _RESERVE_SCRIPT, 1, self.prefix + key,
+            time.time(), window, count, limit, token, int(window) + 1,
+        )
+        return token if reserved else None
+
+    async def release(self, key: str, token: str, reserved: int, keep: int, window: float):
+        await self._redis.eval(_RELEASE_SCRIPT, 1, self.prefix + key, reserved, token, keep)
+
+    def size(self) -> Optional[int]:
+        return None
+
+
+# Trim, sum and add in one server-side step so concurrent reservations from
+# several workers cannot all pass the check
+_RESERVE_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', tonumber(ARGV[1]) - tonumber(ARGV[2]))
+local total = 0
+for _, member in ipairs(redis.call('ZRANGE', KEYS[1], 0, -1)) do
+    total = total + tonumber(string.match(member, '^(%d+):'))
+end
+if total + tonumber(ARGV[3]) > tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3] .. ':' .. ARGV[5])
+redis.call('EXPIRE', KEYS[1], ARGV[6])
+return 1
+"""
+
+_RELEASE_SCRIPT = """
+local member = ARGV[1] .. ':' .. ARGV[2]
+local score = redis.call('ZSCORE', KEYS[1], member)
+if not score then
+    return 0
+end
+redis.call('ZREM', KEYS[1], member)
+if tonumber(ARGV[3]) > 0 then
+    redis.call('ZADD', KEYS[1], score, ARGV[3] .. ':' .. ARGV[2])
+end
+return 1
+"""
+
+
+class RateLimiter:
+    """Per-user, per-action sliding-window limits"""
+
+    # Idle keys are swept from the memory backend every this many additions
+    SWEEP_EVERY = 1000
+
+    def __init__(self, backend=None, window_seconds: Optional[float] = None):
+        if backend is None:
+            redis_url = os.getenv("RATE_LIMIT_REDIS_URL", "")
+            backend = RedisBackend(redis_url) if redis_url else MemoryBackend()
+        self.backend = backend
+        self.window = window_seconds or RATE_LIMIT_WINDOW_SECONDS
+        self.allowed = 0
+        self.rejected = 0
+        self._additions = 0
+
+    @staticmethod
+    def _key(user_id: str, action_type: str) -> str:
+        return f"{action_type}:{user_id}"
+
+    async def usage(self, user_id: str, action_type: str) -> int:
+        """Actions counted in the current window"""
+        return await self.backend.total(self._key(user_id, action_type), self.window)
+
+    async def allow(self, user_id: str, action_type: str, limit: int, count: int = 1) -> bool:
+        """Whether count more actions stay within limit for the window"""
+        allowed = await self.usage(user_id, action_type) + count <= limit
+        if allowed:
+            self.allowed += 1
+        else:
+            self.rejected += 1
+        return allowed
+
+    async def add(self, user_id: str, action_type: str, count: int = 1):
+        """Count actions that were performed"""
+        await self.backend.add(self._key(user_id, action_type), count, self.window)
+        self._added()
+
+    def _added(self):
+        self._additions += 1
+        if self._additions % self.SWEEP_EVERY == 0 and isinstance(self.backend, MemoryBackend):
+            self.backend.sweep(self.window)
+
+    async def reserve(
+        self, user_id: str, action_type: str, limit: int, count: int = 1
+    ) -> Optional[str]:
+        """
+        Check and count actions in one step
+
+        Returns:
+            A token for release(), or None if count more would exceed limit
+        """
+        token = await self.backend.reserve(
+            self._key(user_id, action_type), count, limit, self.window
+        )
+        if token is None:
+            self.rejected += 1
+        else:
+            self.allowed += 1
+            self._added()
+        return token
+
+    async def release(
+        self, user_id: str, action_type: str, token: str, reserved: int, keep: int = 0
+    ):
+        """Give back a reservation, keeping keep of its reserved actions counted"""
+        await self.backend.release(
+            self._key(user_id, action_type), token, reserved, keep, self.window
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        """Backend, tracked keys and decision counts"""
+        return {
+            "backend": self.backend.name,
+            "window_seconds": self.window,
+            "keys": self.backend.size(),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+rate_limiter = RateLimiter()
@@ -1,12 +1,63 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func
-from typing import Dict, Any
-from models.usage import UsageLedger
+from typing import Dict, Any, Optional
+from models.usage import UsageLedger, UsageMonthlyRollup
+from services.rate_limiter import rate_limiter
+from services.usage_writer import UsageEvent, usage_writer
 from datetime import datetime
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Monthly quota units reserved by in-flight requests in this process, per user
+_pending_quota: Dict[str, int] = {}
+
+
+class UsageLimitExceeded(Exception):
+    """A reservation would exceed the per-minute rate limit ("rate") or monthly quota ("quota")"""
+
+    def __init__(self, kind: str, action_type: str, limit: int, details: Optional[Dict[str, Any]] = None):
+        super().__init__(f"{action_type} {kind} limit of {limit} exceeded")
+        self.kind = kind
+        self.action_type = action_type
+        self.limit = limit
+        self.details = details or {}
+
+
+class UsageReservation:
+    """Rate limit and quota held for a request until it is committed or released"""
+
+    __slots__ = ("user_id", "action_type", "count", "rate_token", "quota_count", "settled")
+
+    def __init__(self, user_id: str, action_type: str, count: int):
+        self.user_id = user_id
+        self.action_type = action_type
+        self.count = count
+        self.rate_token: Optional[str] = None
+        self.quota_count = 0
+        self.settled = False
+
+
+def default_usage_summary() -> Dict[str, Any]:
+    """Free-plan summary with no usage, served when usage cannot be read"""
+    return {
+        "plan": "free",
+        "monthly_limit": 10,
+        "used": 0,
+        "remaining": 10,
+        "reset_at": UsageLedger.get_next_month_start().isoformat(),
+    }
+
+
+def _release_quota(reservation: UsageReservation):
+    if reservation.quota_count:
+        remaining = _pending_quota.get(reservation.user_id, 0) - reservation.quota_count
+        if remaining > 0:
+            _pending_quota[reservation.user_id] = remaining
+        else:
+            _pending_quota.pop(reservation.user_id, None)
+        reservation.quota_count = 0
+
 
 class UsageService:
     """Service for tracking and querying API usage"""
@@ -15,37 +66,53 @@ class UsageService:
         self.db_session = db_session
 
     async def get_usage_summary(self, user_id: str) -> Dict[str, Any]:
-        """Get current month usage summary for user"""
+        """
+        Get current month usage summary for user
+
+        Reads the user's usage_monthly_rollup rows for this month (one per
+        action type) by primary key, plus usage still queued for the ledger
+        in this process; the ledger is not scanned.
+
+        Raises on database errors rather than guessing; callers that must
+        degrade can fall back to default_usage_summary().
+        """
         try:
-            month_start = UsageLedger.get_current_month_start()
+            month = UsageMonthlyRollup.month_of(datetime.utcnow())
             next_month = UsageLedger.get_next_month_start()
 
-            # Get user's current plan info (from most recent entry or default)
-            latest_entry_result = await self.db_session.execute(
-                select(UsageLedger)
-                .where(UsageLedger.user_id == user_id)
-                .order_by(UsageLedger.created_at.desc())
-                .limit(1)
-            )
-            latest_entry = latest_entry_result.scalar_one_or_none()
+            rows = (
+                await self.db_session.execute(
+                    select(UsageMonthlyRollup).where(
+                        UsageMonthlyRollup.user_id == user_id,
+                        UsageMonthlyRollup.month == month,
+                    )
+                )
+            ).scalars().all()
+
+            # Plan info from the most recent entry (this month or earlier)
+            latest = max(rows, key=lambda row: row.updated_at, default=None)
+            if latest is None:
+                latest = (
+                    await self.db_session.execute(
+                        select(UsageMonthlyRollup)
+                        .where(UsageMonthlyRollup.user_id == user_id)
+                        .order_by(UsageMonthlyRollup.month.desc(), UsageMonthlyRollup.updated_at.desc())
+                        .limit(1)
+                    )
+                ).scalar_one_or_none()
 
             # Default plan info
-            plan_name = "free"
-            monthly_limit = 10
-
-            if latest_entry:
-                plan_name = latest_entry.plan_name
-                monthly_limit = latest_entry.monthly_limit
-
-            # Calculate usage for current month
-            usage_result = await self.db_session.execute(
-                select(func.coalesce(func.sum(UsageLedger.count), 0)).where(
-                    UsageLedger.user_id == user_id,
-                    UsageLedger.created_at >= month_start,
-                    UsageLedger.created_at < next_month,
-                )
+            summary = default_usage_summary()
+            plan_name = summary["plan"]
+            monthly_limit = summary["monthly_limit"]
+
+            if latest:
+                plan_name = latest.plan_name
+                monthly_limit = latest.monthly_limit
+
+            used = sum(row.count for row in rows) + usage_writer.buffered(
+                user_id, since=datetime.combine(month, datetime.min.time())
             )
-            used = usage_result.scalar() or 0
 
             remaining = max(0, monthly_limit - used)
 
@@ -59,14 +126,29 @@ class UsageService:
 
         except Exception as e:
             logger.error(f"Error getting usage summary for user {user_id}: {str(e)}")
-            # Return safe defaults on error
-            return {
-                "plan": "free",
-                "monthly_limit": 10,
-                "used": 0,
-                "remaining": 10,
-                "reset_at": UsageLedger.get_next_month_start().isoformat(),
-            }
+            raise
+
+    async def get_usage_version(self, user_id: str) -> Optional[datetime]:
+        """
+        Get the timestamp of the user's latest usage this month
+
+        Every ledger insert bumps the rollup row's updated_at and the summary
+        is derived from those rows, so this plus the current month
+        identifies the summary for conditional GETs.
+        """
+        try:
+            result = await self.db_session.execute(
+                select(func.max(UsageMonthlyRollup.updated_at)).where(
+                    UsageMonthlyRollup.user_id == user_id,
+                    UsageMonthlyRollup.month == UsageMonthlyRollup.month_of(datetime.utcnow()),
+                )
+            )
+            written = result.scalar()
+            queued = usage_writer.latest(user_id)
+            return max(filter(None, (written, queued)), default=None)
+        except Exception as e:
+            logger.error(f"Error getting usage version for user {user_id}: {str(e)}")
+            raise
 
     async def record_usage(
         self,
@@ -77,46 +159,139 @@ class UsageService:
         monthly_limit: int = 10,
     ) -> bool:
         """Record API usage for billing/limits"""
+        # The rate limit counts the action even if the ledger write fails
         try:
-            usage_entry = UsageLedger(
-                user_id=user_id,
-                action_type=action_type,
-                count=count,
-                plan_name=plan_name,
-                monthly_limit=monthly_limit,
-            )
+            await rate_limiter.add(user_id, action_type, count)
+        except Exception as e:
+            logger.error(f"Error updating rate limit window for user {user_id}: {str(e)}")
+        return await self._write_ledger(user_id, action_type, count, plan_name, monthly_limit)
 
-            self.db_session.add(usage_entry)
-            await self.db_session.commit()
+    async def _write_ledger(
+        self,
+        user_id: str,
+        action_type: str,
+        count: int,
+        plan_name: str,
+        monthly_limit: int,
+    ) -> bool:
+        # Queued and written in batches off the request path (services.usage_writer)
+        queued = await usage_writer.add(UsageEvent(
+            user_id, action_type, count, plan_name=plan_name, monthly_limit=monthly_limit
+        ))
+        logger.info(
+            f"Recorded usage: user={user_id}, action={action_type}, count={count}"
+        )
+        return queued
 
-            logger.info(
-                f"Recorded usage: user={user_id}, action={action_type}, count={count}"
-            )
-            return True
+    async def reserve_usage(
+        self,
+        user_id: str,
+        action_type: str,
+        limit_per_minute: int,
+        count: int = 1,
+        check_quota: bool = False,
+    ) -> UsageReservation:
+        """
+        Reserve count actions against the rate limit and, optionally, the monthly quota
 
+        The check and the reservation are one step, so concurrent requests
+        cannot all pass a check made before any of them is recorded.
+        Follow with commit_usage() once the work is done, or
+        release_usage() if it failed. Quota reservations are tracked per
+        process.
+
+        Raises:
+            UsageLimitExceeded: If the reservation would exceed a limit
+        """
+        reservation = UsageReservation(user_id, action_type, count)
+        try:
+            reservation.rate_token = await rate_limiter.reserve(
+                user_id, action_type, limit_per_minute, count
+            )
+            if reservation.rate_token is None:
+                raise UsageLimitExceeded("rate", action_type, limit_per_minute)
+        except UsageLimitExceeded:
+            raise
         except Exception as e:
-            await self.db_session.rollback()
-            logger.error(f"Error recording usage for user {user_id}: {str(e)}")
-            return False
+            # Allow on error to avoid blocking legitimate requests
+            logger.error(f"Error reserving rate limit for user {user_id}: {str(e)}")
 
-    async def check_rate_limit(
-        self, user_id: str, action_type: str, limit_per_minute: int
+        if check_quota:
+            # Counted as pending before reading the ledger, so requests that
+            # interleave here see each other
+            _pending_quota[user_id] = _pending_quota.get(user_id, 0) + count
+            reservation.quota_count = count
+            try:
+                summary = await self.get_usage_summary(user_id)
+            except Exception:
+                # Allow on error to avoid blocking legitimate requests
+                return reservation
+            if summary["used"] + _pending_quota[user_id] > summary["monthly_limit"]:
+                await self.release_usage(reservation)
+                raise UsageLimitExceeded(
+                    "quota", action_type, summary["monthly_limit"],
+                    details={"used": summary["used"], "reset_at": summary["reset_at"]},
+                )
+        return reservation
+
+    async def commit_usage(
+        self,
+        reservation: UsageReservation,
+        count: Optional[int] = None,
+        plan_name: str = "free",
+        monthly_limit: int = 10,
     ) -> bool:
-        """Check if user is within rate limit for specific action"""
+        """
+        Record the reserved actions in the ledger
+
+        A count below the reserved count gives back the rest of the rate
+        limit reservation.
+        """
+        if reservation.settled:
+            return False
+        reservation.settled = True
+        count = reservation.count if count is None else count
         try:
-            # Check usage in the last minute
-            one_minute_ago = datetime.utcnow().replace(second=0, microsecond=0)
-
-            usage_result = await self.db_session.execute(
-                select(func.coalesce(func.sum(UsageLedger.count), 0)).where(
-                    UsageLedger.user_id == user_id,
-                    UsageLedger.action_type == action_type,
-                    UsageLedger.created_at >= one_minute_ago,
+            if reservation.rate_token is not None and count < reservation.count:
+                await rate_limiter.release(
+                    reservation.user_id, reservation.action_type,
+                    reservation.rate_token, reservation.count, keep=count
                 )
+            if count <= 0:
+                return True
+            return await self._write_ledger(
+                reservation.user_id, reservation.action_type, count, plan_name, monthly_limit
             )
-            current_usage = usage_result.scalar() or 0
+        finally:
+            # Only now that the ledger has it, or has failed to
+            _release_quota(reservation)
+
+    async def release_usage(self, reservation: UsageReservation):
+        """Give back a reservation whose work failed or was not done"""
+        if reservation.settled:
+            return
+        reservation.settled = True
+        _release_quota(reservation)
+        if reservation.rate_token is not None:
+            try:
+                await rate_limiter.release(
+                    reservation.user_id, reservation.action_type,
+                    reservation.rate_token, reservation.count
+                )
+            except Exception as e:
+                logger.error(f"Error releasing rate limit for user {reservation.user_id}: {str(e)}")
 
-            return current_usage < limit_per_minute
+    async def check_rate_limit(
+        self, user_id: str, action_type: str, limit_per_minute: int, count: int = 1
+    ) -> bool:
+        """
+        Check if count more actions stay within the user's per-minute rate limit
+
+        Uses the in-memory sliding window of the last 60 seconds (see
+        services.rate_limiter), not the ledger.
+        """
+        try:
+            return await rate_limiter.allow(user_id, action_type, limit_per_minute, count)
 
         except Exception as e:
             logger.error(f"Error checking rate limit for user {user_id}: {str(e)}")
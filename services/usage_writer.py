@@ -0,0 +1,309 @@
+"""
+Buffered usage ledger writes.
+
+record_usage used to insert and commit one usage_ledger row on the request
+path. Events are now queued in memory and written by a background task as
+one multi-row insert (plus the matching usage_monthly_rollup upserts) every
+USAGE_FLUSH_INTERVAL_MS, or sooner once USAGE_FLUSH_MAX_EVENTS are queued.
+
+Each event's ledger id is derived from the request id, so writing an event
+twice (a retried flush whose commit did succeed, or a replayed spool file)
+inserts it once: conflicting (id, created_at) keys are skipped and only
+inserted rows are added to the rollup.
+
+Events still queued at shutdown, or piling up while the database is
+unreachable, are appended to USAGE_SPOOL_PATH and replayed on next start.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.dialects.postgresql import insert
+
+from db import AsyncSessionLocal
+from models.usage import UsageLedger, UsageMonthlyRollup
+from utils.logging_config import request_id_ctx_var
+
+logger = logging.getLogger(__name__)
+
+USAGE_FLUSH_INTERVAL_MS = int(os.getenv("USAGE_FLUSH_INTERVAL_MS", "500"))
+USAGE_FLUSH_MAX_EVENTS = int(os.getenv("USAGE_FLUSH_MAX_EVENTS", "200"))
+USAGE_BUFFER_MAX_EVENTS = int(os.getenv("USAGE_BUFFER_MAX_EVENTS", "10000"))
+USAGE_SPOOL_PATH = os.getenv("USAGE_SPOOL_PATH", "data/usage_spool.jsonl")
+
+# Rows per INSERT statement, well under asyncpg's 32767 bind parameters
+INSERT_CHUNK_ROWS = 1000
+
+_EVENT_NAMESPACE = uuid.UUID("6f2d8a51-3c4b-4e7f-9a10-b5c7d9e1f203")
+
+
+def rollup_upsert(
+    user_id: str,
+    action_type: str,
+    count: int,
+    at: datetime,
+    plan_name: str,
+    monthly_limit: int,
+):
+    """Statement adding count to the user's usage_monthly_rollup row for at's month"""
+    statement = insert(UsageMonthlyRollup).values(
+        user_id=user_id,
+        month=UsageMonthlyRollup.month_of(at),
+        action_type=action_type,
+        count=count,
+        plan_name=plan_name,
+        monthly_limit=monthly_limit,
+        updated_at=at,
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["user_id", "month", "action_type"],
+        set_={
+            "count": UsageMonthlyRollup.count + statement.excluded.count,
+            "plan_name": statement.excluded.plan_name,
+            "monthly_limit": statement.excluded.monthly_limit,
+            "updated_at": statement.excluded.updated_at,
+        },
+    )
+
+
+class UsageEvent:
+    """One usage_ledger row waiting to be written"""
+
+    __slots__ = ("id", "user_id", "action_type", "count", "created_at", "plan_name", "monthly_limit")
+
+    def __init__(
+        self,
+        user_id: str,
+        action_type: str,
+        count: int = 1,
+        plan_name: str = "free",
+        monthly_limit: int = 10,
+        id: Optional[uuid.UUID] = None,
+        created_at: Optional[datetime] = None,
+    ):
+        self.id = id or event_id(user_id, action_type)
+        self.user_id = user_id
+        self.action_type = action_type
+        self.count = count
+        self.created_at = created_at or datetime.utcnow()
+        self.plan_name = plan_name
+        self.monthly_limit = monthly_limit
+
+    def to_row(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def to_json(self) -> str:
+        row = self.to_row()
+        row["id"] = str(self.id)
+        row["created_at"] = self.created_at.isoformat()
+        return json.dumps(row)
+
+    @classmethod
+    def from_json(cls, line: str) -> "UsageEvent":
+        row = json.loads(line)
+        row["id"] = uuid.UUID(row["id"])
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+        return cls(**row)
+
+
+def event_id(user_id: str, action_type: str) -> uuid.UUID:
+    """Ledger id of the current request's usage of action_type (random outside a request)"""
+    request_id = request_id_ctx_var.get("")
+    if not request_id:
+        return uuid.uuid4()
+    return uuid.uuid5(_EVENT_NAMESPACE, f"{request_id}:{user_id}:{action_type}")
+
+
+class UsageWriter:
+    """Buffers usage events and writes them in batches"""
+
+    def __init__(
+        self,
+        interval_ms: Optional[int] = None,
+        max_events: Optional[int] = None,
+        spool_path: Optional[str] = None,
+    ):
+        self.interval = (interval_ms or USAGE_FLUSH_INTERVAL_MS) / 1000
+        self.max_events = max_events or USAGE_FLUSH_MAX_EVENTS
+        self.spool_path = spool_path or USAGE_SPOOL_PATH
+        self._buffer: List[UsageEvent] = []
+        self._lock = asyncio.Lock()
+        self._wake: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+        self.flushed = 0
+        self.flushes = 0
+        self.failures = 0
+        self.spooled = 0
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    async def start(self):
+        """Replay any spool file and start flushing in the background"""
+        if self.running:
+            return
+        await self._replay_spool()
+        self._wake = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="usage_writer")
+
+    async def stop(self):
+        """Stop the background task and write everything still queued"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        if not await self.flush() and self._buffer:
+            self._spool(self._buffer)
+            self._buffer.clear()
+
+    async def add(self, event: UsageEvent) -> bool:
+        """
+        Queue an event
+
+        Without a running writer (scripts, tests) it is written immediately.
+
+        Returns:
+            False only if an immediate write failed
+        """
+        self._buffer.append(event)
+        if not self.running:
+            return await self.flush()
+        if len(self._buffer) >= self.max_events:
+            self._wake.set()
+        return True
+
+    def buffered(self, user_id: str, since: Optional[datetime] = None) -> int:
+        """Count of a user's queued usage (created at or after since)"""
+        return sum(
+            event.count for event in self._buffer
+            if event.user_id == user_id and (since is None or event.created_at >= since)
+        )
+
+    def latest(self, user_id: str) -> Optional[datetime]:
+        """created_at of the user's newest queued event"""
+        return max(
+            (event.created_at for event in self._buffer if event.user_id == user_id),
+            default=None,
+        )
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wake.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self.flush()
+
+    async def flush(self) -> bool:
+        """
+        Write the queued events in one transaction
+
+        Events stay queued until the transaction commits. If the database
+        stays unreachable the queue is spooled to disk once it reaches
+        USAGE_BUFFER_MAX_EVENTS.
+
+        Returns:
+            True if everything queued was written
+        """
+        async with self._lock:
+            if not self._buffer:
+                return True
+            batch = self._buffer[:]
+            try:
+                await self._write_batch(batch)
+            except Exception as e:
+                self.failures += 1
+                logger.error(f"Error writing {len(batch)} usage events: {str(e)}")
+                if len(self._buffer) >= USAGE_BUFFER_MAX_EVENTS:
+                    self._spool(self._buffer)
+                    self._buffer.clear()
+                return False
+            # Events queued during the write stay for the next flush
+            del self._buffer[:len(batch)]
+            self.flushed += len(batch)
+            self.flushes += 1
+            return not self._buffer
+
+    async def _write_batch(self, events: List[UsageEvent]):
+        async with AsyncSessionLocal() as session:
+            inserted = set()
+            for start in range(0, len(events), INSERT_CHUNK_ROWS):
+                chunk = events[start:start + INSERT_CHUNK_ROWS]
+                inserted.update((
+                    await session.execute(
+                        insert(UsageLedger)
+                        .values([event.to_row() for event in chunk])
+                        .on_conflict_do_nothing(index_elements=["id", "created_at"])
+                        .returning(UsageLedger.id)
+                    )
+                ).scalars().all())
+
+            # One rollup upsert per (user, month, action) of the new rows;
+            # plan fields come from the latest event
+            groups: Dict[tuple, List[UsageEvent]] = defaultdict(list)
+            for event in events:
+                if event.id in inserted:
+                    month = UsageMonthlyRollup.month_of(event.created_at)
+                    groups[(event.user_id, month, event.action_type)].append(event)
+            for (user_id, _, action_type), group in groups.items():
+                latest = max(group, key=lambda event: event.created_at)
+                await session.execute(rollup_upsert(
+                    user_id, action_type, sum(event.count for event in group),
+                    latest.created_at, latest.plan_name, latest.monthly_limit,
+                ))
+            await session.commit()
+
+        if len(inserted) < len(events):
+            logger.info(f"Skipped {len(events) - len(inserted)} usage events already in the ledger")
+
+    def _spool(self, events: List[UsageEvent]):
+        try:
+            directory = os.path.dirname(self.spool_path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            with open(self.spool_path, "a", encoding="utf-8") as spool:
+                spool.writelines(event.to_json() + "\n" for event in events)
+                spool.flush()
+                os.fsync(spool.fileno())
+            self.spooled += len(events)
+            logger.warning(f"Spooled {len(events)} usage events to {self.spool_path}")
+        except OSError as e:
+            logger.error(f"Lost {len(events)} usage events, spool not writable: {str(e)}")
+
+    async def _replay_spool(self):
+        try:
+            with open(self.spool_path, encoding="utf-8") as spool:
+                events = [UsageEvent.from_json(line) for line in spool if line.strip()]
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read usage spool {self.spool_path}: {str(e)}")
+            return
+        try:
+            await self._write_batch(events)
+        except Exception as e:
+            logger.error(f"Replaying {len(events)} spooled usage events failed: {str(e)}")
+            return
+        os.remove(self.spool_path)
+        logger.info(f"Replayed {len(events)} spooled usage events")
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue size and write counters"""
+        return {
+            "queued": len(self._buffer),
+            "flushed": self.flushed,
+            "flushes": self.flushes,
+            "failures": self.failures,
+            "spooled": self.spooled,
+        }
+
+
+usage_writer = UsageWriter()
@@ -0,0 +1,114 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.alignment_matrix import (
+    TermEncoder,
+    encode_sides,
+    score_matrix,
+    sparse_entries,
+    FOCUS_AREA_WEIGHT,
+    GEOGRAPHY_WEIGHT,
+    ORGANIZATION_TYPE_WEIGHT,
+    KEYWORD_WEIGHT_PER_MATCH,
+)
+from utils.pagination import encode_cursor, decode_cursor
+
+
+class TestAlignmentMatrix:
+    """Test cases for vectorized alignment scoring."""
+
+    @pytest.fixture
+    def profiles(self):
+        return [
+            {
+                "id": "p1",
+                "focus_areas": ["Education", "Health"],
+                "geographic_scope": ["Kenya"],
+                "organization_type": "NGO",
+                "programs_services": ["girls education"],
+            },
+            {
+                "id": "p2",
+                "focus_areas": ["Climate"],
+                "geographic_scope": ["Peru"],
+                "organization_type": None,
+                "programs_services": [],
+            },
+        ]
+
+    @pytest.fixture
+    def opportunities(self):
+        return [
+            {
+                "id": 1,
+                "focus_areas": ["education "],
+                "geographic_focus": ["kenya", "Uganda"],
+                "organization_types": ["ngo", "CBO"],
+                "keywords": ["Girls Education", "health"],
+            },
+            {
+                "id": 2,
+                "focus_areas": ["Agriculture"],
+                "geographic_focus": ["India"],
+                "organization_types": None,
+                "keywords": None,
+            },
+        ]
+
+    def test_term_encoder_normalizes_and_deduplicates(self):
+        """Test that terms are case/whitespace normalized and encoded once."""
+        encoder = TermEncoder()
+        ids = encoder.encode(["Education", " education", "Health"])
+        assert ids.tolist() == [0, 1]
+        assert len(encoder) == 2
+
+    def test_score_matrix_matches_weights(self, profiles, opportunities):
+        """Test that each matching field contributes its weight."""
+        profile_side, opportunity_side = encode_sides(profiles, opportunities)
+        scores = score_matrix(profile_side, opportunity_side)
+
+        expected = (
+            FOCUS_AREA_WEIGHT
+            + GEOGRAPHY_WEIGHT
+            + ORGANIZATION_TYPE_WEIGHT
+            + 2 * KEYWORD_WEIGHT_PER_MATCH
+        )
+        assert scores.shape == (2, 2)
+        assert scores[0, 0] == pytest.approx(expected)
+        assert scores[0, 1] == 0.0
+        assert scores[1, 0] == 0.0
+        assert scores[1, 1] == 0.0
+
+    def test_sparse_entries_skips_zero_scores(self, profiles, opportunities):
+        """Test that only aligned pairs are emitted."""
+        profile_side, opportunity_side = encode_sides(profiles, opportunities)
+        scores = score_matrix(profile_side, opportunity_side)
+        entries = sparse_entries(scores, profile_side.ids, opportunity_side.ids)
+
+        assert len(entries) == 1
+        assert entries[0]["ngo_profile_id"] == "p1"
+        assert entries[0]["funding_opportunity_id"] == 1
+
+    def test_take_selects_rows(self, profiles, opportunities):
+        """Test that a row subset scores the same as the full matrix."""
+        profile_side, opportunity_side = encode_sides(profiles, opportunities)
+        full = score_matrix(profile_side, opportunity_side)
+        subset = score_matrix(profile_side.take([1]), opportunity_side)
+        assert np.array_equal(subset[0], full[1])
+
+
+class TestPaginationCursor:
+    """Test cases for opaque pagination cursors."""
+
+    def test_round_trip(self):
+        """Test that a cursor decodes back to its values."""
+        token = encode_cursor(0.75, 42)
+        assert decode_cursor(token, 2) == [0.75, 42]
+
+    def test_invalid_cursor(self):
+        """Test that malformed cursors raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor", 2)
+        with pytest.raises(ValueError):
+            decode_cursor(encode_cursor(1, 2, 3), 2)
@@ -0,0 +1,43 @@
+import pytest
+
+from utils.blob_codec import (
+    CODEC_NONE,
+    CODEC_ZLIB,
+    compress,
+    decompress,
+    default_codec,
+    encode_json,
+    content_hash,
+)
+
+
+class TestBlobCodec:
+    """Test cases for content blob compression and hashing."""
+
+    def test_round_trip_default_codec(self):
+        raw = ("Community health workers in rural districts. " * 200).encode("utf-8")
+        codec, data = compress(raw)
+        assert codec == default_codec()
+        assert len(data) < len(raw) / 5
+        assert decompress(codec, data) == raw
+
+    def test_zlib_round_trip(self):
+        raw = b"x" * 4096
+        codec, data = compress(raw, CODEC_ZLIB)
+        assert codec == CODEC_ZLIB
+        assert decompress(codec, data) == raw
+
+    def test_small_blobs_are_stored_raw(self):
+        codec, data = compress(b"short")
+        assert codec == CODEC_NONE
+        assert data == b"short"
+
+    def test_json_encoding_is_canonical(self):
+        first = encode_json({"b": 1, "a": {"y": 2, "x": 1}})
+        second = encode_json({"a": {"x": 1, "y": 2}, "b": 1})
+        assert first == second
+        assert content_hash(first) == content_hash(second)
+
+    def test_unknown_codec_rejected(self):
+        with pytest.raises(ValueError):
+            decompress("lz4", b"")
@@ -0,0 +1,63 @@
+import io
+import zipfile
+
+import pytest
+
+from services import bulk_export
+from services.bulk_export import BulkExportItem, ZipStream, stream_bulk_export
+
+PDF_BODY = b"%PDF-1.4 " + bytes(range(256)) * 600  # spans several chunks
+
+
+class TestZipStream:
+    """Test cases for the streaming ZIP writer."""
+
+    def test_streams_valid_archive(self):
+        archive = ZipStream()
+        chunks = list(archive.iter_entry("a.pdf", io.BytesIO(PDF_BODY)))
+        assert len(chunks) > 1
+        chunks.extend(archive.iter_entry("a.pdf", io.BytesIO(b"second")))
+        chunks.append(archive.close())
+
+        with zipfile.ZipFile(io.BytesIO(b"".join(chunks))) as result:
+            assert result.namelist() == ["a.pdf", "a (2).pdf"]
+            assert result.read("a.pdf") == PDF_BODY
+            assert result.read("a (2).pdf") == b"second"
+            assert result.testzip() is None
+
+
+class TestStreamBulkExport:
+    """Test cases for bulk export streaming."""
+
+    @pytest.mark.asyncio
+    async def test_cached_and_rendered_entries_with_failures(self, monkeypatch):
+        async def fake_render(item, format):
+            if item.proposal_id == "broken":
+                raise RuntimeError("renderer crashed")
+            return io.BytesIO(b"rendered " + item.proposal_id.encode())
+
+        monkeypatch.setattr(bulk_export, "_render", fake_render)
+        items = [
+            BulkExportItem("cached", "Cached_proposal.pdf", "k1", file=io.BytesIO(PDF_BODY)),
+            BulkExportItem("fresh", "Fresh_proposal.pdf", "k2", snapshot=object()),
+            BulkExportItem("broken", "Broken_proposal.pdf", "k3", snapshot=object()),
+        ]
+
+        recorded = []
+
+        async def on_complete(exported_ids):
+            recorded.extend(exported_ids)
+
+        body = b"".join([
+            chunk async for chunk in stream_bulk_export(items, "pdf", on_complete=on_complete)
+        ])
+
+        with zipfile.ZipFile(io.BytesIO(body)) as result:
+            assert result.namelist() == ["Cached_proposal.pdf", "Fresh_proposal.pdf", "export_errors.txt"]
+            assert result.read("Cached_proposal.pdf") == PDF_BODY
+            assert result.read("Fresh_proposal.pdf") == b"rendered fresh"
+            errors = result.read("export_errors.txt").decode()
+        assert "1 of 3" in errors
+        assert "Broken_proposal.pdf (broken): renderer crashed" in errors
+        assert items[0].file is None
+        assert recorded == ["cached", "fresh"]
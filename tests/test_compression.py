@@ -0,0 +1,131 @@
+import gzip
+import zlib
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import Response, StreamingResponse, PlainTextResponse
+from fastapi.testclient import TestClient
+
+from utils.compression import CompressionMiddleware, choose_encoding, brotli
+
+LARGE_TEXT = "Our programme strengthens community health systems. " * 200
+
+
+def make_app() -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @app.get("/large")
+    async def large():
+        return {"content": LARGE_TEXT}
+
+    @app.get("/tagged")
+    async def tagged():
+        return PlainTextResponse(LARGE_TEXT, headers={"ETag": '"v1"'})
+
+    @app.get("/small")
+    async def small():
+        return {"ok": True}
+
+    @app.get("/stream")
+    async def stream():
+        async def chunks():
+            for n in range(5):
+                yield f"chunk {n} ".encode() * 100
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.get("/events")
+    async def events():
+        async def chunks():
+            for n in range(3):
+                yield f"data: {n}\n\n".encode() * 100
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    @app.get("/pdf")
+    async def pdf():
+        return Response(b"%PDF" + b"0" * 5000, media_type="application/pdf")
+
+    @app.get("/encoded")
+    async def encoded():
+        body = gzip.compress(LARGE_TEXT.encode())
+        return PlainTextResponse(body, headers={"Content-Encoding": "gzip"})
+
+    return app
+
+
+class TestCompressionNegotiation:
+    """Test cases for Accept-Encoding negotiation."""
+
+    def test_prefers_brotli_then_gzip(self):
+        expected = "br" if brotli is not None else "gzip"
+        assert choose_encoding("gzip, deflate, br") == expected
+        assert choose_encoding("gzip") == "gzip"
+
+    def test_respects_q_values(self):
+        assert choose_encoding("br;q=0.5, gzip;q=0.9") == "gzip"
+        assert choose_encoding("gzip;q=0") is None
+        assert choose_encoding("identity") is None
+        assert choose_encoding("") is None
+        assert choose_encoding("*") in ("br", "gzip")
+
+
+class TestCompressionMiddleware:
+    """Test cases for the compression middleware."""
+
+    @pytest.fixture
+    def client(self):
+        return TestClient(make_app())
+
+    def test_large_json_is_gzipped(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(LARGE_TEXT) / 4
+        assert response.json()["content"] == LARGE_TEXT
+
+    @pytest.mark.skipif(brotli is None, reason="brotli not installed")
+    def test_large_json_is_brotli_encoded(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+        assert response.json()["content"] == LARGE_TEXT
+
+    def test_small_response_not_compressed(self, client):
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.json() == {"ok": True}
+
+    def test_no_accept_encoding(self, client):
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+        assert "content-encoding" not in response.headers
+
+    def test_streaming_response_compressed_incrementally(self, client):
+        with client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+            assert response.headers["content-encoding"] == "gzip"
+            assert "content-length" not in response.headers
+            raw = b"".join(response.iter_raw())
+        decompressor = zlib.decompressobj(31)
+        text = decompressor.decompress(raw).decode()
+        assert text == "".join(f"chunk {n} " * 100 for n in range(5))
+
+    def test_event_stream_untouched(self, client):
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.text.startswith("data: 0")
+
+    def test_pdf_untouched(self, client):
+        response = client.get("/pdf", headers={"Accept-Encoding": "gzip"})
+        assert "content-encoding" not in response.headers
+        assert response.content.startswith(b"%PDF")
+
+    def test_already_encoded_untouched(self, client):
+        response = client.get("/encoded", headers={"Accept-Encoding": "br, gzip"})
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == LARGE_TEXT
+
+    def test_strong_etag_weakened_when_compressed(self, client):
+        compressed = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        assert compressed.headers["etag"] == 'W/"v1"'
+        plain = client.get("/tagged", headers={"Accept-Encoding": "identity"})
+        assert plain.headers["etag"] == '"v1"'
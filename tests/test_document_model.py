@@ -0,0 +1,55 @@
+from types import SimpleNamespace
+
+from utils.document_model import HEADING, LIST, PARAGRAPH, document_for, parse_markdown
+
+CONTENT = """Clean Water for Rural Schools
+
+# Executive Summary
+We will drill ten wells.
+Across three districts.
+
+## Objectives
+Our goals:
+- Build 10 wells
+- Train 40 staff
+  on maintenance
+
+1. Survey sites
+2. Drill
+
+Closing paragraph.
+"""
+
+
+class TestParseMarkdown:
+    """Test cases for the proposal document model."""
+
+    def test_blocks(self):
+        document = parse_markdown(CONTENT)
+        kinds = [block.kind for block in document.blocks]
+        assert kinds == [PARAGRAPH, HEADING, PARAGRAPH, HEADING, PARAGRAPH, LIST, LIST, PARAGRAPH]
+        assert document.blocks[3].text == "Objectives"
+        assert document.blocks[3].level == 2
+        assert document.blocks[5].items == ("Build 10 wells", "Train 40 staff on maintenance")
+        assert not document.blocks[5].ordered
+        assert document.blocks[6].ordered
+
+    def test_sections_title_and_summary(self):
+        document = parse_markdown(CONTENT)
+        assert [section.title for section in document.sections] == [
+            None, "Executive Summary", "Objectives"
+        ]
+        assert document.section("objectives").blocks[0].text == "Our goals:"
+        assert document.title() == "Clean Water for Rural Schools"
+        assert document.executive_summary() == "We will drill ten wells. Across three districts."
+        assert document.has_section("closing")
+        assert not document.has_section("budget")
+
+    def test_cached_per_text_and_version(self):
+        assert parse_markdown(CONTENT) is parse_markdown(CONTENT)
+        proposal = SimpleNamespace(id="p1", version=1, content=CONTENT)
+        first = document_for(proposal)
+        proposal.content = "# Changed"
+        assert document_for(proposal) is first
+        proposal.version = 2
+        assert document_for(proposal).headings == ["Changed"]
@@ -0,0 +1,57 @@
+import io
+
+import pytest
+from docx import Document
+
+import utils.docx_template as docx_template
+from prompts.donor_templates import DonorTemplates
+from utils.docx_template import LIST_BULLET, get_template, template_key
+
+
+@pytest.fixture
+def template_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(docx_template, "DOCX_TEMPLATE_DIR", str(tmp_path))
+    get_template.cache_clear()
+    yield tmp_path
+    get_template.cache_clear()
+
+
+def render(writer) -> Document:
+    stream = io.BytesIO()
+    writer.save(stream)
+    return Document(io.BytesIO(stream.getvalue()))
+
+
+class TestDocxTemplate:
+    """Test cases for template-based DOCX writing."""
+
+    def test_template_key(self):
+        usaid = DonorTemplates().get_template("USAID")
+        assert template_key(usaid) == "usaid"
+        assert template_key("custom_brief") == "custom_brief"
+        assert template_key(None) == "default"
+        assert template_key("unknown guideline text") == "default"
+
+    def test_styled_paragraphs(self, template_dir):
+        writer = get_template("default").new_document()
+        writer.heading("Title", 0)
+        writer.heading("Deep", 5)
+        writer.paragraph("one\ntwo")
+        writer.paragraph("item", LIST_BULLET)
+
+        paragraphs = render(writer).paragraphs
+        assert [p.style.name for p in paragraphs] == ["Title", "Heading 3", "Normal", "List Bullet"]
+        assert paragraphs[0].alignment == 1
+        assert paragraphs[2].text == "one\ntwo"
+
+    def test_donor_template_keeps_branding(self, template_dir):
+        branded = Document()
+        branded.add_paragraph("USAID letterhead")
+        branded.save(str(template_dir / "usaid.docx"))
+
+        writer = get_template("usaid").new_document()
+        writer.paragraph("Body")
+        assert [p.text for p in render(writer).paragraphs] == ["USAID letterhead", "Body"]
+        # Unknown names fall back to the built-in document, loaded once
+        assert get_template("world_bank") is get_template("world_bank")
+        assert not get_template("world_bank").new_document().document.paragraphs
@@ -0,0 +1,107 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from utils.embeddings import (
+    TfidfSvdEngine,
+    VectorIndex,
+    SemanticIndex,
+    build_vector_index,
+    tokenize,
+)
+
+
+CORPUS = [
+    "girls education and school enrolment for adolescent girls",
+    "female schooling and school enrolment in rural districts",
+    "girls education scholarships and female schooling support",
+    "clean water boreholes and sanitation for villages",
+    "water sanitation hygiene programmes in rural villages",
+    "solar energy microgrids for rural health clinics",
+]
+
+
+class TestTfidfSvdEngine:
+    """Test cases for the TF-IDF/SVD embedding baseline."""
+
+    @pytest.fixture
+    def engine(self):
+        return TfidfSvdEngine(dimension=4).fit(CORPUS)
+
+    def test_tokenize(self):
+        """Test tokenization drops stopwords and plural suffixes."""
+        assert tokenize("The Girls' schools of Kenya") == ["girl", "school", "kenya"]
+
+    def test_embeddings_are_unit_vectors(self, engine):
+        """Test that embeddings are L2-normalized float32."""
+        vectors = engine.embed(CORPUS)
+        assert vectors.dtype == np.float32
+        assert vectors.shape == (len(CORPUS), engine.dimension)
+        assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0, atol=1e-5)
+
+    def test_cooccurring_terms_are_similar(self, engine):
+        """Test that paraphrases sharing no words still score as similar."""
+        query, related, unrelated = engine.embed(
+            ["girls education", "female schooling", "sanitation"]
+        )
+        assert query @ related > query @ unrelated
+
+
+class TestVectorIndex:
+    """Test cases for the memory-mapped vector index."""
+
+    def test_search_returns_top_k(self):
+        """Test top-k cosine search ordering."""
+        vectors = np.eye(3, dtype=np.float32)
+        index = VectorIndex([10, 20, 30], vectors)
+        results = index.search(np.array([0.1, 0.9, 0.0], dtype=np.float32), k=2)
+        assert [key for key, _ in results] == [20, 10]
+
+    def test_save_and_load_round_trip(self, tmp_path):
+        """Test that a saved semantic index maps back the same vectors."""
+        engine = TfidfSvdEngine(dimension=4).fit(CORPUS)
+        opportunities = build_vector_index(
+            engine, None, [1, 2], set(), {1: CORPUS[0], 2: CORPUS[3]}
+        )
+        profiles = VectorIndex([], np.zeros((0, engine.dimension), dtype=np.float32))
+        SemanticIndex(engine, opportunities, profiles).save(str(tmp_path))
+
+        loaded = SemanticIndex.load(str(tmp_path))
+        assert loaded.opportunities.ids == [1, 2]
+        assert np.allclose(loaded.opportunities.get(2), opportunities.get(2))
+        assert len(loaded.profiles) == 0
+
+    def test_build_reuses_unchanged_vectors(self):
+        """Test that only changed ids are re-embedded."""
+        engine = TfidfSvdEngine(dimension=4).fit(CORPUS)
+        previous = VectorIndex([1], np.full((1, engine.dimension), 0.5, dtype=np.float32))
+        index = build_vector_index(engine, previous, [1, 2], set(), {2: CORPUS[3]})
+        assert np.allclose(index.get(1), 0.5)
+        assert not np.allclose(index.get(2), 0.5)
+
+
+class TestSemanticRefresh:
+    """Test cases for reusing the semantic index between matrix refreshes."""
+
+    @pytest.mark.asyncio
+    async def test_unchanged_rows_reuse_index_without_saving(self, monkeypatch):
+        import services.alignment_service as alignment_service_module
+
+        engine = TfidfSvdEngine(dimension=4).fit(CORPUS)
+        previous = SemanticIndex(
+            engine,
+            build_vector_index(engine, None, [1, 2], set(), {1: CORPUS[0], 2: CORPUS[3]}),
+            build_vector_index(engine, None, ["p1"], set(), {"p1": CORPUS[1]}),
+        )
+        monkeypatch.setattr(alignment_service_module, "get_semantic_index", lambda: previous)
+        monkeypatch.setattr(
+            SemanticIndex, "save", lambda self, directory: pytest.fail("index was rewritten")
+        )
+
+        service = alignment_service_module.AlignmentService(db_session=None)
+        service.semantic_enabled = True
+        profile_vectors, opportunity_vectors = await service._semantic_vectors(
+            [{"id": "p1"}], [{"id": 1}, {"id": 2}], set(), set(), refit=False
+        )
+        assert profile_vectors is previous.profiles.vectors
+        assert opportunity_vectors is previous.opportunities.vectors
@@ -0,0 +1,129 @@
+import uuid
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from db import get_db_session
+from routes import proposal_routes, usage_routes
+from utils.auth import get_current_user_id
+from utils.etag import make_etag, etag_matches
+
+PROPOSAL_ID = uuid.UUID("4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11")
+UPDATED_AT = datetime(2026, 10, 2, 10, 30)
+
+
+class TestEtagHelpers:
+    """Test cases for ETag construction and matching."""
+
+    def test_etag_is_strong_and_stable(self):
+        etag = make_etag("proposal", PROPOSAL_ID, 3, UPDATED_AT)
+        assert etag.startswith('"') and etag.endswith('"')
+        assert etag == make_etag("proposal", PROPOSAL_ID, 3, UPDATED_AT)
+
+    def test_etag_changes_with_version_key(self):
+        base = make_etag("proposal", PROPOSAL_ID, 3, UPDATED_AT)
+        assert base != make_etag("proposal", PROPOSAL_ID, 4, UPDATED_AT)
+        assert base != make_etag("proposal", PROPOSAL_ID, 3, datetime(2026, 10, 3))
+        assert base != make_etag("profile", PROPOSAL_ID, 3, UPDATED_AT)
+
+    def test_if_none_match_comparison(self):
+        etag = make_etag("usage", "user-1", UPDATED_AT)
+        assert etag_matches(etag, etag)
+        assert etag_matches(f'"other", W/{etag}', etag)
+        assert etag_matches("*", etag)
+        assert not etag_matches('"other"', etag)
+        assert not etag_matches(None, etag)
+
+
+class TestProposalConditionalGet:
+    """Test cases for If-None-Match on GET /api/proposals/{id}."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(proposal_routes.router, prefix="/api/proposals")
+        app.dependency_overrides[get_db_session] = lambda: None
+        app.dependency_overrides[get_current_user_id] = lambda: "user-123"
+        return TestClient(app)
+
+    @pytest.fixture
+    def proposal(self):
+        return SimpleNamespace(
+            id=PROPOSAL_ID,
+            user_id="user-123",
+            funding_opportunity_id=42,
+            title="Clean water",
+            content="## Summary\n\nText",
+            executive_summary=None,
+            status="draft",
+            version=3,
+            confidence_score=None,
+            alignment_score=None,
+            completeness_score=None,
+            user_rating=None,
+            created_at=UPDATED_AT,
+            updated_at=UPDATED_AT,
+        )
+
+    @patch("routes.proposal_routes.ProposalService")
+    def test_matching_etag_returns_304_without_loading_body(self, service_cls, client, proposal):
+        service = service_cls.return_value
+        service.get_proposal_by_id = AsyncMock(return_value=proposal)
+        service.get_proposal_version_key = AsyncMock(
+            return_value=(PROPOSAL_ID, 3, UPDATED_AT)
+        )
+
+        first = client.get(f"/api/proposals/{PROPOSAL_ID}")
+        assert first.status_code == 200
+        etag = first.headers["etag"]
+
+        second = client.get(
+            f"/api/proposals/{PROPOSAL_ID}", headers={"If-None-Match": etag}
+        )
+        assert second.status_code == 304
+        assert second.headers["etag"] == etag
+        assert second.content == b""
+        service.get_proposal_by_id.assert_awaited_once()
+
+    @patch("routes.proposal_routes.ProposalService")
+    def test_stale_etag_returns_full_body(self, service_cls, client, proposal):
+        service = service_cls.return_value
+        service.get_proposal_by_id = AsyncMock(return_value=proposal)
+        service.get_proposal_version_key = AsyncMock(
+            return_value=(PROPOSAL_ID, 3, UPDATED_AT)
+        )
+
+        response = client.get(
+            f"/api/proposals/{PROPOSAL_ID}", headers={"If-None-Match": '"stale"'}
+        )
+        assert response.status_code == 200
+        assert response.json()["version"] == 3
+        assert response.headers["etag"] == make_etag("proposal", PROPOSAL_ID, 3, UPDATED_AT)
+
+
+class TestUsageSummaryConditionalGet:
+    """Test cases for the ETag on GET /api/usage/summary."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(usage_routes.router, prefix="/api/usage")
+        app.dependency_overrides[get_db_session] = lambda: None
+        app.dependency_overrides[get_current_user_id] = lambda: "user-123"
+        return TestClient(app)
+
+    @patch("routes.usage_routes.UsageService")
+    def test_fallback_summary_has_no_etag(self, service_cls, client):
+        service = service_cls.return_value
+        service.get_usage_version = AsyncMock(return_value=UPDATED_AT)
+        service.get_usage_summary = AsyncMock(side_effect=RuntimeError("db down"))
+
+        response = client.get("/api/usage/summary")
+        assert response.status_code == 200
+        assert response.json()["plan"] == "free"
+        assert "etag" not in response.headers
+        assert response.headers["cache-control"] == "no-store"
@@ -0,0 +1,151 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi import FastAPI, Header
+from fastapi.testclient import TestClient
+from typing import Optional
+
+from services.export_cache import ExportCache, export_cache_key
+from utils.file_responses import RangeFileResponse, RangeNotSatisfiable, parse_range
+
+BODY = bytes(range(256)) * 40  # 10 KiB
+
+
+def make_proposal(**overrides):
+    values = dict(
+        id="4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11",
+        version=3,
+        title="Clean water",
+        executive_summary="Summary",
+        status="draft",
+        confidence_score=0.8,
+        user_rating=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+class TestExportCacheKey:
+    """Test cases for export cache keys."""
+
+    def test_key_changes_with_version_format_and_metadata(self):
+        base = export_cache_key(make_proposal(), "pdf")
+        assert base == export_cache_key(make_proposal(), "pdf")
+        assert base != export_cache_key(make_proposal(), "docx")
+        assert base != export_cache_key(make_proposal(version=4), "pdf")
+        assert base != export_cache_key(make_proposal(user_rating=5), "pdf")
+        assert base != export_cache_key(make_proposal(status="finalized"), "pdf")
+
+
+class TestExportCache:
+    """Test cases for the on-disk LRU export cache."""
+
+    def test_store_then_open(self, tmp_path):
+        cache = ExportCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        assert cache.open("abc", "pdf") is None
+
+        with cache.store("abc", "pdf", BODY) as stored:
+            assert stored.read() == BODY
+        with cache.open("abc", "pdf") as cached:
+            assert cached.read() == BODY
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+        assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
+
+    def test_commit_rendered_temp_file(self, tmp_path):
+        cache = ExportCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        temp_path = cache.new_temp_path()
+        with open(temp_path, "wb") as tmp:
+            tmp.write(BODY)
+
+        with cache.commit("abc", "docx", temp_path) as committed:
+            assert committed.read() == BODY
+        assert os.listdir(tmp_path) == ["abc.docx"]
+
+    def test_commit_without_cache_unlinks_temp_file(self, tmp_path):
+        cache = ExportCache(directory=str(tmp_path), max_bytes=1024 * 1024)
+        cache.enabled = False
+        temp_path = cache.new_temp_path()
+        with open(temp_path, "wb") as tmp:
+            tmp.write(BODY)
+
+        with cache.commit("abc", "docx", temp_path) as committed:
+            assert not os.path.exists(temp_path)
+            assert committed.read() == BODY
+        assert os.listdir(tmp_path) == []
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache = ExportCache(directory=str(tmp_path), max_bytes=len(BODY) * 2)
+        for key in ("a", "b"):
+            cache.store(key, "pdf", BODY).close()
+        # Make "a" the oldest, then touch it so "b" becomes least recently used
+        old = time.time() - 60
+        os.utime(tmp_path / "a.pdf", (old, old))
+        os.utime(tmp_path / "b.pdf", (old + 1, old + 1))
+        cache.open("a", "pdf").close()
+
+        cache.store("c", "pdf", BODY).close()
+        assert sorted(os.listdir(tmp_path)) == ["a.pdf", "c.pdf"]
+        assert cache.stats()["evictions"] == 1
+
+
+class TestRangeFileResponse:
+    """Test cases for range-capable file responses."""
+
+    def test_parse_range(self):
+        assert parse_range(None, 100) is None
+        assert parse_range("bytes=0-9", 100) == (0, 9)
+        assert parse_range("bytes=90-", 100) == (90, 99)
+        assert parse_range("bytes=-10", 100) == (90, 99)
+        assert parse_range("bytes=50-500", 100) == (50, 99)
+        assert parse_range("bytes=0-1,5-6", 100) is None
+        with pytest.raises(RangeNotSatisfiable):
+            parse_range("bytes=100-", 100)
+
+    @pytest.fixture
+    def client(self, tmp_path):
+        path = tmp_path / "export.pdf"
+        path.write_bytes(BODY)
+        app = FastAPI()
+
+        @app.get("/file")
+        async def file(
+            range_header: Optional[str] = Header(None, alias="Range"),
+            if_range: Optional[str] = Header(None),
+        ):
+            return RangeFileResponse(
+                open(path, "rb"),
+                media_type="application/pdf",
+                filename="export.pdf",
+                range_header=range_header,
+                if_range=if_range,
+                etag='"v1"',
+            )
+
+        return TestClient(app)
+
+    def test_full_file(self, client):
+        response = client.get("/file")
+        assert response.status_code == 200
+        assert response.content == BODY
+        assert response.headers["content-length"] == str(len(BODY))
+        assert response.headers["accept-ranges"] == "bytes"
+        assert response.headers["content-disposition"] == 'attachment; filename="export.pdf"'
+
+    def test_partial_content(self, client):
+        response = client.get("/file", headers={"Range": "bytes=100-199"})
+        assert response.status_code == 206
+        assert response.content == BODY[100:200]
+        assert response.headers["content-range"] == f"bytes 100-199/{len(BODY)}"
+
+    def test_unsatisfiable_range(self, client):
+        response = client.get("/file", headers={"Range": f"bytes={len(BODY)}-"})
+        assert response.status_code == 416
+        assert response.headers["content-range"] == f"bytes */{len(BODY)}"
+
+    def test_if_range_mismatch_sends_full_file(self, client):
+        response = client.get("/file", headers={"Range": "bytes=0-9", "If-Range": '"v0"'})
+        assert response.status_code == 200
+        assert response.content == BODY
@@ -0,0 +1,63 @@
+import asyncio
+
+import pytest
+
+from services.export_executor import ExportExecutor, ExportQueueFull, ExportTimeout
+from utils.export_utils import ProposalSnapshot
+
+
+def make_snapshot(paragraphs: int = 5) -> ProposalSnapshot:
+    return ProposalSnapshot(
+        id="4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11",
+        title="Clean water for rural schools",
+        content="\n\n".join(
+            f"## Section {n}\n\n" + "Safe water improves attendance. " * 40
+            for n in range(paragraphs)
+        ),
+        executive_summary="Summary",
+        status="draft",
+        version=2,
+        confidence_score=0.8,
+        user_rating=None,
+    )
+
+
+class TestExportExecutor:
+    """Test cases for the export rendering process pool."""
+
+    @pytest.fixture
+    def executor(self):
+        executor = ExportExecutor(max_workers=1, max_pending=2, timeout=30)
+        yield executor
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_renders_in_worker_process(self, executor, tmp_path):
+        path = tmp_path / "export.docx"
+        filename = await executor.render("docx", make_snapshot(), str(path))
+        assert path.read_bytes().startswith(b"PK")
+        assert filename == "Clean water for rural schools_proposal.docx"
+        await asyncio.sleep(0.05)
+        assert executor.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self, executor, tmp_path):
+        executor.pending = executor.max_pending
+        with pytest.raises(ExportQueueFull):
+            await executor.render("pdf", make_snapshot(), str(tmp_path / "export.pdf"))
+        assert executor.stats()["rejected"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_keeps_slot_until_render_finishes(self, executor, tmp_path):
+        await executor.start()
+        executor.timeout = 0.001
+        path = tmp_path / "export.docx"
+        with pytest.raises(ExportTimeout):
+            await executor.render("docx", make_snapshot(200), str(path))
+        for _ in range(200):
+            if executor.pending == 0:
+                break
+            await asyncio.sleep(0.05)
+        assert executor.pending == 0
+        assert executor.stats()["timeouts"] == 1
+        assert not path.exists()
@@ -0,0 +1,33 @@
+from datetime import date, datetime
+
+from services.ledger_partitions import (
+    add_months,
+    create_partition_sql,
+    month_start,
+    months_between,
+    partition_month,
+    partition_name,
+)
+
+
+class TestLedgerPartitions:
+    """Test cases for usage_ledger partition naming and bounds."""
+
+    def test_month_arithmetic(self):
+        assert add_months(date(2026, 11, 1), 3) == date(2027, 2, 1)
+        assert add_months(date(2026, 1, 1), -1) == date(2025, 12, 1)
+        assert month_start(datetime(2026, 10, 19, 23, 59)) == date(2026, 10, 1)
+        assert months_between(date(2026, 11, 1), date(2027, 1, 1)) == [
+            date(2026, 11, 1), date(2026, 12, 1), date(2027, 1, 1)
+        ]
+
+    def test_partition_names_round_trip(self):
+        name = partition_name(date(2026, 12, 1))
+        assert name == "usage_ledger_y2026m12"
+        assert partition_month(name) == date(2026, 12, 1)
+        assert partition_month("usage_ledger_unpartitioned") is None
+
+    def test_create_partition_bounds(self):
+        sql = create_partition_sql(date(2026, 12, 1))
+        assert "usage_ledger_y2026m12 PARTITION OF usage_ledger" in sql
+        assert "FROM ('2026-12-01') TO ('2027-01-01')" in sql
@@ -0,0 +1,139 @@
+import pytest
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+from models.funding_opportunities import FundingOpportunity
+from services.opportunity_cache import OpportunityCache
+
+
+def make_opportunity(opportunity_id, updated_at, title="Education Grant"):
+    return FundingOpportunity(
+        id=opportunity_id,
+        title=title,
+        donor_organization="USAID",
+        focus_areas=["Education"],
+        is_active=True,
+        is_archived=False,
+        created_at=updated_at,
+        updated_at=updated_at,
+    )
+
+
+def make_session(*results):
+    """Session whose execute() returns the given results in order"""
+    session = MagicMock()
+    session.execute = AsyncMock(side_effect=list(results))
+    return session
+
+
+def scalar_result(value):
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = value
+    result.scalar.return_value = value
+    return result
+
+
+def rows_result(rows):
+    result = MagicMock()
+    result.all.return_value = rows
+    return result
+
+
+def scalars_result(values):
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = values
+    return result
+
+
+class TestOpportunityCache:
+    """Test cases for the funding opportunity read-through cache."""
+
+    @pytest.mark.asyncio
+    async def test_miss_then_hit(self):
+        now = datetime(2026, 1, 1)
+        session = make_session(scalar_result(make_opportunity(1, now)))
+        cache = OpportunityCache(max_size=10)
+
+        first = await cache.get(session, 1)
+        second = await cache.get(session, 1)
+
+        assert first is second
+        assert session.execute.await_count == 1
+        assert cache.hits == 1 and cache.misses == 1
+        assert first.snapshot["title"] == "Education Grant"
+        assert "Education Grant" in first.prompt_fragment
+        session.expunge.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_missing_opportunity_not_cached(self):
+        session = make_session(scalar_result(None), scalar_result(None))
+        cache = OpportunityCache(max_size=10)
+
+        assert await cache.get(session, 1) is None
+        assert await cache.get(session, 1) is None
+        assert len(cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_bounded_size_evicts_least_recently_used(self):
+        now = datetime(2026, 1, 1)
+        session = make_session(
+            *[scalar_result(make_opportunity(i, now)) for i in range(3)]
+        )
+        cache = OpportunityCache(max_size=2)
+
+        await cache.get(session, 0)
+        await cache.get(session, 1)
+        await cache.get(session, 0)
+        await cache.get(session, 2)
+
+        assert len(cache) == 2
+        assert 1 not in cache._entries
+        assert 0 in cache._entries and 2 in cache._entries
+
+    @pytest.mark.asyncio
+    async def test_delta_poll_reloads_changed_and_evicts_inactive(self):
+        now = datetime(2026, 1, 1)
+        later = now + timedelta(minutes=5)
+        cache = OpportunityCache(max_size=10, poll_overlap_seconds=0)
+        await cache.get(make_session(scalar_result(make_opportunity(1, now))), 1)
+        await cache.get(make_session(scalar_result(make_opportunity(2, now))), 2)
+
+        # First poll only records the watermark
+        await cache.refresh(make_session(scalar_result(now)))
+        assert cache.watermark == now
+
+        changed = [
+            SimpleNamespace(id=1, updated_at=later, is_active=True, is_archived=False),
+            SimpleNamespace(id=2, updated_at=later, is_active=True, is_archived=True),
+            SimpleNamespace(id=3, updated_at=later, is_active=True, is_archived=False),
+        ]
+        session = make_session(
+            rows_result(changed),
+            scalars_result([make_opportunity(1, later, title="Renamed Grant")]),
+        )
+        stats = await cache.refresh(session)
+
+        assert stats == {"changed": 3, "reloaded": 1, "evicted": 1}
+        assert cache.watermark == later
+        assert 2 not in cache._entries
+        assert 3 not in cache._entries
+        assert cache._entries[1].snapshot["title"] == "Renamed Grant"
+        assert "Renamed Grant" in cache._entries[1].prompt_fragment
+
+    @pytest.mark.asyncio
+    async def test_poll_on_empty_table_leaves_watermark_unset(self):
+        later = datetime(2026, 1, 1)
+        cache = OpportunityCache(max_size=10)
+
+        await cache.refresh(make_session(scalar_result(None)))
+        assert cache.watermark is None
+
+        # Next poll reads every row instead of filtering on a watermark
+        changed = [SimpleNamespace(id=1, updated_at=later, is_active=True, is_archived=False)]
+        session = make_session(rows_result(changed))
+        stats = await cache.refresh(session)
+
+        assert stats == {"changed": 1, "reloaded": 0, "evicted": 0}
+        assert cache.watermark == later
+        assert "WHERE" not in str(session.execute.await_args.args[0])
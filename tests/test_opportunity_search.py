@@ -0,0 +1,203 @@
+"""
+Query-plan tests for opportunity search.
+
+These run EXPLAIN against a real Postgres database given by
+TEST_DATABASE_URL (postgresql+asyncpg://...) and are skipped without one.
+Tables are created in a throwaway schema.
+"""
+
+import asyncio
+import os
+import random
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.pool import NullPool
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from models.funding_opportunities import FundingOpportunity
+from services.opportunity_service import build_search_query
+
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL")
+SCHEMA = "opportunity_search_test"
+
+pytestmark = pytest.mark.skipif(
+    not TEST_DATABASE_URL, reason="TEST_DATABASE_URL not set"
+)
+
+
+class Explain(Executable, ClauseElement):
+    """EXPLAIN wrapper that keeps the statement's bind parameters"""
+
+    inherit_cache = False
+
+    def __init__(self, statement):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element, compiler, **kw):
+    return "EXPLAIN " + compiler.process(element.statement, **kw)
+
+
+def make_engine():
+    return create_async_engine(
+        TEST_DATABASE_URL,
+        poolclass=NullPool,
+        connect_args={"server_settings": {"search_path": SCHEMA}},
+    )
+
+
+async def _setup() -> bool:
+    """Create and populate the schema; returns whether pg_trgm is available"""
+    engine = make_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+            await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+
+        has_trigram = True
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        except Exception:
+            has_trigram = False
+
+        table = FundingOpportunity.__table__
+        async with engine.begin() as conn:
+            await conn.execute(CreateTable(table))
+
+            # Vocabularies are wide enough that each filter value is selective
+            rng = random.Random(7)
+            areas = ["Water", "Health", "Education"] + [f"area{n}" for n in range(60)]
+            countries = ["Kenya", "Nepal", "Peru"] + [f"country{n}" for n in range(120)]
+            words = ["clinics", "schools"] + [f"word{n}" for n in range(2000)]
+            now = datetime(2026, 1, 1)
+            rows = []
+            for i in range(3000):
+                rows.append(
+                    {
+                        "id": i + 1,
+                        "title": f"{rng.choice(areas)} {rng.choice(words)} grant {i}",
+                        "description": " ".join(rng.choice(words) for _ in range(30)),
+                        "donor_organization": "Donor",
+                        "currency": rng.choice(["USD", "EUR", "GBP"]),
+                        "amount_min": 10000.0 * rng.randint(1, 10),
+                        "amount_max": 100000.0 * rng.randint(1, 10),
+                        "focus_areas": rng.sample(areas, 2),
+                        "geographic_focus": rng.sample(countries, 2),
+                        "keywords": rng.sample(words, 2),
+                        "application_deadline": now + timedelta(hours=i * 3),
+                        "created_at": now,
+                        "updated_at": now,
+                        "is_active": i % 10 != 0,
+                        "is_archived": False,
+                    }
+                )
+            rows.append(
+                dict(
+                    rows[0],
+                    id=5000,
+                    title="Menstrual hygiene innovation fund",
+                    keywords=["sanitation"],
+                    is_active=True,
+                )
+            )
+            await conn.execute(table.insert(), rows)
+
+            # Indexes are built after loading, as for a bulk-loaded mirror
+            for index in table.indexes:
+                await conn.run_sync(index.create)
+            # Migration-only index (see b7d2f4a8c1e3)
+            if has_trigram:
+                await conn.execute(text(
+                    "CREATE INDEX ix_funding_opportunities_title_trgm "
+                    "ON funding_opportunities USING gin (title gin_trgm_ops)"
+                ))
+            await conn.execute(text(f"ANALYZE {table.name}"))
+        return has_trigram
+    finally:
+        await engine.dispose()
+
+
+async def _teardown():
+    engine = make_engine()
+    try:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE"))
+    finally:
+        await engine.dispose()
+
+
+async def _explain(query) -> str:
+    engine = make_engine()
+    try:
+        async with engine.begin() as conn:
+            # Small tables would otherwise make a sequential scan cheapest
+            await conn.execute(text("SET LOCAL enable_seqscan = off"))
+            result = await conn.execute(Explain(query))
+            return "\n".join(row[0] for row in result)
+    finally:
+        await engine.dispose()
+
+
+async def _search(query):
+    engine = make_engine()
+    try:
+        async with AsyncSession(engine) as session:
+            return (await session.execute(query)).all()
+    finally:
+        await engine.dispose()
+
+
+@pytest.fixture(scope="module")
+def has_trigram():
+    try:
+        available = asyncio.run(_setup())
+    except OSError as e:
+        pytest.skip(f"Test database unavailable: {e}")
+    yield available
+    asyncio.run(_teardown())
+
+
+class TestOpportunitySearchPlans:
+    """EXPLAIN-based checks that search predicates are index-backed."""
+
+    def test_full_text_uses_search_vector_index(self, has_trigram):
+        plan = asyncio.run(_explain(build_search_query(q="clinics", trigram=False)))
+        assert "ix_funding_opportunities_search_vector" in plan
+
+    def test_trigram_title_uses_trigram_index(self, has_trigram):
+        if not has_trigram:
+            pytest.skip("pg_trgm extension unavailable")
+        plan = asyncio.run(_explain(build_search_query(q="helth clinic", trigram=True)))
+        assert "ix_funding_opportunities_title_trgm" in plan
+        assert "ix_funding_opportunities_search_vector" in plan
+
+    def test_focus_area_filter_uses_jsonb_index(self, has_trigram):
+        plan = asyncio.run(_explain(build_search_query(focus_areas=["Water"])))
+        assert "ix_funding_opportunities_focus_areas" in plan
+
+    def test_geography_filter_uses_jsonb_index(self, has_trigram):
+        plan = asyncio.run(_explain(build_search_query(geography=["Nepal", "Peru"])))
+        assert "ix_funding_opportunities_geographic_focus" in plan
+
+    def test_deadline_filter_uses_partial_index(self, has_trigram):
+        plan = asyncio.run(
+            _explain(
+                build_search_query(
+                    deadline_from=datetime(2026, 3, 1),
+                    deadline_to=datetime(2026, 3, 3),
+                )
+            )
+        )
+        assert "ix_funding_opportunities_open_deadline" in plan
+
+    def test_keyword_match_ranks_result(self, has_trigram):
+        rows = asyncio.run(_search(build_search_query(q="sanitation", trigram=False)))
+        assert [row[0].id for row in rows] == [5000]
+        assert rows[0][1] > 0
@@ -0,0 +1,53 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from sqlalchemy.dialects.postgresql.asyncpg import PGDialect_asyncpg
+
+import services.opportunity_service as opportunity_service_module
+from services.opportunity_service import build_search_query, trigram_search_available
+
+
+def compiled(query) -> str:
+    # asyncpg uses $n placeholders, so any % left is the trigram operator
+    return str(query.compile(dialect=PGDialect_asyncpg()))
+
+
+def extension_session(installed):
+    result = MagicMock()
+    result.scalar.return_value = 1 if installed else None
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=result)
+    return session
+
+
+class TestTrigramSearch:
+    """Test cases for switching trigram title matching on pg_trgm availability."""
+
+    def test_query_without_trigram_has_no_pg_trgm_operators(self):
+        sql = compiled(build_search_query(q="helth clinic", trigram=False))
+        assert "similarity" not in sql
+        assert "%" not in sql
+        assert "websearch_to_tsquery" in sql
+
+    def test_query_with_trigram_matches_title(self):
+        sql = compiled(build_search_query(q="helth clinic", trigram=True))
+        assert "similarity(funding_opportunities.title" in sql
+        assert "funding_opportunities.title % " in sql
+
+    @pytest.mark.asyncio
+    async def test_availability_is_checked_once(self, monkeypatch):
+        monkeypatch.setattr(opportunity_service_module, "_trigram_available", None)
+        session = extension_session(installed=False)
+
+        assert await trigram_search_available(session) is False
+        assert await trigram_search_available(session) is False
+        assert session.execute.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_env_var_only_turns_it_off(self, monkeypatch):
+        monkeypatch.setattr(opportunity_service_module, "_trigram_available", None)
+        monkeypatch.setattr(opportunity_service_module, "TRIGRAM_SEARCH_ENABLED", False)
+        session = extension_session(installed=True)
+
+        assert await trigram_search_available(session) is False
+        session.execute.assert_not_awaited()
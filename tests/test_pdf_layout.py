@@ -0,0 +1,53 @@
+import os
+
+import pytest
+from fpdf import FPDF
+
+import utils.pdf_layout as pdf_layout
+from utils.pdf_layout import TextLayout
+
+DEJAVU = "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"
+
+
+def make_layout(width=None) -> TextLayout:
+    pdf = FPDF()
+    layout = TextLayout(pdf, width=width)
+    pdf.add_page()
+    layout.set_font("", 11)
+    return layout
+
+
+class TestTextLayout:
+    """Test cases for PDF text wrapping."""
+
+    def test_lines_fit_width_and_keep_words(self):
+        layout = make_layout(width=60)
+        text = "Safe water improves school attendance for girls in rural districts " * 5
+        lines = layout.wrap(text)
+        assert len(lines) > 1
+        assert " ".join(lines).split() == text.split()
+        for line in lines:
+            assert layout.pdf.get_string_width(line) <= 60 + 1e-6
+
+    def test_overlong_word_is_hard_broken(self):
+        layout = make_layout(width=30)
+        url = "https://example.org/" + "a" * 80
+        lines = layout.wrap(f"See {url} now")
+        assert lines[0] == "See"
+        assert url in "".join(lines)
+        assert all(layout.pdf.get_string_width(line) <= 30 + 1e-6 for line in lines)
+
+    def test_latin1_fallback_for_core_fonts(self):
+        layout = make_layout()
+        assert layout.clean("“Résumé” — 日本") == '"Résumé" - ??'
+        layout.write_text("“Résumé” — 日本\n\nnext", 6)
+        assert layout.pdf.y > layout.pdf.t_margin
+
+    @pytest.mark.skipif(not os.path.exists(DEJAVU), reason="DejaVu font not installed")
+    def test_unicode_font(self, monkeypatch):
+        monkeypatch.setattr(pdf_layout, "PDF_FONT_PATH", DEJAVU)
+        layout = make_layout()
+        assert layout.unicode
+        assert layout.clean("Ελληνικά 日本") == "Ελληνικά ??"
+        layout.write_text("Ελληνικά — ünïcödé", 6)
+        assert bytes(layout.pdf.output()).startswith(b"%PDF")
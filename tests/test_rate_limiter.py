@@ -0,0 +1,52 @@
+import pytest
+
+from services.rate_limiter import MemoryBackend, RateLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    return RateLimiter(MemoryBackend(clock=clock), window_seconds=60)
+
+
+class TestRateLimiter:
+    """Test cases for the sliding-window rate limiter."""
+
+    @pytest.mark.asyncio
+    async def test_window_slides_instead_of_resetting(self, limiter, clock):
+        await limiter.add("u1", "export", 2)
+        clock.now += 40
+        await limiter.add("u1", "export")
+
+        assert not await limiter.allow("u1", "export", 3)
+        assert await limiter.allow("u1", "export", 4)
+        # Another user and another action have their own windows
+        assert await limiter.allow("u2", "export", 1)
+        assert await limiter.allow("u1", "generate", 1)
+
+        clock.now += 21  # the first two have left the window
+        assert await limiter.usage("u1", "export") == 1
+        assert await limiter.allow("u1", "export", 3, count=2)
+        assert not await limiter.allow("u1", "export", 3, count=3)
+
+    @pytest.mark.asyncio
+    async def test_idle_keys_are_dropped(self, limiter, clock):
+        for n in range(5):
+            await limiter.add(f"user-{n}", "generate")
+        assert limiter.stats()["keys"] == 5
+
+        clock.now += 61
+        assert limiter.backend.sweep(limiter.window) == 0
+        assert limiter.stats()["backend"] == "memory"
@@ -0,0 +1,68 @@
+import uuid
+from datetime import datetime
+
+import orjson
+
+from models.proposals import Proposal
+from routes.proposal_routes import (
+    PROPOSAL_RESPONSE_FIELDS,
+    PROPOSAL_SUMMARY_FIELDS,
+    ProposalResponse,
+    ProposalSummary,
+)
+from utils.serialization import dump_row, dump_rows, json_response
+
+
+def make_proposal(**overrides) -> Proposal:
+    values = dict(
+        id=uuid.uuid4(),
+        user_id="user-123",
+        ngo_profile_id=uuid.uuid4(),
+        funding_opportunity_id=42,
+        title="Clean water for rural schools",
+        content="## Need\n\n" + "Access to safe water remains limited. " * 50,
+        executive_summary="Summary",
+        status="draft",
+        version=2,
+        confidence_score=0.8,
+        alignment_score=None,
+        completeness_score=0.9,
+        user_rating=4,
+        created_at=datetime(2026, 10, 1, 9, 0, 0, 123456),
+        updated_at=datetime(2026, 10, 2, 10, 30),
+    )
+    values.update(overrides)
+    return Proposal(**values)
+
+
+class TestRowSerialization:
+    """Test cases for the direct ORM row to JSON path."""
+
+    def test_proposal_matches_pydantic_output(self):
+        proposal = make_proposal()
+        legacy = ProposalResponse(**proposal.to_dict()).model_dump()
+        assert orjson.loads(dump_row(proposal, PROPOSAL_RESPONSE_FIELDS)) == legacy
+
+    def test_summary_list_matches_pydantic_output(self):
+        proposals = [make_proposal(), make_proposal(confidence_score=None)]
+        legacy = [
+            ProposalSummary(**proposal.to_summary_dict()).model_dump()
+            for proposal in proposals
+        ]
+        assert orjson.loads(dump_rows(proposals, PROPOSAL_SUMMARY_FIELDS)) == legacy
+
+    def test_json_response_accepts_bytes_and_values(self):
+        response = json_response(b'{"a":1}', status_code=201, headers={"X-Next-Cursor": "abc"})
+        assert response.status_code == 201
+        assert response.body == b'{"a":1}'
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["x-next-cursor"] == "abc"
+        assert json_response({"a": 1}).body == b'{"a":1}'
+
+    def test_uuid_subclasses_are_encoded(self):
+        class DriverUUID(uuid.UUID):
+            pass
+
+        proposal_id = DriverUUID("4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11")
+        proposal = make_proposal(id=proposal_id)
+        assert orjson.loads(dump_row(proposal, ("id",))) == {"id": str(proposal_id)}
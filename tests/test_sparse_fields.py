@@ -0,0 +1,69 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy.dialects import postgresql
+
+from routes.proposal_routes import (
+    PROPOSAL_RESPONSE_FIELDS,
+    PROPOSAL_SUMMARY_FIELDS,
+    parse_fields,
+    version_etag,
+)
+from services.proposal_service import ProposalService
+
+
+def compiled_sql(session: AsyncMock) -> str:
+    query = session.execute.await_args.args[0]
+    return str(query.compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def service():
+    session = AsyncMock()
+    result = MagicMock()
+    result.scalar_one_or_none.return_value = None
+    result.scalars.return_value.all.return_value = []
+    session.execute.return_value = result
+    with patch("services.proposal_service.OpenAIClient"):
+        return ProposalService(session)
+
+
+class TestParseFields:
+    """Test cases for fields= validation."""
+
+    def test_default_when_missing(self):
+        assert parse_fields(None, PROPOSAL_SUMMARY_FIELDS) == PROPOSAL_SUMMARY_FIELDS
+
+    def test_schema_order_and_id_always_included(self):
+        assert parse_fields("content, title", PROPOSAL_RESPONSE_FIELDS) == ("id", "title", "content")
+
+    def test_unknown_field_rejected(self):
+        with pytest.raises(HTTPException) as exc:
+            parse_fields("title,generation_prompt_hash", PROPOSAL_RESPONSE_FIELDS)
+        assert exc.value.status_code == 400
+        assert "generation_prompt_hash" in exc.value.detail
+
+    def test_sparse_representation_has_its_own_etag(self):
+        key = ("4b6f3c2e-8f1a-4d3b-9a57-2f1f3f0d9a11", 3, "2026-10-02T10:30:00")
+        assert version_etag(*key) != version_etag(*key, fields=("id", "title"))
+
+
+class TestSparseProjection:
+    """Test cases for the SQL column projection driven by fields."""
+
+    @pytest.mark.asyncio
+    async def test_proposal_projection_skips_unrequested_columns(self, service):
+        await service.get_proposal_by_id("id", "user-1", fields=("id", "title"))
+        select_list = compiled_sql(service.db_session).split(" FROM ")[0]
+        assert "proposals.title" in select_list
+        assert "proposals.version" in select_list
+        assert "proposals.content" not in select_list
+        assert "proposals.executive_summary" not in select_list
+
+    @pytest.mark.asyncio
+    async def test_list_projection_can_include_content(self, service):
+        await service.get_user_proposals_page("user-1", fields=("id", "content"))
+        select_list = compiled_sql(service.db_session).split(" FROM ")[0]
+        assert "proposals.content" in select_list
+        assert "proposals.title" not in select_list
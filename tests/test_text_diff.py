@@ -0,0 +1,35 @@
+import random
+
+from utils.text_diff import make_delta, apply_delta, delta_size
+
+
+class TestTextDiff:
+    """Test cases for line-based proposal deltas."""
+
+    def test_round_trip_random_edits(self):
+        rng = random.Random(3)
+        lines = [f"Paragraph {i} about community health.\n" for i in range(200)]
+        old = "".join(lines)
+        for step in range(20):
+            index = rng.randrange(len(lines))
+            if step % 3 == 0:
+                del lines[index]
+            elif step % 3 == 1:
+                lines.insert(index, f"Inserted line {step}\n")
+            else:
+                lines[index] = f"Rewritten line {step}\n"
+            new = "".join(lines)
+            assert apply_delta(old, make_delta(old, new)) == new
+            old = new
+
+    def test_delta_is_proportional_to_change(self):
+        old = "".join(f"Line {i}\n" for i in range(1000))
+        new = old.replace("Line 500\n", "Changed line\n")
+        delta = make_delta(old, new)
+        assert delta_size(delta) == len("Changed line\n")
+        assert len(delta) == 4
+
+    def test_handles_missing_trailing_newline_and_empty_text(self):
+        assert apply_delta("", make_delta("", "a\nb")) == "a\nb"
+        assert apply_delta("a\nb", make_delta("a\nb", "a\nc\n")) == "a\nc\n"
+        assert apply_delta("a\n", make_delta("a\n", "")) == ""
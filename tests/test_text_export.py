@@ -0,0 +1,75 @@
+import os
+
+from utils import export_utils
+from utils.document_model import parse_markdown
+from utils.export_utils import ProposalSnapshot, iter_text_export, render_export
+
+CONTENT = """# Water for Schools
+
+Clean water <for> all & everyone.
+
+## Objectives
+
+- Build 12 wells
+- Train 40 caretakers
+
+1. Survey
+2. Drill
+"""
+
+
+def make_snapshot(**overrides) -> ProposalSnapshot:
+    values = dict(
+        id="p-1",
+        title="Water <Access>",
+        content=CONTENT,
+        executive_summary="Safe water\nfor schools",
+        status="draft",
+        version=1,
+        confidence_score=0.82,
+        user_rating=None,
+    )
+    values.update(overrides)
+    return ProposalSnapshot(**values)
+
+
+class TestTextExport:
+    """Test cases for HTML and Markdown exports."""
+
+    def test_markdown_structure(self):
+        text = "".join(iter_text_export("md", make_snapshot()))
+        assert text.startswith("# Water <Access>\n")
+        assert "## Executive Summary\n\nSafe water\nfor schools\n" in text
+        assert "### Water for Schools\n" in text
+        assert "#### Objectives\n\n- Build 12 wells\n- Train 40 caretakers\n" in text
+        assert "1. Survey\n2. Drill\n" in text
+        assert "- Confidence Score: 0.82\n" in text
+
+    def test_html_is_escaped(self):
+        text = "".join(iter_text_export("html", make_snapshot()))
+        assert "<title>Water &lt;Access&gt;</title>" in text
+        assert "<p>Clean water &lt;for&gt; all &amp; everyone.</p>" in text
+        assert "<h4>Objectives</h4>" in text
+        assert "<ol>\n<li>Survey</li>\n<li>Drill</li>\n</ol>" in text
+        assert "Safe water<br>\nfor schools" in text
+        assert text.rstrip().endswith("</html>")
+
+    def test_uses_given_document_without_content(self, monkeypatch):
+        monkeypatch.setattr(export_utils, "TEXT_EXPORT_CHUNK_CHARS", 64)
+        snapshot = make_snapshot(content=None)
+        chunks = list(iter_text_export("md", snapshot, parse_markdown(CONTENT)))
+        assert len(chunks) > 1
+        assert "- Build 12 wells" in "".join(chunks)
+
+    def test_render_export_writes_file(self, tmp_path):
+        path = str(tmp_path / "export.html")
+        filename = render_export("html", make_snapshot(id="p-2"), path)
+        assert filename.endswith(".html")
+        assert os.path.getsize(path) > 0
+
+    def test_output_depends_only_on_cached_fields(self):
+        # A render date would go stale in cached exports
+        for format in ("md", "html"):
+            text = "".join(iter_text_export(format, make_snapshot()))
+            assert "Generated on" not in text
+            assert text == "".join(iter_text_export(format, make_snapshot()))
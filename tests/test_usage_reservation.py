@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+import services.usage_service as usage_service_module
+from services.rate_limiter import MemoryBackend, RateLimiter
+from services.usage_service import UsageLimitExceeded, UsageService
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(usage_service_module, "rate_limiter", RateLimiter(MemoryBackend()))
+    monkeypatch.setattr(usage_service_module, "_pending_quota", {})
+    service = UsageService(db_session=None)
+    service.ledger = []
+
+    async def write_ledger(user_id, action_type, count, plan_name, monthly_limit):
+        service.ledger.append((user_id, action_type, count))
+        return True
+
+    async def usage_summary(user_id):
+        await asyncio.sleep(0)  # let concurrent reservations interleave
+        used = sum(entry[2] for entry in service.ledger)
+        return {"plan": "free", "monthly_limit": 3, "used": used, "remaining": 3 - used,
+                "reset_at": "2026-11-01T00:00:00+00:00"}
+
+    monkeypatch.setattr(service, "_write_ledger", write_ledger)
+    monkeypatch.setattr(service, "get_usage_summary", usage_summary)
+    return service
+
+
+async def try_reserve(service, **kwargs):
+    try:
+        return await service.reserve_usage("u1", "generate", **kwargs)
+    except UsageLimitExceeded as e:
+        return e
+
+
+class TestUsageReservation:
+    """Test cases for reserving, committing and releasing usage."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_reservations_do_not_over_admit(self, service):
+        results = await asyncio.gather(*[
+            try_reserve(service, limit_per_minute=2) for _ in range(5)
+        ])
+        rejected = [r for r in results if isinstance(r, UsageLimitExceeded)]
+        assert len(rejected) == 3
+        assert {r.kind for r in rejected} == {"rate"}
+
+        # A failed request gives its slot back
+        await service.release_usage(results[0])
+        assert not isinstance(await try_reserve(service, limit_per_minute=2), UsageLimitExceeded)
+
+    @pytest.mark.asyncio
+    async def test_monthly_quota_counts_in_flight_requests(self, service):
+        results = await asyncio.gather(*[
+            try_reserve(service, limit_per_minute=10, check_quota=True) for _ in range(5)
+        ])
+        admitted = [r for r in results if not isinstance(r, UsageLimitExceeded)]
+        assert len(admitted) == 3
+        assert all(r.kind == "quota" for r in results if r not in admitted)
+
+        await service.commit_usage(admitted[0])
+        await service.release_usage(admitted[1])
+        await service.release_usage(admitted[0])  # already settled: no-op
+        assert service.ledger == [("u1", "generate", 1)]
+        assert usage_service_module._pending_quota == {"u1": 1}
+
+    @pytest.mark.asyncio
+    async def test_partial_commit_returns_the_rest(self, service):
+        reservation = await service.reserve_usage("u1", "export", 10, count=8)
+        await service.commit_usage(reservation, count=3)
+        assert service.ledger == [("u1", "export", 3)]
+        assert await usage_service_module.rate_limiter.usage("u1", "export") == 3
+
+    @pytest.mark.asyncio
+    async def test_quota_check_fails_open(self, service, monkeypatch):
+        async def failing_summary(user_id):
+            raise RuntimeError("db down")
+
+        monkeypatch.setattr(service, "get_usage_summary", failing_summary)
+        reservation = await service.reserve_usage("u1", "generate", 10, check_quota=True)
+        await service.commit_usage(reservation)
+        assert service.ledger == [("u1", "generate", 1)]
+        assert usage_service_module._pending_quota == {}
@@ -0,0 +1,22 @@
+from datetime import date, datetime
+
+from sqlalchemy.dialects import postgresql
+
+from models.usage import UsageMonthlyRollup
+from services.usage_writer import rollup_upsert
+
+
+class TestUsageRollup:
+    """Test cases for the monthly usage rollup."""
+
+    def test_month_of(self):
+        assert UsageMonthlyRollup.month_of(datetime(2026, 2, 28, 23, 59)) == date(2026, 2, 1)
+
+    def test_upsert_adds_to_existing_row(self):
+        statement = rollup_upsert("u1", "export", 3, datetime(2026, 10, 19, 12), "pro", 500)
+        compiled = statement.compile(dialect=postgresql.dialect())
+        sql = str(compiled)
+        assert "ON CONFLICT (user_id, month, action_type) DO UPDATE" in sql
+        assert "count = (usage_monthly_rollup.count + excluded.count)" in sql
+        assert compiled.params["month"] == date(2026, 10, 1)
+        assert compiled.params["count"] == 3
@@ -0,0 +1,68 @@
+import asyncio
+
+import pytest
+
+from services.usage_writer import UsageEvent, UsageWriter, event_id
+from utils.logging_config import request_id_ctx_var
+
+
+def make_writer(tmp_path, batches, fail=False, **kwargs) -> UsageWriter:
+    writer = UsageWriter(spool_path=str(tmp_path / "spool.jsonl"), **kwargs)
+
+    async def write_batch(events):
+        if fail:
+            raise ConnectionError("database down")
+        batches.append([(event.id, event.user_id, event.count) for event in events])
+
+    writer._write_batch = write_batch
+    return writer
+
+
+class TestUsageWriter:
+    """Test cases for batched usage ledger writes."""
+
+    def test_event_id_is_stable_per_request(self):
+        token = request_id_ctx_var.set("req-1")
+        try:
+            assert event_id("u1", "export") == event_id("u1", "export")
+            assert event_id("u1", "export") != event_id("u1", "generate")
+        finally:
+            request_id_ctx_var.reset(token)
+        assert event_id("u1", "export") != event_id("u1", "export")
+
+    @pytest.mark.asyncio
+    async def test_flushes_in_batches(self, tmp_path):
+        batches = []
+        writer = make_writer(tmp_path, batches, interval_ms=60000, max_events=3)
+        await writer.start()
+        await writer.add(UsageEvent("u1", "export"))
+        await writer.add(UsageEvent("u1", "export", 2))
+        await asyncio.sleep(0.01)
+        assert batches == []
+        assert writer.buffered("u1") == 3
+
+        await writer.add(UsageEvent("u2", "generate"))
+        await asyncio.sleep(0.01)
+        assert [len(batch) for batch in batches] == [3]
+
+        await writer.add(UsageEvent("u1", "export"))
+        await writer.stop()
+        assert [len(batch) for batch in batches] == [3, 1]
+        assert writer.stats()["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_spools_on_failed_shutdown_and_replays(self, tmp_path):
+        failing = make_writer(tmp_path, [], fail=True, interval_ms=60000)
+        await failing.start()
+        events = [UsageEvent("u1", "export"), UsageEvent("u2", "generate", 4)]
+        for event in events:
+            await failing.add(event)
+        await failing.stop()
+        assert failing.stats()["spooled"] == 2
+
+        batches = []
+        writer = make_writer(tmp_path, batches, interval_ms=60000)
+        await writer.start()
+        await writer.stop()
+        assert batches == [[(events[0].id, "u1", 1), (events[1].id, "u2", 4)]]
+        assert not (tmp_path / "spool.jsonl").exists()
@@ -0,0 +1,236 @@
+"""
+Vectorized profile x funding opportunity alignment scoring.
+
+Terms (focus areas, countries, organization types, keywords) are normalized
+and integer-encoded into a shared vocabulary per field. Each side becomes a
+binary incidence matrix, so set intersections for every pair are a single
+matrix product instead of nested Python loops.
+"""
+
+import numpy as np
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Profile x opportunity weights, with exact term matching. These are not
+# the weights of utils.scoring._calculate_alignment_score, which scores a
+# generated proposal's text against one opportunity by substring matching
+# (and also credits donor mentions); the two scores are not comparable.
+FOCUS_AREA_WEIGHT = 0.35
+GEOGRAPHY_WEIGHT = 0.25
+ORGANIZATION_TYPE_WEIGHT = 0.15
+KEYWORD_WEIGHT_PER_MATCH = 0.1
+KEYWORD_WEIGHT_MAX = 0.25
+
+# Semantic similarity of mission vs. opportunity text (see utils.embeddings).
+# Only similarity above the floor counts, which keeps the matrix sparse.
+SEMANTIC_WEIGHT = 0.25
+SEMANTIC_MIN_SIMILARITY = 0.3
+
+# Profiles are scored in blocks to bound the size of intermediate matrices
+ROW_BLOCK_SIZE = 1024
+
+
+def normalize_terms(values: Any) -> List[str]:
+    """Normalize a JSON list (or a single string) of terms for matching"""
+    if not values:
+        return []
+    if isinstance(values, str):
+        values = [values]
+    terms = []
+    for value in values:
+        if isinstance(value, str):
+            term = " ".join(value.lower().split())
+            if term:
+                terms.append(term)
+    return terms
+
+
+class TermEncoder:
+    """Assigns stable integer ids to normalized terms"""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+
+    def encode(self, values: Any) -> np.ndarray:
+        """Encode terms as a sorted array of unique integer ids"""
+        ids = set()
+        for term in normalize_terms(values):
+            term_id = self.vocabulary.get(term)
+            if term_id is None:
+                term_id = len(self.vocabulary)
+                self.vocabulary[term] = term_id
+            ids.add(term_id)
+        return np.fromiter(sorted(ids), dtype=np.int32, count=len(ids))
+
+    def __len__(self) -> int:
+        return len(self.vocabulary)
+
+
+def incidence_matrix(encoded_rows: Sequence[np.ndarray], vocabulary_size: int) -> np.ndarray:
+    """Build a dense binary (rows x vocabulary) matrix from encoded term sets"""
+    matrix = np.zeros((len(encoded_rows), max(vocabulary_size, 1)), dtype=np.float32)
+    for row_index, term_ids in enumerate(encoded_rows):
+        if term_ids.size:
+            matrix[row_index, term_ids] = 1.0
+    return matrix
+
+
+class EncodedSide:
+    """Incidence matrices for one side (profiles or opportunities) of the matrix"""
+
+    def __init__(self, ids: List[Any], fields: Dict[str, np.ndarray]):
+        self.ids = ids
+        self.fields = fields
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, indexes: Iterable[int]) -> "EncodedSide":
+        """Select a subset of rows"""
+        indexes = np.asarray(list(indexes), dtype=np.int64)
+        return EncodedSide(
+            [self.ids[i] for i in indexes],
+            {name: matrix[indexes] for name, matrix in self.fields.items()},
+        )
+
+
+def encode_sides(
+    profiles: Sequence[Dict[str, Any]],
+    opportunities: Sequence[Dict[str, Any]],
+    profile_vectors: Optional[np.ndarray] = None,
+    opportunity_vectors: Optional[np.ndarray] = None,
+) -> "tuple[EncodedSide, EncodedSide]":
+    """
+    Encode profiles and opportunities into comparable incidence matrices
+
+    Args:
+        profiles: Dicts with id, focus_areas, geographic_scope,
+            organization_type and programs_services
+        opportunities: Dicts with id, focus_areas, geographic_focus,
+            organization_types and keywords
+        profile_vectors: Optional unit embeddings row-aligned with profiles
+        opportunity_vectors: Optional unit embeddings row-aligned with opportunities
+
+    Returns:
+        Tuple of (profile side, opportunity side)
+    """
+    focus = TermEncoder()
+    geography = TermEncoder()
+    org_type = TermEncoder()
+    topics = TermEncoder()
+
+    profile_rows = {"focus": [], "geography": [], "org_type": [], "topics": []}
+    for profile in profiles:
+        profile_rows["focus"].append(focus.encode(profile.get("focus_areas")))
+        profile_rows["geography"].append(geography.encode(profile.get("geographic_scope")))
+        profile_rows["org_type"].append(org_type.encode(profile.get("organization_type")))
+        # Keywords are matched against everything the organization says it works on
+        profile_rows["topics"].append(
+            topics.encode(
+                normalize_terms(profile.get("focus_areas"))
+                + normalize_terms(profile.get("programs_services"))
+            )
+        )
+
+    opportunity_rows = {"focus": [], "geography": [], "org_type": [], "topics": []}
+    for opportunity in opportunities:
+        opportunity_rows["focus"].append(focus.encode(opportunity.get("focus_areas")))
+        opportunity_rows["geography"].append(
+            geography.encode(opportunity.get("geographic_focus"))
+        )
+        opportunity_rows["org_type"].append(
+            org_type.encode(opportunity.get("organization_types"))
+        )
+        opportunity_rows["topics"].append(topics.encode(opportunity.get("keywords")))
+
+    sizes = {
+        "focus": len(focus),
+        "geography": len(geography),
+        "org_type": len(org_type),
+        "topics": len(topics),
+    }
+
+    profile_side = EncodedSide(
+        [p["id"] for p in profiles],
+        {name: incidence_matrix(rows, sizes[name]) for name, rows in profile_rows.items()},
+    )
+    opportunity_side = EncodedSide(
+        [o["id"] for o in opportunities],
+        {
+            name: incidence_matrix(rows, sizes[name])
+            for name, rows in opportunity_rows.items()
+        },
+    )
+    if profile_vectors is not None and opportunity_vectors is not None:
+        profile_side.fields["semantic"] = np.asarray(profile_vectors, dtype=np.float32)
+        opportunity_side.fields["semantic"] = np.asarray(
+            opportunity_vectors, dtype=np.float32
+        )
+
+    return profile_side, opportunity_side
+
+
+def semantic_contribution(similarity: np.ndarray) -> np.ndarray:
+    """Map cosine similarity to a score bonus, zero at or below the floor"""
+    scaled = (similarity - SEMANTIC_MIN_SIMILARITY) / (1.0 - SEMANTIC_MIN_SIMILARITY)
+    return SEMANTIC_WEIGHT * np.clip(scaled, 0.0, 1.0)
+
+
+def score_matrix(profiles: EncodedSide, opportunities: EncodedSide) -> np.ndarray:
+    """
+    Compute the (profiles x opportunities) alignment score matrix
+
+    Returns:
+        float32 array of scores clipped to 0.0-1.0
+    """
+    scores = np.zeros((len(profiles), len(opportunities)), dtype=np.float32)
+    if not len(profiles) or not len(opportunities):
+        return scores
+
+    for start in range(0, len(profiles), ROW_BLOCK_SIZE):
+        stop = min(start + ROW_BLOCK_SIZE, len(profiles))
+        block = scores[start:stop]
+
+        def overlap(field: str) -> np.ndarray:
+            return profiles.fields[field][start:stop] @ opportunities.fields[field].T
+
+        block += FOCUS_AREA_WEIGHT * (overlap("focus") > 0)
+        block += GEOGRAPHY_WEIGHT * (overlap("geography") > 0)
+        block += ORGANIZATION_TYPE_WEIGHT * (overlap("org_type") > 0)
+        block += np.minimum(
+            overlap("topics") * KEYWORD_WEIGHT_PER_MATCH, KEYWORD_WEIGHT_MAX
+        )
+        if "semantic" in profiles.fields and "semantic" in opportunities.fields:
+            block += semantic_contribution(overlap("semantic"))
+
+    np.clip(scores, 0.0, 1.0, out=scores)
+    return scores
+
+
+def sparse_entries(
+    scores: np.ndarray,
+    profile_ids: List[Any],
+    opportunity_ids: List[Any],
+    min_score: float = 0.0,
+) -> List[Dict[str, Any]]:
+    """
+    Flatten a score matrix into (profile, opportunity, score) rows
+
+    Args:
+        scores: Score matrix aligned with profile_ids x opportunity_ids
+        min_score: Only pairs scoring strictly above this are returned
+
+    Returns:
+        List of dicts ready for a bulk insert into alignment_scores
+    """
+    rows, cols = np.nonzero(scores > min_score)
+    return [
+        {
+            "ngo_profile_id": profile_ids[r],
+            "funding_opportunity_id": opportunity_ids[c],
+            "score": round(float(scores[r, c]), 4),
+        }
+        for r, c in zip(rows.tolist(), cols.tolist())
+    ]
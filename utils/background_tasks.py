@@ -0,0 +1,55 @@
+"""
+Periodic background jobs running inside the application process
+"""
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+async def _run_periodic(
+    name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]
+):
+    """Run job forever, sleeping interval_seconds between runs"""
+    while True:
+        try:
+            await job()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # A failing run must not kill the loop; the next run retries
+            logger.error(f"Background job {name} failed: {str(e)}", exc_info=True)
+        await asyncio.sleep(interval_seconds)
+
+
+def start_periodic_task(
+    name: str, interval_seconds: float, job: Callable[[], Awaitable[object]]
+) -> Optional[asyncio.Task]:
+    """
+    Start a periodic job on the running event loop
+
+    Args:
+        name: Job name used for the task and in logs
+        interval_seconds: Delay between runs; 0 or less disables the job
+        job: Coroutine function to run
+
+    Returns:
+        The created task, or None if the job is disabled
+    """
+    if interval_seconds <= 0:
+        logger.info(f"Background job {name} disabled")
+        return None
+
+    logger.info(f"Starting background job {name} every {interval_seconds}s")
+    return asyncio.create_task(_run_periodic(name, interval_seconds, job), name=name)
+
+
+async def stop_tasks(tasks: List[Optional[asyncio.Task]]):
+    """Cancel background tasks and wait for them to finish"""
+    running = [task for task in tasks if task is not None]
+    for task in running:
+        task.cancel()
+    if running:
+        await asyncio.gather(*running, return_exceptions=True)
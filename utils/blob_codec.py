@@ -0,0 +1,83 @@
+"""
+Compression codec for stored content blobs.
+
+zstd is used when the zstandard package is installed; zlib is the stdlib
+fallback. The codec name is stored with every blob, so blobs written with
+either codec stay readable as long as the codec is available.
+"""
+
+import hashlib
+import json
+import zlib
+from typing import Any, Tuple
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - exercised only without zstandard
+    zstandard = None
+
+CODEC_ZSTD = "zstd"
+CODEC_ZLIB = "zlib"
+CODEC_NONE = "none"
+
+ZSTD_LEVEL = 9
+ZLIB_LEVEL = 6
+
+# Below this size compression overhead outweighs the savings
+MIN_COMPRESS_SIZE = 256
+
+
+def default_codec() -> str:
+    """Codec used for new blobs"""
+    return CODEC_ZSTD if zstandard is not None else CODEC_ZLIB
+
+
+def compress(data: bytes, codec: str = None) -> Tuple[str, bytes]:
+    """
+    Compress bytes
+
+    Returns:
+        Tuple of (codec name, compressed bytes)
+    """
+    codec = codec or default_codec()
+    if len(data) < MIN_COMPRESS_SIZE:
+        return CODEC_NONE, data
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is not installed")
+        return codec, zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+    if codec == CODEC_ZLIB:
+        return codec, zlib.compress(data, ZLIB_LEVEL)
+    if codec == CODEC_NONE:
+        return codec, data
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+
+def decompress(codec: str, data: bytes) -> bytes:
+    """Decompress bytes written by compress()"""
+    if codec == CODEC_NONE:
+        return bytes(data)
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise ValueError("zstandard is required to read zstd blobs")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == CODEC_ZLIB:
+        return zlib.decompress(data)
+    raise ValueError(f"Unknown blob codec: {codec}")
+
+
+def encode_text(value: str) -> bytes:
+    """Canonical bytes for a text blob"""
+    return value.encode("utf-8")
+
+
+def encode_json(value: Any) -> bytes:
+    """Canonical bytes for a JSON blob (stable key order, so equal values hash equally)"""
+    return json.dumps(
+        value, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    ).encode("utf-8")
+
+
+def content_hash(data: bytes) -> str:
+    """SHA-256 hex digest used as the blob key"""
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,228 @@
+"""
+Negotiated gzip/brotli response compression.
+
+A pure ASGI middleware, so streamed bodies are compressed chunk by chunk and
+flushed as they go instead of being buffered. Responses that are already
+encoded, are not worth compressing (PDF, DOCX, ZIP, images), are partial
+(206), or are server-sent event streams pass through untouched.
+"""
+
+import os
+import zlib
+from typing import Callable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - exercised only without brotli
+    brotli = None
+
+MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+# Low qualities keep brotli faster than gzip while still compressing better
+BROTLI_QUALITY = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "4"))
+
+# Content types that are already compressed or must not be buffered
+EXCLUDED_CONTENT_TYPES = (
+    "text/event-stream",
+    "application/pdf",
+    "application/zip",
+    "application/gzip",
+    "application/vnd.openxmlformats-officedocument",
+    "image/",
+    "audio/",
+    "video/",
+)
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """Parse an Accept-Encoding header into {coding: q}"""
+    codings = {}
+    for part in header.split(","):
+        pieces = part.strip().split(";")
+        coding = pieces[0].strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in pieces[1:]:
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        codings[coding] = q
+    return codings
+
+
+def choose_encoding(header: str) -> Optional[str]:
+    """Pick the best supported encoding the client accepts, or None"""
+    if not header:
+        return None
+    codings = parse_accept_encoding(header)
+    wildcard = codings.get("*")
+
+    candidates = []
+    # Preference order on equal q: brotli, then gzip
+    for preference, coding in enumerate(("br", "gzip")):
+        if coding == "br" and brotli is None:
+            continue
+        q = codings.get(coding, wildcard)
+        if q is not None and q > 0:
+            candidates.append((q, -preference, coding))
+    if not candidates:
+        return None
+    return max(candidates)[2]
+
+
+class _Compressor:
+    """Incremental compressor for one response body"""
+
+    def __init__(self, encoding: str):
+        self.encoding = encoding
+        if encoding == "br":
+            self._brotli = brotli.Compressor(quality=BROTLI_QUALITY)
+        else:
+            self._zlib = zlib.compressobj(GZIP_LEVEL, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes, flush: bool) -> bytes:
+        """Compress a chunk; flush makes everything so far decodable by the client"""
+        if self.encoding == "br":
+            out = self._brotli.process(data) if data else b""
+            return out + self._brotli.flush() if flush else out
+        out = self._zlib.compress(data) if data else b""
+        return out + self._zlib.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    def finish(self, data: bytes) -> bytes:
+        """Compress the last chunk and close the stream"""
+        if self.encoding == "br":
+            return (self._brotli.process(data) if data else b"") + self._brotli.finish()
+        return (self._zlib.compress(data) if data else b"") + self._zlib.flush(zlib.Z_FINISH)
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+def _should_skip(status: int, headers: List[Tuple[bytes, bytes]]) -> bool:
+    if status < 200 or status in (204, 206, 304):
+        return True
+    if _header(headers, b"content-encoding") is not None:
+        return True
+    if _header(headers, b"content-range") is not None:
+        return True
+    content_type = (_header(headers, b"content-type") or b"").decode("latin-1").lower()
+    return any(content_type.startswith(excluded) for excluded in EXCLUDED_CONTENT_TYPES)
+
+
+def _add_vary(headers: List[Tuple[bytes, bytes]]) -> List[Tuple[bytes, bytes]]:
+    vary = _header(headers, b"vary")
+    if vary is None:
+        return headers + [(b"vary", b"Accept-Encoding")]
+    if b"accept-encoding" in vary.lower():
+        return headers
+    return [
+        (key, value + b", Accept-Encoding" if key.lower() == b"vary" else value)
+        for key, value in headers
+    ]
+
+
+def _weaken_etag(value: bytes) -> bytes:
+    # A strong ETag identifies exact bytes; the encoded body is a different
+    # representation, so mark it weak (If-None-Match uses weak comparison)
+    return value if value.startswith(b"W/") else b"W/" + value
+
+
+class CompressionMiddleware:
+    """ASGI middleware applying negotiated gzip/brotli compression"""
+
+    def __init__(self, app, minimum_size: int = MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") == "HEAD":
+            await self.app(scope, receive, send)
+            return
+
+        accept = ""
+        for key, value in scope.get("headers", []):
+            if key == b"accept-encoding":
+                accept = value.decode("latin-1")
+                break
+        encoding = choose_encoding(accept)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        responder = _CompressingResponder(send, encoding, self.minimum_size)
+        await self.app(scope, receive, responder)
+
+
+class _CompressingResponder:
+    """Wraps send() for a single response"""
+
+    def __init__(self, send: Callable, encoding: str, minimum_size: int):
+        self.send = send
+        self.encoding = encoding
+        self.minimum_size = minimum_size
+        self.start_message = None
+        self.compressor: Optional[_Compressor] = None
+        self.passthrough = False
+
+    async def __call__(self, message):
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            headers = list(message.get("headers", []))
+            if _should_skip(message["status"], headers):
+                self.passthrough = True
+                await self.send(message)
+            else:
+                # Held back until the first body chunk decides whether to compress
+                self.start_message = dict(message, headers=headers)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.start_message is not None:
+            start, self.start_message = self.start_message, None
+            if not more_body and len(body) < self.minimum_size:
+                self.passthrough = True
+                await self.send(start)
+                await self.send(message)
+                return
+
+            self.compressor = _Compressor(self.encoding)
+            headers = [
+                (key, _weaken_etag(value) if key.lower() == b"etag" else value)
+                for key, value in start["headers"]
+                if key.lower() != b"content-length"
+            ]
+            headers.append((b"content-encoding", self.encoding.encode("ascii")))
+            if not more_body:
+                compressed = self.compressor.finish(body)
+                headers.append((b"content-length", str(len(compressed)).encode("ascii")))
+                await self.send(dict(start, headers=_add_vary(headers)))
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+            await self.send(dict(start, headers=_add_vary(headers)))
+
+        if more_body:
+            # Flush every chunk so streamed output reaches the client promptly
+            chunk = self.compressor.compress(body, flush=True)
+            if chunk:
+                await self.send(
+                    {"type": "http.response.body", "body": chunk, "more_body": True}
+                )
+        else:
+            await self.send(
+                {"type": "http.response.body", "body": self.compressor.finish(body)}
+            )
@@ -0,0 +1,237 @@
+"""
+Parsed Markdown model of proposal content.
+
+Proposal content is the light Markdown the generator produces: "#" headings,
+blank-line separated paragraphs and "-"/"*"/"1." lists. parse_markdown reads
+it once into blocks and sections that the exporters, title and summary
+extraction and scoring share, instead of each re-splitting the raw text.
+
+Documents are immutable and cached: by text in parse_markdown, and by
+(proposal id, version) in document_for, since content changes always bump
+the version.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+
+DOCUMENT_CACHE_SIZE = int(os.getenv("DOCUMENT_CACHE_SIZE", "256"))
+
+HEADING = "heading"
+PARAGRAPH = "paragraph"
+LIST = "list"
+
+_BULLET = re.compile(r"^[-*+]\s+")
+_NUMBERED = re.compile(r"^\d+[.)]\s+")
+
+
+class Block:
+    """A heading, paragraph or list"""
+
+    __slots__ = ("kind", "text", "level", "items", "ordered")
+
+    def __init__(
+        self,
+        kind: str,
+        text: str = "",
+        level: int = 0,
+        items: Tuple[str, ...] = (),
+        ordered: bool = False,
+    ):
+        self.kind = kind
+        self.text = text
+        self.level = level
+        self.items = items
+        self.ordered = ordered
+
+    def lines(self) -> List[str]:
+        """Source lines of the block, markers stripped"""
+        if self.kind == LIST:
+            return list(self.items)
+        return self.text.split("\n")
+
+    def __repr__(self) -> str:
+        return f"Block({self.kind!r}, {self.text or self.items!r})"
+
+
+class Section:
+    """A heading and the blocks up to the next heading (heading is None before the first)"""
+
+    __slots__ = ("heading", "blocks")
+
+    def __init__(self, heading: Optional[Block], blocks: Tuple[Block, ...]):
+        self.heading = heading
+        self.blocks = blocks
+
+    @property
+    def title(self) -> Optional[str]:
+        return self.heading.text if self.heading else None
+
+    def text(self) -> str:
+        """Body text of the section, one block per paragraph"""
+        return "\n\n".join("\n".join(block.lines()) for block in self.blocks)
+
+
+class ProposalDocument:
+    """Parsed proposal content"""
+
+    __slots__ = ("blocks", "sections", "_lower")
+
+    def __init__(self, blocks: Tuple[Block, ...]):
+        self.blocks = blocks
+        self.sections = _group_sections(blocks)
+        self._lower: Optional[str] = None
+
+    @property
+    def headings(self) -> List[str]:
+        return [block.text for block in self.blocks if block.kind == HEADING]
+
+    @property
+    def lower_text(self) -> str:
+        """Lowercased text of all blocks, for keyword checks"""
+        if self._lower is None:
+            self._lower = "\n".join(
+                "\n".join(block.lines()) for block in self.blocks
+            ).lower()
+        return self._lower
+
+    def iter_lines(self) -> Iterator[Tuple[bool, str]]:
+        """(is_heading, text) for every non-empty line in document order"""
+        for block in self.blocks:
+            for line in block.lines():
+                line = line.strip()
+                if line:
+                    yield block.kind == HEADING, line
+
+    def section(self, name: str) -> Optional[Section]:
+        """First section whose heading contains name (case-insensitive)"""
+        name = name.lower()
+        for section in self.sections:
+            if section.heading and name in section.heading.text.lower():
+                return section
+        return None
+
+    def has_section(self, name: str) -> bool:
+        """Whether a heading or, failing that, the text mentions name"""
+        return self.section(name) is not None or name.lower() in self.lower_text
+
+    def title(self) -> Optional[str]:
+        """First line that is not a heading"""
+        for is_heading, line in self.iter_lines():
+            if not is_heading:
+                return line
+        return None
+
+    def executive_summary(self) -> Optional[str]:
+        """
+        Text following the first "executive summary" line, up to the next heading
+
+        The marker may be a heading or a plain line (e.g. bold text).
+        """
+        summary_lines = []
+        in_summary = False
+        for is_heading, line in self.iter_lines():
+            if not in_summary:
+                in_summary = "executive summary" in line.lower()
+                continue
+            if is_heading:
+                if summary_lines:
+                    break
+                continue
+            summary_lines.append(line)
+        return " ".join(summary_lines) if summary_lines else None
+
+
+def _group_sections(blocks: Tuple[Block, ...]) -> Tuple[Section, ...]:
+    sections = []
+    heading = None
+    body: List[Block] = []
+    for block in blocks:
+        if block.kind == HEADING:
+            if heading is not None or body:
+                sections.append(Section(heading, tuple(body)))
+            heading = block
+            body = []
+        else:
+            body.append(block)
+    if heading is not None or body:
+        sections.append(Section(heading, tuple(body)))
+    return tuple(sections)
+
+
+def _parse_chunk(lines: List[str], blocks: List[Block]):
+    # A blank-line separated chunk: heading lines stand alone, runs of list
+    # items become lists and the remaining lines paragraphs
+    paragraph: List[str] = []
+    items: List[str] = []
+    ordered = False
+
+    def flush():
+        if paragraph:
+            blocks.append(Block(PARAGRAPH, "\n".join(paragraph)))
+            paragraph.clear()
+        if items:
+            blocks.append(Block(LIST, items=tuple(items), ordered=ordered))
+            items.clear()
+
+    for line in lines:
+        stripped = line.strip()
+        if stripped.startswith("#"):
+            flush()
+            level = len(stripped) - len(stripped.lstrip("#"))
+            blocks.append(Block(HEADING, stripped.lstrip("# ").strip(), level=level))
+            continue
+        marker = _BULLET.match(stripped) or _NUMBERED.match(stripped)
+        if marker:
+            numbered = marker.re is _NUMBERED
+            if paragraph or (items and ordered != numbered):
+                flush()
+            ordered = numbered
+            items.append(stripped[marker.end():])
+        elif items and not paragraph and line[:1].isspace():
+            items[-1] = f"{items[-1]} {stripped}"  # Wrapped list item
+        else:
+            if items:
+                flush()
+            paragraph.append(stripped)
+    flush()
+
+
+@lru_cache(maxsize=DOCUMENT_CACHE_SIZE)
+def parse_markdown(text: str) -> ProposalDocument:
+    """Parse proposal content into a document (cached by text)"""
+    blocks: List[Block] = []
+    chunk: List[str] = []
+    for line in text.replace("\r\n", "\n").split("\n"):
+        if line.strip():
+            chunk.append(line)
+        elif chunk:
+            _parse_chunk(chunk, blocks)
+            chunk = []
+    if chunk:
+        _parse_chunk(chunk, blocks)
+    return ProposalDocument(tuple(blocks))
+
+
+_documents: "OrderedDict[Tuple[str, int], ProposalDocument]" = OrderedDict()
+
+
+def document_for(proposal) -> ProposalDocument:
+    """Parsed content of a proposal, cached per (id, version)"""
+    key = (str(proposal.id), proposal.version)
+    document = _documents.get(key)
+    if document is not None:
+        _documents.move_to_end(key)
+        return document
+    document = parse_markdown(proposal.content or "")
+    _documents[key] = document
+    if len(_documents) > DOCUMENT_CACHE_SIZE:
+        _documents.popitem(last=False)
+    return document
+
+
+def is_document_cached(proposal_id, version: int) -> bool:
+    """Whether document_for would be answered without reading proposal.content"""
+    return (str(proposal_id), version) in _documents
@@ -0,0 +1,150 @@
+"""
+Template-based DOCX writing.
+
+A base document (python-docx's default, or a donor-branded .docx from
+DOCX_TEMPLATE_DIR) is read once per process and each export opens a copy
+of it, so branding, headers, footers and styles come from the template.
+
+Paragraphs are appended by cloning prebuilt <w:p> elements that already
+carry their style, instead of python-docx's add_paragraph(style=...),
+which looks the style up by name and builds the properties for every
+paragraph.
+"""
+
+import copy
+import io
+import logging
+import os
+import re
+from functools import lru_cache
+from typing import Dict, Optional
+
+from docx import Document
+from docx.enum.text import WD_ALIGN_PARAGRAPH
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+logger = logging.getLogger(__name__)
+
+DOCX_TEMPLATE_DIR = os.getenv("DOCX_TEMPLATE_DIR", "templates/docx")
+DEFAULT_TEMPLATE = "default"
+
+# Paragraph kinds the exporter writes, by the style name they use
+TITLE = "Title"
+NORMAL = "Normal"
+HEADING_STYLES = {1: "Heading 1", 2: "Heading 2", 3: "Heading 3"}
+LIST_BULLET = "List Bullet"
+LIST_NUMBER = "List Number"
+_STYLES = (TITLE, NORMAL, *HEADING_STYLES.values(), LIST_BULLET, LIST_NUMBER)
+
+_SAFE_NAME = re.compile(r"^[a-z0-9_]+$")
+
+
+def template_key(donor_template_used: Optional[str]) -> str:
+    """
+    DOCX template name for a proposal's donor_template_used
+
+    Proposals store either a prompt type (e.g. "custom_brief") or the donor
+    guideline text itself; the latter is mapped back to its donor key.
+    """
+    if not donor_template_used:
+        return DEFAULT_TEMPLATE
+    if _SAFE_NAME.match(donor_template_used):
+        return donor_template_used
+    return _donor_keys().get(donor_template_used, DEFAULT_TEMPLATE)
+
+
+@lru_cache(maxsize=1)
+def _donor_keys() -> Dict[str, str]:
+    # Imported here so export worker processes never load the prompt
+    # builder and, through it, the ORM models
+    from prompts.donor_templates import DonorTemplates
+    return {text: key for key, text in DonorTemplates().get_all_templates().items()}
+
+
+class DocxTemplate:
+    """A base document read once, with a prebuilt paragraph per style"""
+
+    __slots__ = ("name", "_data", "_prototypes")
+
+    def __init__(self, name: str, data: bytes):
+        self.name = name
+        self._data = data
+        document = Document(io.BytesIO(data))
+        self._prototypes = {
+            style: _prototype(document, style) for style in _STYLES
+        }
+        self._prototypes[TITLE].get_or_add_pPr().jc_val = WD_ALIGN_PARAGRAPH.CENTER
+
+    def new_document(self) -> "DocxWriter":
+        return DocxWriter(Document(io.BytesIO(self._data)), self._prototypes)
+
+
+def _prototype(document, style_name: str):
+    paragraph = OxmlElement("w:p")
+    try:
+        style_id = document.styles[style_name].style_id
+    except KeyError:
+        logger.warning(f"DOCX template has no '{style_name}' style, using Normal")
+        style_id = None
+    if style_id and style_name != NORMAL:
+        paragraph.get_or_add_pPr().style = style_id
+    return paragraph
+
+
+class DocxWriter:
+    """Appends paragraphs to a copy of a template document"""
+
+    __slots__ = ("document", "_append", "_prototypes")
+
+    def __init__(self, document, prototypes: Dict[str, object]):
+        self.document = document
+        self._prototypes = prototypes
+        body = document.element.body
+        # New paragraphs go after any template content, before the section
+        # properties that must stay last in the body
+        section = body.sectPr
+        self._append = section.addprevious if section is not None else body.append
+
+    def paragraph(self, text: str = "", style: str = NORMAL):
+        """Append a paragraph; newlines in text become line breaks"""
+        paragraph = copy.deepcopy(self._prototypes[style])
+        if text:
+            run = OxmlElement("w:r")
+            for index, line in enumerate(text.split("\n")):
+                if index:
+                    run.append(OxmlElement("w:br"))
+                if line:
+                    text_element = OxmlElement("w:t")
+                    text_element.set(qn("xml:space"), "preserve")
+                    text_element.text = line
+                    run.append(text_element)
+            paragraph.append(run)
+        self._append(paragraph)
+
+    def heading(self, text: str, level: int):
+        self.paragraph(text, TITLE if level == 0 else HEADING_STYLES[min(level, 3)])
+
+    def page_break(self):
+        self.document.add_page_break()
+
+    def save(self, target):
+        self.document.save(target)
+
+
+@lru_cache(maxsize=None)
+def get_template(name: str) -> DocxTemplate:
+    """
+    The DOCX template called name, loaded once per process
+
+    Falls back to DOCX_TEMPLATE_DIR/default.docx, then to python-docx's
+    built-in document.
+    """
+    for candidate in (name, DEFAULT_TEMPLATE):
+        path = os.path.join(DOCX_TEMPLATE_DIR, f"{candidate}.docx")
+        if _SAFE_NAME.match(candidate) and os.path.isfile(path):
+            with open(path, "rb") as template_file:
+                return DocxTemplate(candidate, template_file.read())
+    data = io.BytesIO()
+    Document().save(data)
+    return DocxTemplate(DEFAULT_TEMPLATE, data.getvalue())
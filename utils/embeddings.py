@@ -0,0 +1,540 @@
+"""
+Local CPU text embeddings for semantic matching.
+
+Two engines are available:
+- TfidfSvdEngine: TF-IDF weighting reduced with randomized truncated SVD
+  (latent semantic analysis). Pure NumPy, always available.
+- OnnxEngine: a small sentence-embedding model exported to ONNX. Requires
+  the optional onnxruntime and tokenizers packages.
+
+Vectors are L2-normalized float32, so cosine similarity is a dot product.
+Opportunity and profile vectors are persisted as memory-mapped matrices that
+every worker process can share read-only.
+"""
+
+import json
+import os
+import re
+import shutil
+import threading
+import time
+import uuid
+import numpy as np
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_INDEX_DIR = os.getenv("EMBEDDING_INDEX_DIR", "data/embeddings")
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_STOPWORDS = frozenset(
+    """
+    a an and are as at be been but by for from has have in into is it its of on
+    or our that the their them they this to was we were which will with within
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed and light plural stemming"""
+    tokens = []
+    for token in _TOKEN_RE.findall((text or "").lower()):
+        if token in _STOPWORDS or len(token) < 2:
+            continue
+        if len(token) > 4 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+def normalize_rows(matrix: np.ndarray) -> np.ndarray:
+    """L2-normalize rows in place, leaving all-zero rows untouched"""
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    np.divide(matrix, norms, out=matrix, where=norms > 0)
+    return matrix
+
+
+class _SparseRows:
+    """Minimal CSR matrix with the two products randomized SVD needs"""
+
+    CHUNK_ROWS = 2048
+
+    def __init__(self, rows: List[Tuple[np.ndarray, np.ndarray]], n_cols: int):
+        self.rows = rows
+        self.n_cols = n_cols
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def _chunks(self):
+        for start in range(0, len(self.rows), self.CHUNK_ROWS):
+            chunk = self.rows[start:start + self.CHUNK_ROWS]
+            lengths = np.fromiter((len(i) for i, _ in chunk), dtype=np.int64, count=len(chunk))
+            if not lengths.sum():
+                continue
+            indices = np.concatenate([i for i, _ in chunk])
+            data = np.concatenate([d for _, d in chunk])
+            row_ids = np.repeat(np.arange(start, start + len(chunk)), lengths)
+            yield indices, data, row_ids
+
+    def dot(self, dense: np.ndarray) -> np.ndarray:
+        """self @ dense, with dense shaped (n_cols, k)"""
+        out = np.zeros((len(self.rows), dense.shape[1]), dtype=np.float32)
+        for indices, data, row_ids in self._chunks():
+            np.add.at(out, row_ids, data[:, None] * dense[indices])
+        return out
+
+    def tdot(self, dense: np.ndarray) -> np.ndarray:
+        """self.T @ dense, with dense shaped (n_rows, k)"""
+        out = np.zeros((self.n_cols, dense.shape[1]), dtype=np.float32)
+        for indices, data, row_ids in self._chunks():
+            np.add.at(out, indices, data[:, None] * dense[row_ids])
+        return out
+
+
+class EmbeddingEngine:
+    """Base class for local embedding engines"""
+
+    name = "base"
+
+    @property
+    def dimension(self) -> int:
+        raise NotImplementedError
+
+    @property
+    def is_fitted(self) -> bool:
+        return True
+
+    def fit(self, texts: Sequence[str]) -> "EmbeddingEngine":
+        """Learn corpus statistics; engines with fixed weights ignore this"""
+        return self
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        """Embed texts into an (n, dimension) float32 matrix of unit vectors"""
+        raise NotImplementedError
+
+    def save(self, directory: str):
+        """Persist fitted state under directory"""
+
+    @classmethod
+    def load(cls, directory: str) -> "EmbeddingEngine":
+        raise NotImplementedError
+
+
+class TfidfSvdEngine(EmbeddingEngine):
+    """TF-IDF + truncated SVD (LSA) baseline; learns term co-occurrence from the corpus"""
+
+    name = "tfidf_svd"
+
+    def __init__(
+        self,
+        dimension: int = 128,
+        max_features: int = 20000,
+        min_df: int = 2,
+        n_iter: int = 4,
+        random_state: int = 0,
+    ):
+        self._dimension = dimension
+        self.max_features = max_features
+        self.min_df = min_df
+        self.n_iter = n_iter
+        self.random_state = random_state
+        self.vocabulary: Dict[str, int] = {}
+        self.idf: Optional[np.ndarray] = None
+        self.components: Optional[np.ndarray] = None  # (vocabulary, dimension)
+
+    @property
+    def dimension(self) -> int:
+        if self.components is not None:
+            return self.components.shape[1]
+        return self._dimension
+
+    @property
+    def is_fitted(self) -> bool:
+        return self.components is not None
+
+    def _tfidf_rows(self, texts: Sequence[str]) -> _SparseRows:
+        rows = []
+        for text in texts:
+            counts: Dict[int, int] = {}
+            for token in tokenize(text):
+                term_id = self.vocabulary.get(token)
+                if term_id is not None:
+                    counts[term_id] = counts.get(term_id, 0) + 1
+            indices = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            data = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            if data.size:
+                data = (1.0 + np.log(data)) * self.idf[indices]
+                data /= np.linalg.norm(data)
+            rows.append((indices, data))
+        return _SparseRows(rows, len(self.vocabulary))
+
+    def fit(self, texts: Sequence[str]) -> "TfidfSvdEngine":
+        document_frequency: Dict[str, int] = {}
+        for text in texts:
+            for token in set(tokenize(text)):
+                document_frequency[token] = document_frequency.get(token, 0) + 1
+
+        min_df = self.min_df if len(texts) >= 10 * self.min_df else 1
+        terms = [t for t, df in document_frequency.items() if df >= min_df]
+        terms.sort(key=lambda t: (-document_frequency[t], t))
+        terms = terms[: self.max_features]
+        self.vocabulary = {term: i for i, term in enumerate(terms)}
+
+        n_docs = len(texts)
+        df = np.array([document_frequency[t] for t in terms], dtype=np.float32)
+        self.idf = (np.log((1.0 + n_docs) / (1.0 + df)) + 1.0).astype(np.float32)
+
+        if not terms:
+            self.components = np.zeros((0, self._dimension), dtype=np.float32)
+            return self
+
+        matrix = self._tfidf_rows(texts)
+        rank = max(1, min(self._dimension, len(texts), len(terms)))
+        self.components = self._randomized_svd(matrix, rank)
+        logger.info(
+            f"Fitted TF-IDF/SVD engine: {len(texts)} documents, "
+            f"{len(terms)} terms, {rank} dimensions"
+        )
+        return self
+
+    def _randomized_svd(self, matrix: _SparseRows, rank: int) -> np.ndarray:
+        """Right singular vectors of the TF-IDF matrix (Halko et al. range finder)"""
+        rng = np.random.default_rng(self.random_state)
+        oversampled = min(rank + 10, matrix.n_cols)
+        omega = rng.standard_normal((matrix.n_cols, oversampled)).astype(np.float32)
+
+        q, _ = np.linalg.qr(matrix.dot(omega))
+        for _ in range(self.n_iter):
+            z, _ = np.linalg.qr(matrix.tdot(q))
+            q, _ = np.linalg.qr(matrix.dot(z))
+
+        # B = Q^T A is small (oversampled x vocabulary); its SVD gives A's right vectors
+        b = matrix.tdot(q).T
+        _, _, vt = np.linalg.svd(b, full_matrices=False)
+        return np.ascontiguousarray(vt[:rank].T, dtype=np.float32)
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not self.is_fitted:
+            raise RuntimeError("TF-IDF/SVD engine must be fitted before embedding")
+        vectors = self._tfidf_rows(texts).dot(self.components)
+        return normalize_rows(vectors)
+
+    def save(self, directory: str):
+        terms = sorted(self.vocabulary, key=self.vocabulary.get)
+        with open(os.path.join(directory, "tfidf_vocabulary.json"), "w") as f:
+            json.dump(terms, f)
+        np.save(os.path.join(directory, "tfidf_idf.npy"), self.idf)
+        np.save(os.path.join(directory, "tfidf_components.npy"), self.components)
+
+    @classmethod
+    def load(cls, directory: str) -> "TfidfSvdEngine":
+        engine = cls()
+        with open(os.path.join(directory, "tfidf_vocabulary.json")) as f:
+            engine.vocabulary = {term: i for i, term in enumerate(json.load(f))}
+        engine.idf = np.load(os.path.join(directory, "tfidf_idf.npy"))
+        engine.components = np.load(
+            os.path.join(directory, "tfidf_components.npy"), mmap_mode="r"
+        )
+        return engine
+
+
+class OnnxEngine(EmbeddingEngine):
+    """
+    Sentence embeddings from a small ONNX transformer (e.g. all-MiniLM-L6-v2)
+
+    The model directory must contain model.onnx and tokenizer.json.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_dir: str, max_length: int = 256, batch_size: int = 32):
+        try:
+            import onnxruntime
+            from tokenizers import Tokenizer
+        except ImportError:
+            raise ImportError(
+                "ONNX embeddings require the optional packages onnxruntime and tokenizers"
+            )
+
+        self.model_dir = model_dir
+        self.batch_size = batch_size
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+
+        options = onnxruntime.SessionOptions()
+        options.intra_op_num_threads = int(os.getenv("EMBEDDING_ONNX_THREADS", "1"))
+        self.session = onnxruntime.InferenceSession(
+            os.path.join(model_dir, "model.onnx"),
+            sess_options=options,
+            providers=["CPUExecutionProvider"],
+        )
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self._dimension = self.session.get_outputs()[0].shape[-1]
+
+    @property
+    def dimension(self) -> int:
+        return self._dimension
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            encodings = self.tokenizer.encode_batch(
+                [text or "" for text in texts[start:start + self.batch_size]]
+            )
+            ids = np.array([e.ids for e in encodings], dtype=np.int64)
+            mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+            feeds = {"input_ids": ids, "attention_mask": mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(ids)
+
+            hidden = self.session.run(None, feeds)[0]
+            # Mean pooling over non-padding tokens
+            weights = mask[:, :, None].astype(np.float32)
+            pooled = (hidden * weights).sum(axis=1) / np.maximum(weights.sum(axis=1), 1e-9)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, self.dimension), dtype=np.float32)
+        return normalize_rows(np.vstack(batches))
+
+    def save(self, directory: str):
+        with open(os.path.join(directory, "onnx_model.json"), "w") as f:
+            json.dump({"model_dir": os.path.abspath(self.model_dir)}, f)
+
+    @classmethod
+    def load(cls, directory: str) -> "OnnxEngine":
+        with open(os.path.join(directory, "onnx_model.json")) as f:
+            return cls(json.load(f)["model_dir"])
+
+
+ENGINES = {TfidfSvdEngine.name: TfidfSvdEngine, OnnxEngine.name: OnnxEngine}
+
+
+def create_engine(name: Optional[str] = None) -> EmbeddingEngine:
+    """
+    Create the configured embedding engine
+
+    Uses EMBEDDING_ENGINE (tfidf_svd or onnx); onnx also needs
+    EMBEDDING_ONNX_MODEL_DIR.
+    """
+    name = name or os.getenv("EMBEDDING_ENGINE", TfidfSvdEngine.name)
+    if name == OnnxEngine.name:
+        model_dir = os.getenv("EMBEDDING_ONNX_MODEL_DIR")
+        if not model_dir:
+            raise ValueError("EMBEDDING_ONNX_MODEL_DIR is required for the onnx engine")
+        return OnnxEngine(model_dir)
+    if name == TfidfSvdEngine.name:
+        return TfidfSvdEngine(dimension=int(os.getenv("EMBEDDING_DIMENSION", "128")))
+    raise ValueError(f"Unknown embedding engine: {name}")
+
+
+class VectorIndex:
+    """Row-aligned ids and unit vectors backed by a memory-mapped float32 file"""
+
+    def __init__(self, ids: List, vectors: np.ndarray):
+        self.ids = ids
+        self.vectors = vectors
+        self._positions = {key: i for i, key in enumerate(ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def get(self, key) -> Optional[np.ndarray]:
+        """Vector for an id, or None if the id is not indexed"""
+        position = self._positions.get(key)
+        return None if position is None else self.vectors[position]
+
+    def search(self, query: np.ndarray, k: int = 10) -> List[Tuple[object, float]]:
+        """Top-k (id, cosine similarity) pairs for a unit query vector"""
+        if not len(self.ids) or k <= 0:
+            return []
+        similarities = self.vectors @ query.astype(np.float32)
+        k = min(k, len(self.ids))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return [(self.ids[i], float(similarities[i])) for i in top]
+
+    def save(self, directory: str, name: str):
+        """Write vectors and ids atomically next to each other"""
+        vectors_path = os.path.join(directory, f"{name}.f32")
+        rows, dimension = self.vectors.shape
+        matrix = np.memmap(
+            vectors_path + ".tmp", dtype=np.float32, mode="w+", shape=(max(rows, 1), dimension)
+        )
+        matrix[:rows] = self.vectors
+        matrix.flush()
+        del matrix
+        os.replace(vectors_path + ".tmp", vectors_path)
+
+        ids_path = os.path.join(directory, f"{name}.ids.json")
+        with open(ids_path + ".tmp", "w") as f:
+            json.dump({"ids": [str(i) for i in self.ids], "dimension": dimension}, f)
+        os.replace(ids_path + ".tmp", ids_path)
+
+    @classmethod
+    def load(cls, directory: str, name: str, id_type=str) -> "VectorIndex":
+        with open(os.path.join(directory, f"{name}.ids.json")) as f:
+            meta = json.load(f)
+        ids = [id_type(i) for i in meta["ids"]]
+        vectors = np.memmap(
+            os.path.join(directory, f"{name}.f32"),
+            dtype=np.float32,
+            mode="r",
+            shape=(max(len(ids), 1), meta["dimension"]),
+        )[: len(ids)]
+        return cls(ids, vectors)
+
+
+class SemanticIndex:
+    """Fitted engine plus opportunity and profile vector indexes"""
+
+    MANIFEST = "manifest.json"
+
+    def __init__(
+        self,
+        engine: EmbeddingEngine,
+        opportunities: VectorIndex,
+        profiles: VectorIndex,
+    ):
+        self.engine = engine
+        self.opportunities = opportunities
+        self.profiles = profiles
+
+    def similarity(self, text: str, opportunity_id: int, fallback_text: str = "") -> float:
+        """Cosine similarity between a text and an opportunity"""
+        opportunity_vector = self.opportunities.get(opportunity_id)
+        if opportunity_vector is None:
+            if not fallback_text:
+                return 0.0
+            opportunity_vector = self.engine.embed([fallback_text])[0]
+        return float(self.engine.embed([text])[0] @ opportunity_vector)
+
+    def save(self, directory: str):
+        """
+        Write a new index version and switch the manifest to it
+
+        Each version lives in its own subdirectory so readers never see a
+        half-written mix of files; the manifest is replaced last.
+        """
+        version = f"v{int(time.time() * 1000)}"
+        version_dir = os.path.join(directory, version)
+        os.makedirs(version_dir, exist_ok=True)
+        self.engine.save(version_dir)
+        self.opportunities.save(version_dir, "opportunities")
+        self.profiles.save(version_dir, "profiles")
+
+        manifest_path = os.path.join(directory, self.MANIFEST)
+        previous = None
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                previous = json.load(f).get("version")
+        with open(manifest_path + ".tmp", "w") as f:
+            json.dump({"engine": self.engine.name, "version": version}, f)
+        os.replace(manifest_path + ".tmp", manifest_path)
+
+        # Keep the previous version for readers that are still mapping it
+        for entry in os.listdir(directory):
+            path = os.path.join(directory, entry)
+            if os.path.isdir(path) and entry not in (version, previous):
+                shutil.rmtree(path, ignore_errors=True)
+
+    @classmethod
+    def load(cls, directory: str) -> "SemanticIndex":
+        with open(os.path.join(directory, cls.MANIFEST)) as f:
+            manifest = json.load(f)
+        version_dir = os.path.join(directory, manifest["version"])
+        engine = ENGINES[manifest["engine"]].load(version_dir)
+        return cls(
+            engine,
+            VectorIndex.load(version_dir, "opportunities", id_type=int),
+            VectorIndex.load(version_dir, "profiles", id_type=uuid.UUID),
+        )
+
+
+_semantic_index: Optional[SemanticIndex] = None
+_semantic_index_mtime: Optional[float] = None
+_semantic_index_lock = threading.Lock()
+
+
+def get_semantic_index(directory: Optional[str] = None) -> Optional[SemanticIndex]:
+    """
+    Process-wide semantic index, reloaded when the refresh job rewrites it
+
+    Returns:
+        The loaded index, or None if no index has been built yet
+    """
+    global _semantic_index, _semantic_index_mtime
+
+    directory = directory or EMBEDDING_INDEX_DIR
+    manifest_path = os.path.join(directory, SemanticIndex.MANIFEST)
+    try:
+        mtime = os.path.getmtime(manifest_path)
+    except OSError:
+        return None
+
+    if _semantic_index is not None and mtime == _semantic_index_mtime:
+        return _semantic_index
+
+    with _semantic_index_lock:
+        if _semantic_index is None or mtime != _semantic_index_mtime:
+            try:
+                _semantic_index = SemanticIndex.load(directory)
+                _semantic_index_mtime = mtime
+            except Exception as e:
+                logger.error(f"Error loading semantic index: {str(e)}")
+                return _semantic_index
+    return _semantic_index
+
+
+def opportunity_text(opportunity: Dict) -> str:
+    """Text used to embed a funding opportunity"""
+    parts = [opportunity.get("title") or "", opportunity.get("description") or ""]
+    for field in ("focus_areas", "keywords"):
+        values = opportunity.get(field) or []
+        parts.extend(v for v in values if isinstance(v, str))
+    return "\n".join(p for p in parts if p)
+
+
+def profile_text(profile: Dict) -> str:
+    """Text used to embed an NGO profile"""
+    parts = [profile.get("mission_statement") or ""]
+    for field in ("focus_areas", "programs_services"):
+        values = profile.get(field) or []
+        parts.extend(v for v in values if isinstance(v, str))
+    return "\n".join(p for p in parts if p)
+
+
+def stale_ids(previous: Optional[VectorIndex], ids: Iterable, changed_ids: set) -> List:
+    """Ids whose vectors cannot be reused from the previous index"""
+    if previous is None:
+        return list(ids)
+    return [key for key in ids if key in changed_ids or previous.get(key) is None]
+
+
+def build_vector_index(
+    engine: EmbeddingEngine,
+    previous: Optional[VectorIndex],
+    ids: List,
+    changed_ids: set,
+    texts: Dict,
+) -> VectorIndex:
+    """
+    Build a vector index for ids, reusing previous vectors for unchanged ids
+
+    Only stale ids are sent through the engine; texts must cover them.
+    """
+    vectors = np.zeros((len(ids), engine.dimension), dtype=np.float32)
+    stale = set(stale_ids(previous, ids, changed_ids))
+    pending = []
+    for i, key in enumerate(ids):
+        if key in stale:
+            pending.append(i)
+        else:
+            vectors[i] = previous.get(key)
+
+    if pending:
+        vectors[pending] = engine.embed([texts.get(ids[i], "") for i in pending])
+    return VectorIndex(list(ids), vectors)
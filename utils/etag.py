@@ -0,0 +1,61 @@
+"""
+ETag helpers for conditional GET.
+
+ETags are derived from a resource's version key (id, version, updated_at)
+rather than from the serialized body, so routes can answer If-None-Match
+with a lightweight version-only query and skip loading the full row.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+from fastapi import Response, status
+
+# Bump when the response shape changes so cached representations are refetched
+ETAG_SCHEMA_VERSION = "1"
+
+
+def make_etag(kind: str, *parts) -> str:
+    """Build a strong ETag from a resource kind and its version key"""
+    values = [ETAG_SCHEMA_VERSION, kind]
+    for part in parts:
+        if isinstance(part, datetime):
+            values.append(part.isoformat())
+        else:
+            values.append("" if part is None else str(part))
+    digest = hashlib.blake2b("|".join(values).encode("utf-8"), digest_size=16)
+    return f'"{digest.hexdigest()}"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against an ETag
+
+    Uses weak comparison (RFC 9110 13.1.2), so W/"x" from a compressed
+    response still matches "x".
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = _opaque(etag)
+    return any(_opaque(tag) == current for tag in if_none_match.split(","))
+
+
+def set_etag(response: Response, etag: str) -> None:
+    """Attach an ETag and require clients to revalidate before reuse"""
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "private, no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    """Empty 304 response for a matching If-None-Match"""
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -1,17 +1,94 @@
+import html
 import io
-from datetime import datetime
-from typing import Tuple
-from docx import Document
-from docx.shared import Inches
+from typing import BinaryIO, Iterable, Iterator, Optional, Tuple, Union
 from fpdf import FPDF
+from utils.docx_template import LIST_BULLET, LIST_NUMBER, get_template, template_key
+from utils.pdf_layout import TextLayout
+from utils.document_model import HEADING, LIST, ProposalDocument, document_for
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Bump whenever the rendered output changes so cached exports are re-rendered
+EXPORT_RENDERER_VERSION = "5"
+
+EXPORT_MEDIA_TYPES = {
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "pdf": "application/pdf",
+    "html": "text/html",
+    "md": "text/markdown",
+}
+
+# Formats written straight from the document model: cheap enough to stream
+# on request, without the render pool, disk cache or export rate limit
+TEXT_EXPORT_FORMATS = ("html", "md")
+
+# Text exports are yielded in chunks of roughly this many characters
+TEXT_EXPORT_CHUNK_CHARS = 16 * 1024
+
+# Where a renderer writes: a file path or a writable binary file object
+ExportTarget = Union[str, BinaryIO]
+
+# Proposal fields printed in exports besides the versioned content. Exports
+# print nothing else that changes (no render date), so cached files stay exact
+EXPORT_METADATA_FIELDS = ("title", "executive_summary", "status", "confidence_score", "user_rating")
+
+
+class ProposalSnapshot:
+    """
+    Plain, picklable copy of the proposal fields the renderers read
+
+    Rendering runs in worker processes, which cannot use ORM objects bound
+    to the request's session. template is the DOCX template name resolved
+    from donor_template_used.
+    """
+
+    __slots__ = ("id", "title", "content", "executive_summary", "status",
+                 "version", "confidence_score", "user_rating", "template")
+
+    def __init__(self, **values):
+        for name in self.__slots__:
+            setattr(self, name, values.get(name))
+
+    @classmethod
+    def from_proposal(cls, proposal, include_content: bool = True) -> "ProposalSnapshot":
+        skipped = ("template",) if include_content else ("template", "content")
+        values = {name: getattr(proposal, name) for name in cls.__slots__ if name not in skipped}
+        values["id"] = str(proposal.id)
+        values["template"] = template_key(proposal.donor_template_used)
+        return cls(**values)
+
+
+def render_export(format: str, snapshot: ProposalSnapshot, path: str) -> str:
+    """
+    Render a snapshot to a file (entry point for worker processes)
+    
+    Only the path and the returned filename cross the process boundary,
+    so the parent never holds the document in memory.
+    
+    Returns:
+        Download filename
+    """
+    if format == "docx":
+        return write_docx(snapshot, path)
+    if format == "pdf":
+        return write_pdf(snapshot, path)
+    if format in TEXT_EXPORT_FORMATS:
+        with open(path, "w", encoding="utf-8") as target:
+            target.writelines(iter_text_export(format, snapshot))
+        return export_filename(snapshot, format)
+    raise ValueError(f"Unsupported export format: {format}")
+
+
+def export_filename(proposal, extension: str) -> str:
+    """Download filename for an exported proposal"""
+    safe_title = "".join(c for c in proposal.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    return f"{safe_title[:50]}_proposal.{extension}"
+
 
 def generate_docx(proposal) -> Tuple[bytes, str]:
     """
-    Generate a DOCX file from proposal content
+    Generate a DOCX file from proposal content in memory
     
     Args:
         proposal: Proposal model object
@@ -19,59 +96,65 @@ def generate_docx(proposal) -> Tuple[bytes, str]:
     Returns:
         Tuple of (file_content_bytes, filename)
     """
+    file_stream = io.BytesIO()
+    filename = write_docx(proposal, file_stream)
+    return file_stream.getvalue(), filename
+
+
+def write_docx(proposal, target: ExportTarget) -> str:
+    """
+    Write a DOCX file from proposal content to a path or binary file
+    
+    The document is zipped straight into the target, never held as bytes.
+    
+    Args:
+        proposal: Proposal model object or ProposalSnapshot
+        target: File path or writable binary file object
+        
+    Returns:
+        Download filename
+    """
     try:
-        # Create new document
-        doc = Document()
+        template = getattr(proposal, "template", None) or template_key(
+            getattr(proposal, "donor_template_used", None)
+        )
+        doc = get_template(template).new_document()
         
         # Add title
-        title = doc.add_heading(proposal.title, 0)
-        title.alignment = 1  # Center alignment
+        doc.heading(proposal.title, 0)
         
         # Add metadata
-        doc.add_paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}")
-        doc.add_paragraph(f"Proposal ID: {proposal.id}")
-        doc.add_paragraph()
+        doc.paragraph(f"Proposal ID: {proposal.id}")
+        doc.paragraph()
         
         # Add executive summary if available
         if proposal.executive_summary:
-            doc.add_heading('Executive Summary', level=1)
-            doc.add_paragraph(proposal.executive_summary)
-            doc.add_paragraph()
+            doc.heading('Executive Summary', 1)
+            doc.paragraph(proposal.executive_summary)
+            doc.paragraph()
         
         # Add main content
-        doc.add_heading('Proposal Content', level=1)
-        
-        # Split content into paragraphs and add them
-        content_paragraphs = proposal.content.split('\n\n')
-        for paragraph in content_paragraphs:
-            if paragraph.strip():
-                # Check if it's a heading (starts with #)
-                if paragraph.strip().startswith('#'):
-                    heading_text = paragraph.strip().lstrip('# ')
-                    doc.add_heading(heading_text, level=2)
-                else:
-                    doc.add_paragraph(paragraph.strip())
+        doc.heading('Proposal Content', 1)
+        
+        for block in document_for(proposal).blocks:
+            if block.kind == HEADING:
+                doc.heading(block.text, 2 if block.level <= 2 else 3)
+            elif block.kind == LIST:
+                style = LIST_NUMBER if block.ordered else LIST_BULLET
+                for item in block.items:
+                    doc.paragraph(item, style)
+            else:
+                doc.paragraph(block.text)
         
         # Add footer with proposal metadata
-        doc.add_page_break()
-        doc.add_heading('Proposal Information', level=1)
-        doc.add_paragraph(f"Status: {proposal.status.title()}")
-        doc.add_paragraph(f"Version: {proposal.version}")
-        if proposal.confidence_score:
-            doc.add_paragraph(f"Confidence Score: {proposal.confidence_score:.2f}")
-        if proposal.user_rating:
-            doc.add_paragraph(f"User Rating: {proposal.user_rating}/5 stars")
-        
-        # Save to BytesIO
-        file_stream = io.BytesIO()
-        doc.save(file_stream)
-        file_stream.seek(0)
-        
-        # Generate filename
-        safe_title = "".join(c for c in proposal.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        filename = f"{safe_title[:50]}_proposal.docx"
-        
-        return file_stream.getvalue(), filename
+        doc.page_break()
+        doc.heading('Proposal Information', 1)
+        for line in _metadata_lines(proposal):
+            doc.paragraph(line)
+        
+        doc.save(target)
+        
+        return export_filename(proposal, "docx")
         
     except Exception as e:
         logger.error(f"Error generating DOCX: {str(e)}")
@@ -80,7 +163,7 @@ def generate_docx(proposal) -> Tuple[bytes, str]:
 
 def generate_pdf(proposal) -> Tuple[bytes, str]:
     """
-    Generate a PDF file from proposal content
+    Generate a PDF file from proposal content in memory
     
     Args:
         proposal: Proposal model object
@@ -88,98 +171,171 @@ def generate_pdf(proposal) -> Tuple[bytes, str]:
     Returns:
         Tuple of (file_content_bytes, filename)
     """
+    file_stream = io.BytesIO()
+    filename = write_pdf(proposal, file_stream)
+    return file_stream.getvalue(), filename
+
+
+def write_pdf(proposal, target: ExportTarget) -> str:
+    """
+    Write a PDF file from proposal content to a path or binary file
+    
+    Args:
+        proposal: Proposal model object or ProposalSnapshot
+        target: File path or writable binary file object
+        
+    Returns:
+        Download filename
+    """
     try:
         # Create PDF
         pdf = FPDF()
+        layout = TextLayout(pdf)
         pdf.add_page()
-        pdf.set_font('Arial', 'B', 16)
+        layout.set_font('B', 16)
         
         # Add title
-        pdf.cell(0, 10, proposal.title, ln=True, align='C')
+        pdf.cell(0, 10, layout.clean(proposal.title), ln=True, align='C')
         pdf.ln(10)
         
         # Add metadata
-        pdf.set_font('Arial', '', 10)
-        pdf.cell(0, 5, f"Generated on: {datetime.now().strftime('%B %d, %Y')}", ln=True)
+        layout.set_font('', 10)
         pdf.cell(0, 5, f"Proposal ID: {str(proposal.id)}", ln=True)
         pdf.ln(10)
         
         # Add executive summary if available
         if proposal.executive_summary:
-            pdf.set_font('Arial', 'B', 14)
+            layout.set_font('B', 14)
             pdf.cell(0, 8, 'Executive Summary', ln=True)
-            pdf.set_font('Arial', '', 11)
-            
-            # Split text to fit in PDF width
-            summary_lines = proposal.executive_summary.split('\n')
-            for line in summary_lines:
-                # Handle long lines by wrapping them
-                words = line.split(' ')
-                current_line = ""
-                for word in words:
-                    test_line = current_line + word + " "
-                    if pdf.get_string_width(test_line) < 180:  # Max width
-                        current_line = test_line
-                    else:
-                        if current_line:
-                            pdf.cell(0, 6, current_line.strip(), ln=True)
-                        current_line = word + " "
-                if current_line:
-                    pdf.cell(0, 6, current_line.strip(), ln=True)
+            layout.set_font('', 11)
+            layout.write_text(proposal.executive_summary, 6)
             pdf.ln(5)
         
         # Add main content
-        pdf.set_font('Arial', 'B', 14)
+        layout.set_font('B', 14)
         pdf.cell(0, 8, 'Proposal Content', ln=True)
-        pdf.set_font('Arial', '', 11)
-        
-        # Process content paragraphs
-        content_paragraphs = proposal.content.split('\n\n')
-        for paragraph in content_paragraphs:
-            if paragraph.strip():
-                # Check if it's a heading
-                if paragraph.strip().startswith('#'):
-                    heading_text = paragraph.strip().lstrip('# ')
-                    pdf.set_font('Arial', 'B', 12)
-                    pdf.ln(3)
-                    pdf.cell(0, 7, heading_text, ln=True)
-                    pdf.set_font('Arial', '', 11)
-                else:
-                    # Handle paragraph wrapping
-                    lines = paragraph.strip().split('\n')
-                    for line in lines:
-                        words = line.split(' ')
-                        current_line = ""
-                        for word in words:
-                            test_line = current_line + word + " "
-                            if pdf.get_string_width(test_line) < 180:
-                                current_line = test_line
-                            else:
-                                if current_line:
-                                    pdf.cell(0, 6, current_line.strip(), ln=True)
-                                current_line = word + " "
-                        if current_line:
-                            pdf.cell(0, 6, current_line.strip(), ln=True)
-                    pdf.ln(3)
+        layout.set_font('', 11)
+        
+        for block in document_for(proposal).blocks:
+            if block.kind == HEADING:
+                layout.set_font('B', 12)
+                pdf.ln(3)
+                layout.write_text(block.text, 7)
+                layout.set_font('', 11)
+            elif block.kind == LIST:
+                for number, item in enumerate(block.items, 1):
+                    marker = f"{number}." if block.ordered else "-"
+                    layout.write_text(f"{marker} {item}", 6)
+                pdf.ln(3)
+            else:
+                layout.write_text(block.text, 6)
+                pdf.ln(3)
         
         # Add footer with metadata
         pdf.add_page()
-        pdf.set_font('Arial', 'B', 14)
+        layout.set_font('B', 14)
         pdf.cell(0, 8, 'Proposal Information', ln=True)
-        pdf.set_font('Arial', '', 11)
-        pdf.cell(0, 6, f"Status: {proposal.status.title()}", ln=True)
-        pdf.cell(0, 6, f"Version: {proposal.version}", ln=True)
-        if proposal.confidence_score:
-            pdf.cell(0, 6, f"Confidence Score: {proposal.confidence_score:.2f}", ln=True)
-        if proposal.user_rating:
-            pdf.cell(0, 6, f"User Rating: {proposal.user_rating}/5 stars", ln=True)
+        layout.set_font('', 11)
+        for line in _metadata_lines(proposal):
+            pdf.cell(0, 6, layout.clean(line), ln=True)
         
-        # Generate filename
-        safe_title = "".join(c for c in proposal.title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        filename = f"{safe_title[:50]}_proposal.pdf"
+        pdf.output(target)
         
-        return pdf.output(dest='S').encode('latin-1'), filename
+        return export_filename(proposal, "pdf")
         
     except Exception as e:
         logger.error(f"Error generating PDF: {str(e)}")
-        raise 
\ No newline at end of file
+        raise 
+
+
+def _batched(parts: Iterable[str]) -> Iterator[str]:
+    batch = []
+    size = 0
+    for part in parts:
+        batch.append(part)
+        size += len(part)
+        if size >= TEXT_EXPORT_CHUNK_CHARS:
+            yield "".join(batch)
+            batch = []
+            size = 0
+    if batch:
+        yield "".join(batch)
+
+
+def _metadata_lines(proposal) -> list:
+    """Lines of the Proposal Information section shared by every format"""
+    lines = [f"Status: {proposal.status.title()}", f"Version: {proposal.version}"]
+    if proposal.confidence_score:
+        lines.append(f"Confidence Score: {proposal.confidence_score:.2f}")
+    if proposal.user_rating:
+        lines.append(f"User Rating: {proposal.user_rating}/5 stars")
+    return lines
+
+
+def _markdown_parts(proposal, document: ProposalDocument) -> Iterator[str]:
+    yield f"# {proposal.title}\n\n"
+    yield f"Proposal ID: {proposal.id}\n\n"
+    if proposal.executive_summary:
+        yield f"## Executive Summary\n\n{proposal.executive_summary}\n\n"
+    yield "## Proposal Content\n\n"
+    for block in document.blocks:
+        if block.kind == HEADING:
+            yield f"{'#' * min(block.level + 2, 6)} {block.text}\n\n"
+        elif block.kind == LIST:
+            for number, item in enumerate(block.items, 1):
+                yield f"{number}. {item}\n" if block.ordered else f"- {item}\n"
+            yield "\n"
+        else:
+            yield f"{block.text}\n\n"
+    yield "## Proposal Information\n\n"
+    for line in _metadata_lines(proposal):
+        yield f"- {line}\n"
+
+
+def _html_text(text: str) -> str:
+    return html.escape(text).replace("\n", "<br>\n")
+
+
+def _html_parts(proposal, document: ProposalDocument) -> Iterator[str]:
+    escape = html.escape
+    title = escape(proposal.title)
+    yield (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n'
+        f"<title>{title}</title>\n</head>\n<body>\n<h1>{title}</h1>\n"
+    )
+    yield f"<p>Proposal ID: {escape(str(proposal.id))}</p>\n"
+    if proposal.executive_summary:
+        yield f"<h2>Executive Summary</h2>\n<p>{_html_text(proposal.executive_summary)}</p>\n"
+    yield "<h2>Proposal Content</h2>\n"
+    for block in document.blocks:
+        if block.kind == HEADING:
+            level = min(block.level + 2, 6)
+            yield f"<h{level}>{escape(block.text)}</h{level}>\n"
+        elif block.kind == LIST:
+            tag = "ol" if block.ordered else "ul"
+            items = "".join(f"<li>{escape(item)}</li>\n" for item in block.items)
+            yield f"<{tag}>\n{items}</{tag}>\n"
+        else:
+            yield f"<p>{_html_text(block.text)}</p>\n"
+    yield "<h2>Proposal Information</h2>\n<ul>\n"
+    for line in _metadata_lines(proposal):
+        yield f"<li>{escape(line)}</li>\n"
+    yield "</ul>\n</body>\n</html>\n"
+
+
+def iter_text_export(
+    format: str, proposal, document: Optional[ProposalDocument] = None
+) -> Iterator[str]:
+    """
+    Render an HTML or Markdown export as a stream of text chunks
+    
+    Reads the cached document model (or the given document), so nothing is
+    re-parsed; the layout mirrors the DOCX export.
+    """
+    if document is None:
+        document = document_for(proposal)
+    if format == "md":
+        return _batched(_markdown_parts(proposal, document))
+    if format == "html":
+        return _batched(_html_parts(proposal, document))
+    raise ValueError(f"Unsupported text export format: {format}")
@@ -0,0 +1,141 @@
+"""
+File responses with Content-Length and single byte-range support.
+
+Starlette 0.27's FileResponse neither honours Range nor survives the file
+being removed between building the response and sending it (the export
+cache may evict it). RangeFileResponse takes an already-open file, so an
+evicted file stays readable until the response is sent.
+"""
+
+import os
+from typing import BinaryIO, Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Response, status
+
+
+class RangeNotSatisfiable(ValueError):
+    """The requested byte range lies outside the file"""
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single "bytes=" range into an inclusive (start, end) pair
+
+    Returns None when there is no usable range (absent, another unit, or
+    several ranges), in which case the whole file is sent.
+
+    Raises:
+        RangeNotSatisfiable: If the range does not overlap the file
+    """
+    if not header or not header.strip().lower().startswith("bytes="):
+        return None
+    spec = header.strip()[6:].strip()
+    if "," in spec or "-" not in spec:
+        return None
+    first, _, last = spec.partition("-")
+    try:
+        if first.strip() == "":
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0 or size == 0:
+                raise RangeNotSatisfiable(header)
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last.strip() else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        raise RangeNotSatisfiable(header)
+    return start, min(end, size - 1)
+
+
+def content_disposition(filename: str) -> str:
+    quoted = quote(filename)
+    if quoted != filename:
+        return f"attachment; filename*=utf-8''{quoted}"
+    return f'attachment; filename="{filename}"'
+
+
+class RangeFileResponse(Response):
+    """Send an open file, or one byte range of it, in chunks"""
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        file: BinaryIO,
+        media_type: str,
+        filename: Optional[str] = None,
+        range_header: Optional[str] = None,
+        if_range: Optional[str] = None,
+        etag: Optional[str] = None,
+        headers: Optional[Mapping[str, str]] = None,
+    ):
+        self.file = file
+        self.media_type = media_type
+        self.background = None
+        self.init_headers(headers)
+
+        size = os.fstat(file.fileno()).st_size
+        self.start, self.end = 0, size - 1
+        self.status_code = status.HTTP_200_OK
+
+        # If-Range: only honour the range if the client still has this version
+        if if_range is not None and (etag is None or if_range.strip() != etag):
+            range_header = None
+
+        try:
+            byte_range = parse_range(range_header, size)
+        except RangeNotSatisfiable:
+            self.status_code = status.HTTP_416_REQUESTED_RANGE_NOT_SATISFIABLE
+            self.start, self.end = 0, -1
+            self.headers["content-range"] = f"bytes */{size}"
+            byte_range = None
+
+        if byte_range is not None:
+            self.start, self.end = byte_range
+            self.status_code = status.HTTP_206_PARTIAL_CONTENT
+            self.headers["content-range"] = f"bytes {self.start}-{self.end}/{size}"
+
+        self.headers["accept-ranges"] = "bytes"
+        self.headers["content-length"] = str(self.end - self.start + 1)
+        if etag is not None:
+            self.headers["etag"] = etag
+        if filename is not None:
+            self.headers.setdefault("content-disposition", content_disposition(filename))
+
+    def _read(self, size: int) -> bytes:
+        return self.file.read(size)
+
+    async def __call__(self, scope, receive, send):
+        try:
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": self.status_code,
+                    "headers": self.raw_headers,
+                }
+            )
+            remaining = self.end - self.start + 1
+            if remaining > 0:
+                await anyio.to_thread.run_sync(self.file.seek, self.start)
+            while remaining > 0:
+                chunk = await anyio.to_thread.run_sync(
+                    self._read, min(self.chunk_size, remaining)
+                )
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send(
+                    {
+                        "type": "http.response.body",
+                        "body": chunk,
+                        "more_body": remaining > 0,
+                    }
+                )
+            if remaining > 0 or self.end < self.start:
+                await send({"type": "http.response.body", "body": b""})
+        finally:
+            self.file.close()
@@ -3,6 +3,7 @@ import os
 from typing import Dict, Any, Optional
 import logging
 import json
+from utils.document_model import parse_markdown
 
 logger = logging.getLogger(__name__)
 
@@ -93,15 +94,9 @@ class OpenAIClient:
             raise
     
     def _extract_title(self, content: str) -> Optional[str]:
-        """Extract title from proposal content"""
+        """Extract title from proposal content (first non-heading line)"""
         try:
-            lines = content.split('\n')
-            for line in lines:
-                line = line.strip()
-                if line and not line.startswith('#'):
-                    # First non-empty, non-header line is likely the title
-                    return line
-            return None
+            return parse_markdown(content).title()
         except Exception as e:
             logger.error(f"Error extracting title: {str(e)}")
             return None
@@ -109,36 +104,7 @@ class OpenAIClient:
     def _extract_executive_summary(self, content: str) -> Optional[str]:
         """Extract executive summary from proposal content"""
         try:
-            content_lower = content.lower()
-            
-            # Look for executive summary section
-            summary_start = content_lower.find("executive summary")
-            if summary_start == -1:
-                return None
-            
-            # Find the end of the executive summary section
-            lines = content[summary_start:].split('\n')
-            summary_lines = []
-            in_summary = False
-            
-            for line in lines:
-                line = line.strip()
-                if "executive summary" in line.lower():
-                    in_summary = True
-                    continue
-                
-                if in_summary:
-                    if line and not line.startswith('#'):
-                        summary_lines.append(line)
-                    elif line.startswith('#') and len(summary_lines) > 0:
-                        # Hit next section
-                        break
-            
-            if summary_lines:
-                return ' '.join(summary_lines)
-            
-            return None
-            
+            return parse_markdown(content).executive_summary()
         except Exception as e:
             logger.error(f"Error extracting executive summary: {str(e)}")
             return None
@@ -0,0 +1,39 @@
+"""
+Opaque cursor tokens for keyset pagination
+"""
+
+import base64
+import json
+from typing import Any, List
+
+
+def encode_cursor(*values: Any) -> str:
+    """
+    Encode the sort key of the last row on a page into an opaque token
+
+    Args:
+        values: JSON-serializable sort key values (e.g. score, id)
+
+    Returns:
+        URL-safe token to hand back to the client
+    """
+    raw = json.dumps(list(values), separators=(",", ":"), default=str)
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, expected_length: int) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor
+
+    Raises:
+        ValueError: If the token is malformed or has the wrong shape
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError("Invalid pagination cursor")
+
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise ValueError("Invalid pagination cursor")
+    return values
@@ -0,0 +1,170 @@
+"""
+Text layout for PDF exports.
+
+Words are measured once per font and size and the widths cached, lines are
+broken greedily in a single pass over the words, and the finished lines are
+written with FPDF.text, which skips the per-call cell bookkeeping that
+FPDF.cell does for every line.
+
+Core PDF fonts only cover latin-1. Set PDF_FONT_PATH (and optionally
+PDF_FONT_BOLD_PATH) to a TrueType font to export other scripts; without one,
+typographic punctuation is mapped to ASCII. Characters the font still
+cannot draw become "?".
+"""
+
+import logging
+import os
+from typing import Dict, List, Optional, Tuple
+
+from fpdf import FPDF
+
+logger = logging.getLogger(__name__)
+
+PDF_FONT_PATH = os.getenv("PDF_FONT_PATH", "")
+PDF_FONT_BOLD_PATH = os.getenv("PDF_FONT_BOLD_PATH", "")
+
+CORE_FONT_FAMILY = "Helvetica"
+UNICODE_FONT_FAMILY = "ProposalSans"
+
+# Height of a line's text above the baseline, as a fraction of the font size
+_ASCENT = 0.7
+
+_LATIN1_FALLBACKS = str.maketrans({
+    "\u2018": "'",
+    "\u2019": "'",
+    "\u201c": '"',
+    "\u201d": '"',
+    "\u2013": "-",
+    "\u2014": "-",
+    "\u2212": "-",
+    "\u2022": "*",
+    "\u2026": "...",
+    "\u200b": None,
+})
+
+
+def register_fonts(pdf: FPDF) -> bool:
+    """
+    Register the configured TrueType font on a document
+
+    Returns:
+        True if a Unicode font is available, False to use core fonts
+    """
+    if not PDF_FONT_PATH:
+        return False
+    try:
+        pdf.add_font(UNICODE_FONT_FAMILY, "", PDF_FONT_PATH)
+        pdf.add_font(UNICODE_FONT_FAMILY, "B", PDF_FONT_BOLD_PATH or PDF_FONT_PATH)
+        return True
+    except Exception as e:
+        logger.error(f"Could not load PDF font {PDF_FONT_PATH}, using core fonts: {str(e)}")
+        return False
+
+
+class TextLayout:
+    """
+    Wraps and writes text on an FPDF document
+
+    Use set_font() rather than FPDF.set_font so measurements are cached
+    per font style and size.
+    """
+
+    def __init__(self, pdf: FPDF, width: Optional[float] = None):
+        self.pdf = pdf
+        self.unicode = register_fonts(pdf)
+        self.family = UNICODE_FONT_FAMILY if self.unicode else CORE_FONT_FAMILY
+        # Same text box as FPDF.cell(0, ...) so wrapped text lines up with cells
+        self.width = width or pdf.epw - 2 * pdf.c_margin
+        self._widths: Dict[Tuple[str, float], Dict[str, float]] = {}
+        self._current: Dict[str, float] = {}
+        self._space = 0.0
+
+    def set_font(self, style: str, size: float):
+        """Select the layout font family in the given style and size"""
+        self.pdf.set_font(self.family, style, size)
+        self._current = self._widths.setdefault((style, size), {})
+        self._space = self.measure(" ")
+
+    def clean(self, text: str) -> str:
+        """Make text drawable in the current font"""
+        if text.isascii():
+            return text
+        if not self.unicode:
+            return text.translate(_LATIN1_FALLBACKS).encode("latin-1", "replace").decode("latin-1")
+        # FPDF.text fails outright on characters the font has no glyph for
+        cmap = self.pdf.current_font.cmap
+        return "".join(c if c == "\n" or ord(c) in cmap else "?" for c in text)
+
+    def measure(self, word: str) -> float:
+        """Width of a word in the current font, in user units"""
+        width = self._current.get(word)
+        if width is None:
+            width = self._current[word] = self.pdf.get_string_width(word)
+        return width
+
+    def _split_word(self, word: str) -> List[str]:
+        # Hard-break a word wider than the line (long URLs, identifiers)
+        pieces = []
+        start = 0
+        used = 0.0
+        for i, char in enumerate(word):
+            char_width = self.measure(char)
+            if i > start and used + char_width > self.width:
+                pieces.append(word[start:i])
+                start = i
+                used = 0.0
+            used += char_width
+        pieces.append(word[start:])
+        return pieces
+
+    def wrap(self, text: str) -> List[str]:
+        """Break a single line of text into lines that fit the layout width"""
+        lines = []
+        current: List[str] = []
+        current_width = 0.0
+        for word in text.split():
+            width = self.measure(word)
+            if width > self.width:
+                if current:
+                    lines.append(" ".join(current))
+                    current = []
+                pieces = self._split_word(word)
+                lines.extend(pieces[:-1])
+                word = pieces[-1]
+                width = self.measure(word)
+            if not current:
+                current = [word]
+                current_width = width
+            elif current_width + self._space + width <= self.width:
+                current.append(word)
+                current_width += self._space + width
+            else:
+                lines.append(" ".join(current))
+                current = [word]
+                current_width = width
+        if current:
+            lines.append(" ".join(current))
+        return lines
+
+    def write_lines(self, lines: List[str], line_height: float):
+        """Write pre-wrapped lines from the current position, breaking pages as needed"""
+        pdf = self.pdf
+        bottom = pdf.h - pdf.b_margin
+        x = pdf.l_margin + pdf.c_margin
+        y = pdf.y
+        baseline = (line_height + pdf.font_size * _ASCENT) / 2
+        for line in lines:
+            if y + line_height > bottom:
+                pdf.add_page()
+                y = pdf.y
+            if line:
+                pdf.text(x, y + baseline, line)
+            y += line_height
+        pdf.set_xy(pdf.l_margin, y)
+
+    def write_text(self, text: str, line_height: float):
+        """Wrap and write text; newlines start new lines and blank lines are kept"""
+        lines = []
+        for line in self.clean(text).split("\n"):
+            lines.extend(self.wrap(line) or [""])
+        self.write_lines(lines, line_height)
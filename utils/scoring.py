@@ -1,6 +1,7 @@
 from typing import Dict, Any, Optional
 from models.ngo_profiles import NGOProfile
 from models.funding_opportunities import FundingOpportunity
+from utils.document_model import ProposalDocument, parse_markdown
 import logging
 
 logger = logging.getLogger(__name__)
@@ -114,16 +115,19 @@ def calculate_proposal_scores(
             "completeness_score": None
         }
         
+        # Parsed once (and cached) for all three scores
+        document = parse_markdown(proposal_content)
+        
         # Calculate confidence score based on content quality
-        scores["confidence_score"] = _calculate_confidence_score(proposal_content)
+        scores["confidence_score"] = _calculate_confidence_score(proposal_content, document)
         
         # Calculate alignment score based on funding opportunity match
         scores["alignment_score"] = _calculate_alignment_score(
-            proposal_content, funding_opportunity, ngo_profile
+            proposal_content, funding_opportunity, ngo_profile, document
         )
         
         # Calculate completeness score based on content structure
-        scores["completeness_score"] = _calculate_completeness_score(proposal_content)
+        scores["completeness_score"] = _calculate_completeness_score(proposal_content, document)
         
         logger.debug(f"Proposal scores calculated: {scores}")
         return scores
@@ -133,9 +137,13 @@ def calculate_proposal_scores(
         return {"confidence_score": None, "alignment_score": None, "completeness_score": None}
 
 
-def _calculate_confidence_score(proposal_content: str) -> float:
+def _calculate_confidence_score(
+    proposal_content: str,
+    document: Optional[ProposalDocument] = None
+) -> float:
     """Calculate confidence score based on content quality indicators"""
     try:
+        document = document or parse_markdown(proposal_content)
         score = 0.0
         
         # Length indicators
@@ -148,15 +156,15 @@ def _calculate_confidence_score(proposal_content: str) -> float:
             score += 0.1
         
         # Structure indicators
-        if "executive summary" in proposal_content.lower():
+        if document.has_section("executive summary"):
             score += 0.15
-        if "budget" in proposal_content.lower():
+        if document.has_section("budget"):
             score += 0.1
-        if "methodology" in proposal_content.lower():
+        if document.has_section("methodology"):
             score += 0.1
-        if "timeline" in proposal_content.lower():
+        if document.has_section("timeline"):
             score += 0.1
-        if "impact" in proposal_content.lower():
+        if document.has_section("impact"):
             score += 0.1
         
         # Quality indicators
@@ -175,12 +183,13 @@ def _calculate_confidence_score(proposal_content: str) -> float:
 def _calculate_alignment_score(
     proposal_content: str,
     funding_opportunity: FundingOpportunity,
-    ngo_profile: NGOProfile
+    ngo_profile: NGOProfile,
+    document: Optional[ProposalDocument] = None
 ) -> float:
     """Calculate alignment score based on funding opportunity match"""
     try:
         score = 0.0
-        content_lower = proposal_content.lower()
+        content_lower = (document or parse_markdown(proposal_content)).lower_text
         
         # Check focus area alignment
         if funding_opportunity.focus_areas:
@@ -216,6 +225,9 @@ def _calculate_alignment_score(
             if funding_opportunity.donor_organization.lower() in content_lower:
                 score += 0.1
         
+        # Check semantic alignment (catches paraphrases substring matching misses)
+        score += _calculate_semantic_alignment(proposal_content, funding_opportunity)
+        
         # Ensure score is between 0 and 1
         return min(max(score, 0.0), 1.0)
         
@@ -224,11 +236,49 @@ def _calculate_alignment_score(
         return 0.5
 
 
-def _calculate_completeness_score(proposal_content: str) -> float:
+def _calculate_semantic_alignment(
+    proposal_content: str,
+    funding_opportunity: FundingOpportunity
+) -> float:
+    """
+    Score bonus from embedding similarity; 0.0 when no semantic index is built
+
+    Embedding blocks, so async callers run the scorer in a threadpool.
+    """
+    try:
+        from utils.embeddings import get_semantic_index, opportunity_text
+        from utils.alignment_matrix import semantic_contribution
+        
+        index = get_semantic_index()
+        if index is None:
+            return 0.0
+        
+        similarity = index.similarity(
+            proposal_content,
+            funding_opportunity.id,
+            fallback_text=opportunity_text({
+                "title": funding_opportunity.title,
+                "description": funding_opportunity.description,
+                "focus_areas": funding_opportunity.focus_areas,
+                "keywords": funding_opportunity.keywords,
+            })
+        )
+        return float(semantic_contribution(similarity))
+        
+    except Exception as e:
+        logger.error(f"Error calculating semantic alignment: {str(e)}")
+        return 0.0
+
+
+def _calculate_completeness_score(
+    proposal_content: str,
+    document: Optional[ProposalDocument] = None
+) -> float:
     """Calculate completeness score based on content structure"""
     try:
+        document = document or parse_markdown(proposal_content)
         score = 0.0
-        content_lower = proposal_content.lower()
+        content_lower = document.lower_text
         
         # Check for key sections
         key_sections = [
@@ -244,7 +294,7 @@ def _calculate_completeness_score(proposal_content: str) -> float:
             "conclusion"
         ]
         
-        sections_found = sum(1 for section in key_sections if section in content_lower)
+        sections_found = sum(1 for section in key_sections if document.has_section(section))
         score += (sections_found / len(key_sections)) * 0.6
         
         # Check for financial information
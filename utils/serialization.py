@@ -0,0 +1,61 @@
+"""
+Fast JSON serialization for hot API responses.
+
+The default FastAPI path turns an ORM row into a dict (to_dict), then a
+Pydantic model, then a jsonable dict, then JSON text. For proposal bodies
+that copies the content several times and calls isoformat() on every
+timestamp. These helpers read the requested attributes straight off the
+row and encode them with orjson, which handles UUID and datetime natively.
+
+Routes keep their response_model so the OpenAPI schema is unchanged; they
+return a JSONBytesResponse, which FastAPI sends as-is.
+"""
+
+import uuid
+from typing import Any, Dict, Iterable, Mapping, Optional, Sequence
+
+import orjson
+from fastapi import Response
+
+
+class JSONBytesResponse(Response):
+    """Response for bodies that are already encoded JSON"""
+
+    media_type = "application/json"
+
+
+def _default(value: Any) -> Any:
+    # asyncpg returns its own UUID subclass, which orjson does not accept natively
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def row_values(row: Any, fields: Sequence[str]) -> Dict[str, Any]:
+    """Read fields off an ORM row without converting values"""
+    return {field: getattr(row, field) for field in fields}
+
+
+def dump_row(row: Any, fields: Sequence[str]) -> bytes:
+    """Encode the given fields of an ORM row as a JSON object"""
+    return orjson.dumps(row_values(row, fields), default=_default)
+
+
+def dump_rows(rows: Iterable[Any], fields: Sequence[str]) -> bytes:
+    """Encode the given fields of each ORM row as a JSON array"""
+    return orjson.dumps([row_values(row, fields) for row in rows], default=_default)
+
+
+def json_response(
+    content: Any,
+    status_code: int = 200,
+    headers: Optional[Mapping[str, str]] = None,
+) -> JSONBytesResponse:
+    """
+    Build a response from pre-encoded bytes or a plain JSON-able value
+
+    Headers set on an injected Response parameter are ignored when a route
+    returns its own Response, so pass them here.
+    """
+    body = content if isinstance(content, bytes) else orjson.dumps(content, default=_default)
+    return JSONBytesResponse(content=body, status_code=status_code, headers=headers)
@@ -0,0 +1,71 @@
+"""
+Compact line-based text deltas for proposal revision history.
+
+A delta is a JSON-serializable list of operations applied to the lines of
+the previous text:
+
+    [0, n]      copy the next n lines unchanged
+    [1, n]      skip (delete) the next n lines
+    [2, [...]]  insert the given lines
+
+Lines keep their line endings, so applying a delta reproduces the new text
+exactly.
+"""
+
+from difflib import SequenceMatcher
+from typing import List
+
+OP_COPY = 0
+OP_DELETE = 1
+OP_INSERT = 2
+
+
+def make_delta(old: str, new: str) -> List[list]:
+    """Compute the delta that turns old into new"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    matcher = SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+
+    delta: List[list] = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([OP_COPY, i2 - i1])
+            continue
+        if i2 > i1:
+            delta.append([OP_DELETE, i2 - i1])
+        if j2 > j1:
+            delta.append([OP_INSERT, new_lines[j1:j2]])
+    return delta
+
+
+def apply_delta(old: str, delta: List[list]) -> str:
+    """
+    Apply a delta produced by make_delta
+
+    Raises:
+        ValueError: If the delta does not fit the given text
+    """
+    old_lines = old.splitlines(keepends=True)
+    result: List[str] = []
+    position = 0
+    for op, value in delta:
+        if op == OP_COPY:
+            if position + value > len(old_lines):
+                raise ValueError("Delta does not apply to base text")
+            result.extend(old_lines[position:position + value])
+            position += value
+        elif op == OP_DELETE:
+            position += value
+        elif op == OP_INSERT:
+            result.extend(value)
+        else:
+            raise ValueError(f"Unknown delta operation: {op}")
+
+    if position != len(old_lines):
+        raise ValueError("Delta does not apply to base text")
+    return "".join(result)
+
+
+def delta_size(delta: List[list]) -> int:
+    """Number of characters of new text carried by a delta"""
+    return sum(len(line) for op, value in delta if op == OP_INSERT for line in value)